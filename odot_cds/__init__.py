@@ -1 +1,4 @@
-from . import client, cds501  # noqa
+from . import (  # noqa
+    archive, changes, client, cds501, columnar, cube, decode, dedup, index,
+    ingest, local, lrs, schedule, spatial, spis, validate, warehouse
+)
@@ -0,0 +1,318 @@
+"""
+This module stores raw CDS501 extracts in a compressed archive which, unlike
+a gzip file, can be read at random. An archive holds the text of one or more
+extracts in independently compressed blocks, each of which ends on a crash
+boundary (a crash row, and the rows of its vehicles and participants, are
+always in the same block). An index at the end of the archive records the
+location, row count, range of crash IDs, years and counties of each block,
+so that readers can skip blocks, or divide the blocks among processes:
+
+>>> archive.write(['2017/lane/CDS501.txt', '2018/lane/CDS501.txt'],
+...               'lane.cds501z')
+>>> blocks = archive.read_index('lane.cds501z')
+>>> crash, vhcl, partic = cds501.get_data_frames('lane.cds501z')
+
+`odot_cds.cds501.read` (and every other function accepting the path to a
+"CDS501.txt" file) decodes archives directly.
+"""
+import csv
+import json
+import os
+import struct
+import zlib
+from dataclasses import asdict, dataclass
+from http.client import HTTPResponse
+from os import PathLike
+from typing import IO, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+# The first and last bytes of an archive
+MAGIC: bytes = b'CDS501Z1'
+
+# The number of rows after which a block is ended (at the next crash
+# boundary)
+BLOCK_ROWS: int = 10000
+
+# The compression level (see `zlib.compress`)
+COMPRESSION_LEVEL: int = 6
+
+# The positions, in a CDS501 row, of the fields recorded in the index
+_CRASH_ID_INDEX: int = 0
+_REC_TYP_CD_INDEX: int = 1
+_CRASH_YR_NO_INDEX: int = 10
+_CNTY_ID_INDEX: int = 13
+
+# The archive trailer: the offset of the index, followed by `MAGIC`
+_TRAILER: struct.Struct = struct.Struct('<Q8s')
+
+Source = Union[HTTPResponse, str, PathLike, IO]
+
+
+@dataclass(frozen=True)
+class Block:
+    """
+    The location and contents of a compressed block of rows.
+
+    - offset, length: The location of the compressed block in the archive.
+
+    - row_count, crash_count: The number of rows, and of crash rows.
+
+    - first_crash_id, last_crash_id: The least and greatest crash IDs.
+
+    - years, counties: The distinct years (`crash_yr_no`) and county IDs
+      (`cnty_id`) of the block's crashes.
+    """
+
+    offset: int
+    length: int
+    row_count: int
+    crash_count: int
+    first_crash_id: int
+    last_crash_id: int
+    years: Tuple[str, ...]
+    counties: Tuple[str, ...]
+
+
+def is_archive(path: Union[str, PathLike]) -> bool:
+    """
+    Determine whether a file is an archive
+    """
+    with open(path, 'rb') as file:
+        return file.read(len(MAGIC)) == MAGIC
+
+
+def read_source_lines(source: Source) -> Iterator[str]:
+    """
+    Yield each line of text in a CDS501 extract: an HTTP response, file
+    object, or the path to a "CDS501.txt" file or to an archive (which is
+    decoded). Lines read as bytes are decoded as UTF-8.
+    """
+    if isinstance(source, (str, PathLike)):
+        if is_archive(source):
+            yield from read_lines(source)
+            return
+        with open(source, encoding='utf-8', newline='') as file:
+            yield from file
+    else:
+        for line in source:
+            yield (
+                str(line, encoding='utf-8')
+                if isinstance(line, bytes) else
+                line
+            )
+
+
+class _BlockWriter:
+    """
+    Accumulates the rows of a block, and the statistics of its index entry
+    """
+
+    def __init__(self) -> None:
+        self.lines: List[str] = []
+        self.crash_count: int = 0
+        self.crash_ids: Set[int] = set()
+        self.years: Set[str] = set()
+        self.counties: Set[str] = set()
+
+    def add(self, line: str, values: List[str]) -> None:
+        self.lines.append(line)
+        self.crash_ids.add(int(values[_CRASH_ID_INDEX].strip()))
+        if values[_REC_TYP_CD_INDEX].strip() == '1':
+            self.crash_count += 1
+            for index, values_ in (
+                (_CRASH_YR_NO_INDEX, self.years),
+                (_CNTY_ID_INDEX, self.counties)
+            ):
+                if index < len(values) and values[index].strip():
+                    values_.add(values[index].strip())
+
+    def write(self, file: IO[bytes]) -> Block:
+        data: bytes = zlib.compress(
+            ''.join(self.lines).encode('utf-8'),
+            COMPRESSION_LEVEL
+        )
+        block: Block = Block(
+            offset=file.tell(),
+            length=len(data),
+            row_count=len(self.lines),
+            crash_count=self.crash_count,
+            first_crash_id=min(self.crash_ids),
+            last_crash_id=max(self.crash_ids),
+            years=tuple(sorted(self.years)),
+            counties=tuple(sorted(self.counties))
+        )
+        file.write(data)
+        return block
+
+
+def write(
+    sources: Union[Source, Iterable[Source]],
+    path: Union[str, PathLike],
+    block_rows: int = BLOCK_ROWS
+) -> List[Block]:
+    """
+    Write one or more CDS501 extracts to an archive, returning the index of
+    its blocks.
+
+    Parameters:
+
+    - sources (http.client.HTTPResponse|str|typing.IO|[str]): A CDS501
+      extract (an `HTTPResponse`, or the path to or a file object for a
+      saved "CDS501.txt" file), or an iterable of extracts.
+
+    - path (str): The path of the archive.
+
+    - block_rows (int): The number of rows after which each block is ended
+      (at the next crash boundary).
+    """
+    if isinstance(sources, (HTTPResponse, str, PathLike)) or hasattr(
+        sources,
+        'read'
+    ):
+        sources = (sources,)
+    blocks: List[Block] = []
+    with open(path, 'wb') as file:
+        file.write(MAGIC)
+        block_writer: _BlockWriter = _BlockWriter()
+        crash_id: Optional[str] = None
+        for source in sources:
+            for line in read_source_lines(source):
+                if not line.strip():
+                    continue
+                if not line.endswith('\n'):
+                    line += '\n'
+                values: List[str] = next(csv.reader((line,)))
+                if values[_CRASH_ID_INDEX] != crash_id:
+                    crash_id = values[_CRASH_ID_INDEX]
+                    if len(block_writer.lines) >= block_rows:
+                        blocks.append(block_writer.write(file))
+                        block_writer = _BlockWriter()
+                block_writer.add(line, values)
+        if block_writer.lines:
+            blocks.append(block_writer.write(file))
+        index_offset: int = file.tell()
+        file.write(
+            json.dumps([asdict(block) for block in blocks]).encode('utf-8')
+        )
+        file.write(_TRAILER.pack(index_offset, MAGIC))
+    return blocks
+
+
+def read_index(path: Union[str, PathLike]) -> List[Block]:
+    """
+    Read the index of an archive's blocks
+    """
+    with open(path, 'rb') as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError('%s is not a CDS501 archive' % repr(path))
+        file.seek(-_TRAILER.size, os.SEEK_END)
+        end: int = file.tell()
+        index_offset, magic = _TRAILER.unpack(file.read(_TRAILER.size))
+        if magic != MAGIC:
+            raise ValueError('%s is incomplete' % repr(path))
+        file.seek(index_offset)
+        return [
+            Block(**dict(
+                entry,
+                years=tuple(entry['years']),
+                counties=tuple(entry['counties'])
+            ))
+            for entry in json.loads(file.read(end - index_offset))
+        ]
+
+
+def read_lines(
+    path: Union[str, PathLike],
+    blocks: Optional[Iterable[Union[int, Block]]] = None
+) -> Iterator[str]:
+    """
+    Yield the lines of text in an archive, or in selected blocks.
+
+    Parameters:
+
+    - path (str): The path of the archive.
+
+    - blocks ([int|Block]): The blocks to read (by position in the index,
+      or as `Block` instances). Blocks can be divided among parallel readers,
+      for example: `read_lines(path, range(0, 8))` and
+      `read_lines(path, range(8, 16))`. By default, all blocks are read.
+    """
+    index: List[Block] = read_index(path)
+    selected: Iterable[Union[int, Block]] = (
+        index if blocks is None else blocks
+    )
+    with open(path, 'rb') as file:
+        for block in selected:
+            if isinstance(block, int):
+                block = index[block]
+            file.seek(block.offset)
+            yield from zlib.decompress(
+                file.read(block.length)
+            ).decode('utf-8').splitlines(True)
+
+
+class BlockReader:
+    """
+    A file-like object reading the lines of selected blocks of an archive,
+    which can be passed to any function accepting a file object for a saved
+    "CDS501.txt" file:
+
+    >>> store = cds501.get_store(archive.BlockReader(path, range(0, 8)))
+
+    Parameters:
+
+    - path (str): The path of the archive.
+
+    - blocks ([int|Block]): See `read_lines`.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, PathLike],
+        blocks: Optional[Iterable[Union[int, Block]]] = None
+    ) -> None:
+        self.path: Union[str, PathLike] = path
+        self.blocks: Optional[List[Union[int, Block]]] = (
+            None if blocks is None else list(blocks)
+        )
+
+    def __iter__(self) -> Iterator[str]:
+        return read_lines(self.path, self.blocks)
+
+    def read(self) -> str:
+        return ''.join(self)
+
+
+def select(
+    blocks: Iterable[Block],
+    years: Optional[Iterable[Union[str, int]]] = None,
+    counties: Optional[Iterable[str]] = None,
+    crash_ids: Optional[Iterable[Union[str, int]]] = None
+) -> List[Block]:
+    """
+    Get the blocks which may hold crashes in any of `years`, `counties` (see
+    `odot_cds.cds501.DECODE_TABLES`: county IDs such as "20") and with any
+    of `crash_ids` (each, if provided).
+    """
+    year_set: Optional[Set[str]] = (
+        None if years is None else set(str(year) for year in years)
+    )
+    county_set: Optional[Set[str]] = (
+        None if counties is None else set(counties)
+    )
+    crash_id_list: Optional[List[int]] = (
+        None if crash_ids is None else [
+            int(crash_id) for crash_id in crash_ids
+        ]
+    )
+    return [
+        block
+        for block in blocks
+        if (year_set is None or year_set.intersection(block.years)) and (
+            county_set is None or county_set.intersection(block.counties)
+        ) and (
+            crash_id_list is None or any(
+                block.first_crash_id <= crash_id <= block.last_crash_id
+                for crash_id in crash_id_list
+            )
+        )
+    ]
@@ -1,13 +1,21 @@
 import csv
+import hashlib
+import operator
 import sys
-from dataclasses import dataclass, fields
+from dataclasses import Field, astuple, dataclass, field, fields
 from decimal import Decimal
 from http.client import HTTPResponse
+from os import PathLike
 from traceback import format_exception
-from typing import Optional, Iterable, Tuple, Set, List, Union
+from typing import (
+    IO, Any, Callable, Collection, Dict, FrozenSet, Iterator, Optional,
+    Iterable, Sequence, Tuple, Set, List, Union
+)
 
 import pandas
 
+from . import archive, columnar, spatial
+
 
 @dataclass(unsafe_hash=True, frozen=True)
 class CDS501:
@@ -147,10 +155,10 @@ class CDS501:
     sfty_equip_use_cd: Optional[str]
     airbag_deploy_ind: Optional[str]
     mvmnt_cd: Optional[str]
-    cmpss_dir_from_cd: Optional[str]
-    cmpss_dir_to_cd: Optional[str]
+    partic_cmpss_dir_from_cd: Optional[str]
+    partic_cmpss_dir_to_cd: Optional[str]
     non_motrst_loc_cd: Optional[str]
-    actn_cd: Optional[str]
+    partic_actn_cd: Optional[str]
     partic_err_1_cd: Optional[str]
     partic_err_2_cd: Optional[str]
     partic_err_3_cd: Optional[str]
@@ -165,38 +173,46 @@ class CDS501:
     drug_use_rpt_ind: Optional[str]
     strikg_partic_flg: Optional[bool]
 
+    @property
+    def values(self) -> Tuple[Union[str, int, Decimal, float, bool], ...]:
+        """
+        This row's values, in the order in which they appear in a CDS501
+        extract
+        """
+        return tuple(
+            getattr(self, field_.name)
+            for field_ in CDS501_FIELDS
+        )
+
     @property
     def crash(self) -> "Crash":
         """
         As a `Crash` instance
         """
-        values: List[Union[str, int, Decimal, float, bool]] = []
-        for index in range(len(CDS501_FIELDS)):
-            if CDS501_FIELDS.name in CRASH_FIELD_NAMES:
-                values.append(self[index])
-        return Crash(*values)
+        values: Tuple[Union[str, int, Decimal, float, bool], ...] = (
+            self.values
+        )
+        return Crash(*(values[index] for index in CRASH_INDICES))
 
     @property
     def vhcl(self) -> "Vhcl":
         """
         As a `Vhcl` instance
         """
-        values: List[Union[str, int, Decimal, float, bool]] = []
-        for index in range(len(CDS501_FIELDS)):
-            if CDS501_FIELDS.name in VHCL_FIELD_NAMES:
-                values.append(self[index])
-        return Vhcl(*values)
+        values: Tuple[Union[str, int, Decimal, float, bool], ...] = (
+            self.values
+        )
+        return Vhcl(*(values[index] for index in VHCL_INDICES))
 
     @property
     def partic(self) -> "Partic":
         """
         As a `Partic` instance
         """
-        values: List[Union[str, int, Decimal, float, bool]] = []
-        for index in range(len(CDS501_FIELDS)):
-            if CDS501_FIELDS.name in PARTIC_FIELD_NAMES:
-                values.append(self[index])
-        return Partic(*values)
+        values: Tuple[Union[str, int, Decimal, float, bool], ...] = (
+            self.values
+        )
+        return Partic(*(values[index] for index in PARTIC_INDICES))
 
 
 CDS501_FIELDS: Tuple[object] = fields(CDS501)
@@ -206,6 +222,13 @@ CDS501_FIELD_NAMES: Set[str] = set(
     for field_ in CDS501_FIELDS
 )
 
+# CDS501 rows lead with 7 key columns, followed by the crash, vehicle and
+# participant columns (in that order). The following indices locate the values
+# for each of the `Crash`, `Vhcl` and `Partic` fields within a CDS501 row.
+CRASH_INDICES: Tuple[int, ...] = (0,) + tuple(range(7, 102))
+VHCL_INDICES: Tuple[int, ...] = (0, 2, 5) + tuple(range(102, 124))
+PARTIC_INDICES: Tuple[int, ...] = (0, 2, 3, 4, 5, 6) + tuple(range(124, 152))
+
 
 @dataclass(unsafe_hash=True, frozen=True)
 class Crash:
@@ -395,19 +418,449 @@ PARTIC_FIELD_NAMES = set(
 )
 
 
-def read(response: HTTPResponse) -> Iterable[CDS501]:
-    # Make sure the response is for CDS501
-    content_disposition: str = response.headers['Content-disposition']
-    print(content_disposition)
-    assert content_disposition == 'attachment; filename=CDS501.txt'
-    for row in csv.reader(
-        str(
-            line,
-            encoding='utf-8'
-        ) for line in response.readlines()
-    ):
+@dataclass
+class VhclGroup:
+    """
+    A vehicle, and the participants who occupied it
+    """
+
+    vhcl: Vhcl
+    partics: List[Partic] = field(default_factory=list)
+
+
+@dataclass
+class CrashGroup:
+    """
+    A crash, its vehicles (each holding its occupants), and the participants
+    not associated with any of its vehicles (pedestrians, pedal cyclists,
+    etc.)
+    """
+
+    crash: Crash
+    vhcls: List[VhclGroup] = field(default_factory=list)
+    partics: List[Partic] = field(default_factory=list)
+
+    def iter_partics(self) -> Iterator[Partic]:
+        """
+        Yield every participant in the crash: vehicle occupants (by vehicle),
+        followed by participants not associated with a vehicle
+        """
+        for vhcl_group in self.vhcls:
+            yield from vhcl_group.partics
+        yield from self.partics
+
+
+CDS501_COLUMN_COUNT: int = len(CDS501_FIELDS)
+
+# The position of each field within a CDS501 row
+CDS501_FIELD_INDICES: Dict[str, int] = {
+    field_.name: index
+    for index, field_ in enumerate(CDS501_FIELDS)
+}
+
+
+# CDS501 code columns, mapped to the table in the CDS510 "Decode" database
+# (`odot_cds.client.Extract.CDS510`) from which their values are drawn. Each
+# code can be found in the first column of the corresponding decode table. This
+# mapping is also documented in the "Decode Table" column of
+# "sources/cds501-fields.csv".
+DECODE_TABLES: Dict[str, str] = {
+    'crash_wk_day_cd': 'WKDAY',
+    'crash_hr_no': 'CRASH_HR',
+    'cnty_id': 'CNTY',
+    'city_sect_id': 'CITY_SECT',
+    'urb_area_cd': 'URB_AREA',
+    'fc_cd': 'FUNC_CLASS',
+    'hwy_no': 'HWY_HIST',
+    'rdwy_no': 'RDWY',
+    'hwy_compnt_cd': 'HWY_COMPNT',
+    'mlge_typ_cd': 'MLGE_TYP',
+    'specl_jrsdct_id': 'SPECL_JRSDCT',
+    'cmpss_dir_cd': 'CMPSS_DRCT',
+    'rd_char_cd': 'RD_CHAR',
+    'isect_typ_cd': 'ISECT_TYP',
+    'medn_typ_cd': 'MEDN_TYP',
+    'impct_loc_cd': 'IMPCT_LOC',
+    'crash_typ_cd': 'CRASH_TYP',
+    'collis_typ_cd': 'COLLIS_TYP',
+    'crash_svrty_cd': 'CRASH_SVRTY',
+    'wthr_cond_cd': 'WTHR_COND',
+    'rd_surf_cond_cd': 'RD_SURF_COND',
+    'lgt_cond_cd': 'LGT_COND',
+    'traf_cntl_device_cd': 'TRAF_CNTL_DEVICE',
+    'invstg_agy_cd': 'INVSTG_AGY',
+    'crash_evnt_1_cd': 'EVNT',
+    'crash_evnt_2_cd': 'EVNT',
+    'crash_evnt_3_cd': 'EVNT',
+    'crash_cause_1_cd': 'CAUSE',
+    'crash_cause_2_cd': 'CAUSE',
+    'crash_cause_3_cd': 'CAUSE',
+    'pop_rng_cd': 'POP_RNG',
+    'rd_cntl_cd': 'RD_CNTL',
+    'vhcl_ownshp_cd': 'VHCL_OWNSHP',
+    'vhcl_use_cd': 'VHCL_USE',
+    'vhcl_typ_cd': 'VHCL_TYP',
+    'vhcl_mvmnt_cd': 'MVMNT',
+    'cmpss_dir_from_cd': 'CMPSS_DRCT',
+    'cmpss_dir_to_cd': 'CMPSS_DRCT',
+    'actn_cd': 'ACTN',
+    'vhcl_cause_1_cd': 'CAUSE',
+    'vhcl_cause_2_cd': 'CAUSE',
+    'vhcl_cause_3_cd': 'CAUSE',
+    'vhcl_evnt_1_cd': 'EVNT',
+    'vhcl_evnt_2_cd': 'EVNT',
+    'vhcl_evnt_3_cd': 'EVNT',
+    'partic_typ_cd': 'PARTIC_TYP',
+    'sex_cd': 'SEX',
+    'drvr_lic_stat_cd': 'DRVR_LIC_STAT',
+    'drvr_res_stat_cd': 'DRVR_RES_STAT',
+    'inj_svrty_cd': 'INJ_SVRTY',
+    'sfty_equip_use_cd': 'SFTY_EQUIP_USE',
+    'mvmnt_cd': 'MVMNT',
+    'partic_cmpss_dir_from_cd': 'CMPSS_DRCT',
+    'partic_cmpss_dir_to_cd': 'CMPSS_DRCT',
+    'non_motrst_loc_cd': 'NON_MOTRST_LOC',
+    'partic_actn_cd': 'ACTN',
+    'partic_err_1_cd': 'ERR',
+    'partic_err_2_cd': 'ERR',
+    'partic_err_3_cd': 'ERR',
+    'partic_cause_1_cd': 'CAUSE',
+    'partic_cause_2_cd': 'CAUSE',
+    'partic_cause_3_cd': 'CAUSE',
+    'partic_evnt_1_cd': 'EVNT',
+    'partic_evnt_2_cd': 'EVNT',
+    'partic_evnt_3_cd': 'EVNT',
+}
+
+# The pandas data type of each integer field in compact data frames (see
+# `get_data_frames`), sized to the domain of the field: CDS510 "tinyint"
+# columns (sequence numbers and vehicle-level counts) range from 0 through
+# 255, crash-level counts and section IDs fit in 16 bits, and degrees and
+# minutes fit in 8 bits (or 16, for longitude)
+INTEGER_DTYPES: Dict[str, str] = {
+    'crash_id': 'Int32',
+    'vhcl_id': 'Int32',
+    'partic_id': 'Int32',
+    'partic_dsply_seq_no': 'UInt8',
+    'vhcl_coded_seq_no': 'UInt8',
+    'partic_vhcl_seq_no': 'UInt8',
+    'city_sect_id': 'Int16',
+    'urb_area_cd': 'UInt8',
+    'lat_deg_no': 'Int8',
+    'lat_minute_no': 'Int8',
+    'longtd_deg_no': 'Int16',
+    'longtd_minute_no': 'Int8',
+    'isect_seq_no': 'Int16',
+    'from_isect_dstnc_qty': 'Int32',
+    'ln_qty': 'UInt8',
+    'turng_leg_qty': 'Int8',
+    'tot_vhcl_cnt': 'Int16',
+    'tot_fatal_cnt': 'Int16',
+    'tot_inj_lvl_a_cnt': 'Int16',
+    'tot_inj_lvl_b_cnt': 'Int16',
+    'tot_inj_lvl_c_cnt': 'Int16',
+    'tot_inj_cnt': 'Int16',
+    'tot_uninjd_age00_04_cnt': 'Int16',
+    'tot_uninjd_per_cnt': 'Int16',
+    'tot_ped_cnt': 'Int16',
+    'tot_ped_fatal_cnt': 'Int16',
+    'tot_ped_inj_cnt': 'Int16',
+    'tot_pedcycl_cnt': 'Int16',
+    'tot_pedcycl_fatal_cnt': 'Int16',
+    'tot_pedcycl_inj_cnt': 'Int16',
+    'tot_unknwn_cnt': 'Int16',
+    'tot_unknwn_fatal_cnt': 'Int16',
+    'tot_unknwn_inj_cnt': 'Int16',
+    'tot_occup_cnt': 'Int16',
+    'tot_per_invlv_cnt': 'Int16',
+    'tot_sfty_equip_used_qty': 'Int16',
+    'tot_sfty_equip_unused_qty': 'Int16',
+    'tot_sfty_equip_use_unknown_qty': 'Int16',
+    'trlr_qty': 'UInt8',
+    'vhcl_sfty_equip_used_qty': 'UInt8',
+    'vhcl_sfty_equip_unused_qty': 'UInt8',
+    'vhcl_sfty_equip_use_unknwn_qty': 'UInt8',
+    'vhcl_occup_cnt': 'UInt8'
+}
+
+# The number of decimal places of each decimal field (the scale of the
+# corresponding CDS510 "decimal" column), with which the field is encoded as
+# an exact `odot_cds.columnar.FixedPointColumn` in a columnar store
+DECIMAL_SCALES: Dict[str, int] = {
+    'lat_sec_no': 7,
+    'longtd_sec_no': 7,
+    'mp_no': 2
+}
+
+Source = Union[HTTPResponse, str, PathLike, IO]
+
+# Code fields (typed `str`) whose codes are numbers, written with or without
+# zero-padding (months are "1" through "12", but county IDs are "01" through
+# "36"), which filters compare as numbers
+NUMERIC_CODE_FIELDS: FrozenSet[str] = frozenset((
+    'crash_yr_no',
+    'crash_mo_no',
+    'crash_day_no',
+    'crash_hr_no',
+    'cnty_id'
+))
+
+# A filter on a crash-level field, in the form `(field_name, operator,
+# value)`, for example: `('crash_svrty_cd', '=', '2')` or
+# `('cnty_id', 'in', ('03', '26'))`
+Filter = Tuple[str, str, Any]
+
+_OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    '=': operator.eq,
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    'in': lambda value, values: value in values,
+    'not in': lambda value, values: value not in values
+}
+
+
+def get_field_type(field_: Field) -> type:
+    """
+    Get the type of a dataclass field, unwrapping `typing.Optional`
+    """
+    type_: type = field_.type
+    if getattr(type_, '__origin__', None) is Union:
+        type_ = next(
+            argument
+            for argument in type_.__args__
+            if argument is not type(None)
+        )
+    return type_
+
+
+def _is_source(data: object) -> bool:
+    """
+    Determine whether `data` is an HTTP response, file path or file object
+    (as opposed to an iterable of parsed rows)
+    """
+    return isinstance(data, (HTTPResponse, str, PathLike)) or hasattr(
+        data, 'read'
+    )
+
+
+def _get_token_converter(
+    type_: type,
+    field_name: Optional[str] = None
+) -> Callable[[str], Any]:
+    """
+    Get a function converting a (stripped, non-empty) token into a value
+    which can be compared with filter values for a field of the given type
+    (and name)
+    """
+    if type_ is int or field_name in NUMERIC_CODE_FIELDS:
+        return int
+    if type_ in (Decimal, float):
+        return float
+    return str
+
+
+def _get_filter_value(
+    value: Any,
+    type_: type,
+    field_name: Optional[str] = None
+) -> Any:
+    """
+    Convert a value from a filter for comparison with converted tokens
+    """
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    return _get_token_converter(type_, field_name)(str(value).strip())
+
+
+def get_predicate(
+    filters: Sequence[Filter]
+) -> Callable[[Sequence[str]], bool]:
+    """
+    Compile filters on crash-level fields into a function which tests the raw
+    (unstripped, and possibly truncated) values of a CDS501 crash row. Only
+    the values of filtered fields are converted. A null value does not match
+    any filter.
+
+    Parameters:
+
+    - filters ([(str, str, object)]): Filters in the form
+      `(field_name, operator, value)`, all of which must match. The supported
+      operators are "=", "!=", "<", "<=", ">", ">=", "in" and "not in".
+      Values are compared as numbers for numeric fields (and for the code
+      fields in `NUMERIC_CODE_FIELDS`, so that `('crash_mo_no', '<=', 6)`
+      and `('cnty_id', '=', 3)` match unpadded months and padded county
+      IDs), and as strings otherwise. A value which cannot be compared as a
+      number does not match.
+    """
+    tests: List[Tuple[int, Callable[[str], Any], Callable, Any]] = []
+    for field_name, operator_, value in filters:
+        index: Optional[int] = CDS501_FIELD_INDICES.get(field_name)
+        if index is None or index not in CRASH_INDICES:
+            raise ValueError(
+                '%s is not a crash-level field' % repr(field_name)
+            )
+        if operator_ not in _OPERATORS:
+            raise ValueError('Unsupported operator: %s' % repr(operator_))
+        type_: type = get_field_type(CDS501_FIELDS[index])
+        tests.append((
+            index,
+            _get_token_converter(type_, field_name),
+            _OPERATORS[operator_],
+            (
+                frozenset(
+                    _get_filter_value(item, type_, field_name)
+                    for item in value
+                )
+                if operator_ in ('in', 'not in') else
+                _get_filter_value(value, type_, field_name)
+            )
+        ))
+
+    def predicate(row: Sequence[str]) -> bool:
+        for index, convert, function, operand in tests:
+            token: str = row[index].strip() if index < len(row) else ''
+            if not token:
+                return False
+            try:
+                if not function(convert(token), operand):
+                    return False
+            except ValueError:
+                return False
+        return True
+
+    return predicate
+
+
+def _filter_rows(
+    rows: Iterable[Sequence[str]],
+    predicate: Callable[[Sequence[str]], bool]
+) -> Iterator[Sequence[str]]:
+    """
+    Yield crash rows which match `predicate`, along with the vehicle and
+    participant rows which follow them (and have the same `crash_id`)
+    """
+    crash_id: Optional[str] = None
+    for row in rows:
+        if not row:
+            continue
+        if row[1].strip() == '1':
+            crash_id = row[0].strip() if predicate(row) else None
+            if crash_id is not None:
+                yield row
+        elif crash_id is not None and row[0].strip() == crash_id:
+            yield row
+
+
+def _get_column_indices(columns: Iterable[str]) -> List[int]:
+    """
+    Get the indices, within a CDS501 row, of the key fields and the given
+    fields
+    """
+    indices: Set[int] = set(range(7))
+    for column in columns:
+        if column not in CDS501_FIELD_INDICES:
+            raise ValueError('%s is not a CDS501 field' % repr(column))
+        indices.add(CDS501_FIELD_INDICES[column])
+    return sorted(indices)
+
+
+def _read_lines(source: Source) -> Iterable[str]:
+    """
+    Yield each line of text in a CDS501 extract
+    """
+    if isinstance(source, HTTPResponse):
+        # Make sure the response is for CDS501
+        content_disposition: str = source.headers['Content-disposition']
+        assert content_disposition == 'attachment; filename=CDS501.txt'
+    yield from archive.read_source_lines(source)
+
+
+def read_values(
+    source: Union[Source, Iterable[CDS501]],
+    filters: Optional[Sequence[Filter]] = None,
+    columns: Optional[Collection[str]] = None
+) -> Iterable[List[str]]:
+    """
+    Yield the values in each row of a CDS501 extract, as a list of strings.
+    Values are stripped of surrounding whitespace (so that null values are
+    represented by an empty string), and each row is padded to the full width
+    of a CDS501 row (extracts omit trailing columns which do not apply to a
+    given record type).
+
+    Parameters:
+
+    - source (http.client.HTTPResponse|str|typing.IO): A CDS501 extract, as
+      returned by `odot_cds.client.Client.extract()`, or the path to (or a
+      file object for) a saved "CDS501.txt" file. An iterable of `CDS501`
+      instances is also accepted.
+
+    - filters ([(str, str, object)]): Filters on crash-level fields (see
+      `get_predicate`). Filters are tested before any other values are
+      processed, and vehicle and participant rows are yielded only if their
+      crash matches.
+
+    - columns ([str]): The names of the fields to read. Key fields (the first
+      7 fields) are always read, and other fields are yielded as empty
+      strings.
+    """
+    rows: Iterable[Sequence[str]] = (
+        csv.reader(_read_lines(source))
+        if _is_source(source) else
+        (
+            ['' if value is None else str(value) for value in row.values]
+            for row in source
+        )
+    )
+    if filters:
+        rows = _filter_rows(rows, get_predicate(filters))
+    if columns is not None:
+        indices: List[int] = _get_column_indices(columns)
+        for row in rows:
+            if row:
+                values: List[str] = [''] * CDS501_COLUMN_COUNT
+                for index in indices:
+                    if index < len(row):
+                        values[index] = row[index].strip()
+                yield values
+        return
+    for row in rows:
+        if row:
+            values = [value.strip() for value in row]
+            if len(values) < CDS501_COLUMN_COUNT:
+                values += [''] * (CDS501_COLUMN_COUNT - len(values))
+            yield values
+
+
+def read(
+    source: Source,
+    filters: Optional[Sequence[Filter]] = None,
+    columns: Optional[Collection[str]] = None
+) -> Iterable[CDS501]:
+    """
+    Yield a `CDS501` instance for each row of a CDS501 extract, with null
+    values represented as `None`.
+
+    Parameters:
+
+    - source (http.client.HTTPResponse|str|typing.IO): A CDS501 extract, as
+      returned by `odot_cds.client.Client.extract()`, or the path to (or a
+      file object for) a saved "CDS501.txt" file.
+
+    - filters ([(str, str, object)]): Filters on crash-level fields, for
+      example: `[('crash_svrty_cd', '=', '2'), ('cnty_id', '=', '03')]`
+      (see `get_predicate`). Vehicle and participant rows are yielded only
+      if their crash matches.
+
+    - columns ([str]): The names of the fields to read (key fields are
+      always read). Other fields are `None`.
+    """
+    for row in read_values(source, filters, columns):
         try:
-            yield CDS501(*row)
+            yield CDS501(*(value or None for value in row))
         except TypeError:
             raise TypeError(
                  '%s\n(%s values)\n%s' % (
@@ -448,37 +901,514 @@ def split(
     return crash_rows, vhcl_rows, partic_rows
 
 
-def get_data_frames(
+def _get_table_rows(
     data: Union[
-        HTTPResponse,
+        Source,
         Tuple[
             List[Crash],
             List[Vhcl],
             List[Partic]
         ],
         Iterable[CDS501]
-    ]
+    ],
+    filters: Optional[Sequence[Filter]] = None,
+    columns: Optional[Collection[str]] = None
+) -> Tuple[
+    List[Sequence[str]],
+    List[Sequence[str]],
+    List[Sequence[str]]
+]:
+    """
+    Given any input accepted by `get_data_frames`, return the rows of string
+    values (with empty strings representing null values) for each of the
+    `CRASH`, `VHCL` and `PARTIC` tables
+    """
+    if isinstance(data, tuple) and len(data) == 3:
+        if filters or columns is not None:
+            raise ValueError(
+                'Filters and columns cannot be applied to the output of '
+                '`split()`'
+            )
+        return tuple(
+            [
+                tuple(
+                    '' if value is None else str(value)
+                    for value in astuple(instance)
+                )
+                for instance in instances
+            ]
+            for instances in data
+        )
+    return _split_values(read_values(data, filters, columns))
+
+
+def _split_values(
+    rows: Iterable[Sequence[str]]
 ) -> Tuple[
-    pandas.DataFrame,
-    pandas.DataFrame,
-    pandas.DataFrame
+    List[Sequence[str]],
+    List[Sequence[str]],
+    List[Sequence[str]]
+]:
+    """
+    Split rows of string values, as yielded by `read_values`, into the rows
+    of the `CRASH`, `VHCL` and `PARTIC` tables
+    """
+    crash_rows: List[Sequence[str]] = []
+    vhcl_rows: List[Sequence[str]] = []
+    partic_rows: List[Sequence[str]] = []
+    for row in rows:
+        record_type: str = row[1]
+        if record_type == '1':
+            crash_rows.append(tuple(row[index] for index in CRASH_INDICES))
+        elif record_type == '2':
+            vhcl_rows.append(tuple(row[index] for index in VHCL_INDICES))
+        elif record_type == '3':
+            partic_rows.append(tuple(row[index] for index in PARTIC_INDICES))
+    return crash_rows, vhcl_rows, partic_rows
+
+
+def _get_table(
+    name: str,
+    dataclass_: type,
+    rows: List[Sequence[str]],
+    dictionaries: Dict[str, columnar.Dictionary],
+    column_names: Optional[Collection[str]] = None
+) -> columnar.Table:
+    """
+    Encode rows of string values as a columnar table, including only key
+    fields and `column_names` (if provided)
+    """
+    columns: Dict[str, columnar.Column] = {}
+    dataclass_fields: Tuple[Field, ...] = fields(dataclass_)
+    values: Sequence[Sequence[str]] = (
+        tuple(zip(*rows))
+        if rows else
+        ((),) * len(dataclass_fields)
+    )
+    for field_, field_values in zip(dataclass_fields, values):
+        if not (
+            column_names is None or
+            field_.name in column_names or
+            CDS501_FIELD_INDICES[field_.name] < 7
+        ):
+            continue
+        type_: type = get_field_type(field_)
+        dictionary: Optional[columnar.Dictionary] = None
+        if type_ is str:
+            domain: str = DECODE_TABLES.get(field_.name, field_.name)
+            if domain not in dictionaries:
+                dictionaries[domain] = columnar.Dictionary()
+            dictionary = dictionaries[domain]
+        columns[field_.name] = columnar.encode(
+            field_values,
+            type_,
+            dictionary,
+            DECIMAL_SCALES.get(field_.name)
+        )
+    return columnar.Table(name, columns)
+
+
+def get_store(
+    data: Union[
+        Source,
+        Tuple[
+            List[Crash],
+            List[Vhcl],
+            List[Partic]
+        ],
+        Iterable[CDS501]
+    ],
+    dictionaries: Optional[Dict[str, columnar.Dictionary]] = None,
+    filters: Optional[Sequence[Filter]] = None,
+    columns: Optional[Collection[str]] = None,
+    cache: Optional[str] = None
+) -> columnar.Store:
+    """
+    Given an extract obtained from `odot_cds.client.Client.extract()` (or any
+    other input accepted by `get_data_frames`), return an
+    `odot_cds.columnar.Store` holding dictionary-encoded `CRASH`, `VHCL` and
+    `PARTIC` tables.
+
+    Parameters:
+
+    - data: See `get_data_frames`.
+
+    - dictionaries ({str: odot_cds.columnar.Dictionary}): Dictionaries to
+      share, keyed by CDS510 decode table name (or, for code columns without
+      a decode table, by column name). Passing the dictionaries of an
+      existing store, or those returned by
+      `odot_cds.columnar.load_dictionaries()`, causes codes to be consistent
+      across stores. Dictionaries are created as needed if not provided.
+
+    - filters ([(str, str, object)]): See `get_data_frames`.
+
+    - columns ([str]): See `get_data_frames`. Only the selected columns are
+      encoded.
+
+    - cache (str): A directory in which to cache the store (see
+      `odot_cds.columnar.Store.write`), when `data` is the path to a saved
+      "CDS501.txt" file. If the directory holds a store parsed from a file
+      with the same content (and with the same filters and columns), that
+      store is loaded (memory-mapped) in lieu of parsing the file. Otherwise,
+      the file is parsed, and the store is saved in the directory.
+    """
+    if cache is None:
+        return _get_store(
+            _get_table_rows(data, filters, columns),
+            dictionaries,
+            columns
+        )
+    if not isinstance(data, (str, PathLike)):
+        raise ValueError(
+            'Only a saved "CDS501.txt" file can be cached, not %s' %
+            repr(data)
+        )
+    metadata: Dict[str, str] = {
+        'source_hash': _get_file_hash(data),
+        'filters': repr(filters),
+        'columns': repr(None if columns is None else sorted(columns))
+    }
+    manifest: Optional[Dict[str, Any]] = columnar.read_manifest(cache)
+    if manifest is not None and manifest['metadata'] == metadata:
+        store: columnar.Store = columnar.Store.read(cache)
+        if dictionaries is None:
+            return store
+        # Translate the cached codes into the provided dictionaries
+        return columnar.concatenate([store], dictionaries)
+    store = _get_store(
+        _get_table_rows(data, filters, columns),
+        dictionaries,
+        columns
+    )
+    store.write(cache, metadata)
+    return store
+
+
+def _get_file_hash(path: Union[str, PathLike]) -> str:
+    """
+    Get the SHA-256 hash of a file's content
+    """
+    hash_: Any = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            hash_.update(block)
+    return hash_.hexdigest()
+
+
+def _get_store(
+    table_rows: Tuple[
+        List[Sequence[str]],
+        List[Sequence[str]],
+        List[Sequence[str]]
+    ],
+    dictionaries: Optional[Dict[str, columnar.Dictionary]] = None,
+    columns: Optional[Collection[str]] = None
+) -> columnar.Store:
+    """
+    Encode the rows of the `CRASH`, `VHCL` and `PARTIC` tables as a store
+    """
+    if dictionaries is None:
+        dictionaries = {}
+    crash_rows, vhcl_rows, partic_rows = table_rows
+    crash: columnar.Table = _get_table(
+        'crash',
+        Crash,
+        crash_rows,
+        dictionaries,
+        columns
+    )
+    # Add decimal degree coordinates, comparable to the `LAT_DD` and
+    # `LONGTD_DD` columns of the CDS510 "CRASH" table
+    for name, prefix in (('lat_dd', 'lat'), ('longtd_dd', 'longtd')):
+        parts: Tuple[str, str, str] = (
+            prefix + '_deg_no',
+            prefix + '_minute_no',
+            prefix + '_sec_no'
+        )
+        if all(part in crash for part in parts):
+            crash.columns[name] = columnar.FloatColumn(
+                spatial.get_decimal_degrees(*(crash[part] for part in parts))
+            )
+    # Rows are grouped by crash, and participant rows by vehicle, so the
+    # rows of each crash and vehicle are located by their keys
+    crash_ids: List[str] = [row[0] for row in crash_rows]
+    vhcl_ids: List[str] = [row[1] for row in vhcl_rows]
+    return columnar.Store(
+        crash=crash,
+        vhcl=_get_table('vhcl', Vhcl, vhcl_rows, dictionaries, columns),
+        partic=_get_table(
+            'partic',
+            Partic,
+            partic_rows,
+            dictionaries,
+            columns
+        ),
+        dictionaries=dictionaries,
+        crash_vhcl_offsets=columnar.Offsets.from_keys(
+            crash_ids,
+            [row[0] for row in vhcl_rows]
+        ),
+        crash_partic_offsets=columnar.Offsets.from_keys(
+            crash_ids,
+            [row[0] for row in partic_rows]
+        ),
+        vhcl_partic_offsets=columnar.Offsets.from_keys(
+            vhcl_ids,
+            [row[1] for row in partic_rows]
+        )
+    )
+
+
+def get_data_frames(
+    data: Union[
+        Source,
+        Tuple[
+            List[Crash],
+            List[Vhcl],
+            List[Partic]
+        ],
+        Iterable[CDS501]
+    ],
+    store: bool = False,
+    filters: Optional[Sequence[Filter]] = None,
+    columns: Optional[Collection[str]] = None,
+    cache: Optional[str] = None,
+    compact: bool = False
+) -> Union[
+    Tuple[
+        pandas.DataFrame,
+        pandas.DataFrame,
+        pandas.DataFrame
+    ],
+    columnar.Store
 ]:
     """
     Given an extract obtained from `odot_cds.client.Client.extract()`, return a
     `tuple` of 3 data frames: one representing the `CRASH` table, one
     representing the `VHCL` table, and one representing the `PARTIC` table.
+
+    Parameters:
+
+    - data: A CDS501 extract (an `HTTPResponse`, or the path to or a file
+      object for a saved "CDS501.txt" file), an iterable of `CDS501`
+      instances, or the `tuple` of lists returned by `split()`.
+
+    - store (bool): If `True`, a dictionary-encoded `odot_cds.columnar.Store`
+      is returned in lieu of data frames (see `get_store`). A store unpacks
+      into its `CRASH`, `VHCL` and `PARTIC` tables in the same manner as the
+      data frames, and can be converted to data frames (with categorical code
+      columns) by calling `odot_cds.columnar.Store.get_data_frames()`.
+
+    - filters ([(str, str, object)]): Filters on crash-level fields, all of
+      which must match, for example: `[('crash_yr_no', '=', '2018'),
+      ('crash_svrty_cd', 'in', ('2', '4'))]` (see `get_predicate`). Filters
+      are tested on the raw values of each crash row, before any other
+      values are processed, and vehicle and participant rows are kept only if
+      their crash matches.
+
+    - columns ([str]): The names of the fields to include in each table (key
+      fields, such as `crash_id`, are always included).
+
+    - cache (str): A directory in which to cache a parsed "CDS501.txt" file
+      (see `get_store`). When provided, data frames are converted from the
+      cached store (see `odot_cds.columnar.Store.get_data_frames()`).
+
+    - compact (bool): If `True`, data frames are converted from a columnar
+      store (see `get_store`), one array per column, rather than from
+      dataclass instances holding a string for every value: code columns
+      have a `category` data type, flags a `boolean` data type, decimal
+      fields a `float64` data type, and integer fields the nullable integer
+      data types in `INTEGER_DTYPES`.
     """
-    if isinstance(data, HTTPResponse):
-        data: Iterable[CDS501] = read(data)
+    if store or compact or cache is not None:
+        data_store: columnar.Store = get_store(
+            data,
+            filters=filters,
+            columns=columns,
+            cache=cache
+        )
+        if store:
+            return data_store
+        return data_store.get_data_frames(
+            INTEGER_DTYPES if compact else None
+        )
+    if _is_source(data) or filters or columns is not None:
+        if isinstance(data, tuple) and len(data) == 3:
+            raise ValueError(
+                'Filters and columns cannot be applied to the output of '
+                '`split()`'
+            )
+        data: Iterable[CDS501] = read(data, filters, columns)
     if not (isinstance(data, tuple) and len(data) == 3):
         data: Tuple[
             List[Crash],
             List[Vhcl],
             List[Partic]
         ] = split(data)
-    crash_rows, vhcl_rows, partic_rows = data
-    return (
-        pandas.DataFrame(crash_rows),
-        pandas.DataFrame(vhcl_rows),
-        pandas.DataFrame(partic_rows)
-    )
+    data_frames: List[pandas.DataFrame] = []
+    for dataclass_, rows in zip((Crash, Vhcl, Partic), data):
+        data_frame: pandas.DataFrame = pandas.DataFrame(rows)
+        if columns is not None:
+            data_frame = data_frame.reindex(columns=[
+                field_.name
+                for field_ in fields(dataclass_)
+                if (
+                    field_.name in columns or
+                    CDS501_FIELD_INDICES[field_.name] < 7
+                )
+            ])
+        data_frames.append(data_frame)
+    crash_data_frame, vhcl_data_frame, partic_data_frame = data_frames
+    return crash_data_frame, vhcl_data_frame, partic_data_frame
+
+
+def iter_crash_groups(
+    source: Union[Source, Iterable[CDS501]],
+    filters: Optional[Sequence[Filter]] = None,
+    columns: Optional[Collection[str]] = None
+) -> Iterator[List[List[str]]]:
+    """
+    Yield the rows of each crash in a CDS501 extract (a crash row followed by
+    the rows of its vehicles and participants), as lists of string values.
+    Rows are grouped by `crash_id` in the order in which they appear.
+
+    Parameters:
+
+    - source (http.client.HTTPResponse|str|typing.IO): See `read_values`.
+
+    - filters ([(str, str, object)]): See `read_values`.
+
+    - columns ([str]): See `read_values`.
+    """
+    group: List[List[str]] = []
+    for row in read_values(source, filters, columns):
+        if group and row[0] != group[0][0]:
+            yield group
+            group = []
+        group.append(row)
+    if group:
+        yield group
+
+
+def iter_crashes(
+    source: Union[Source, Iterable[CDS501]],
+    filters: Optional[Sequence[Filter]] = None,
+    columns: Optional[Collection[str]] = None
+) -> Iterator[CrashGroup]:
+    """
+    Yield a `CrashGroup` for each crash in a CDS501 extract, in one pass over
+    its rows. Rows are expected in the order in which CDS returns them (each
+    crash row followed by the rows of its vehicles and participants), and
+    only the rows of the current crash are held in memory. Rows of a crash
+    which precede its crash row are skipped, and participants whose vehicle
+    is not among those of their crash are held by the crash.
+
+    Parameters:
+
+    - source (http.client.HTTPResponse|str|typing.IO): See `read_values`.
+
+    - filters ([(str, str, object)]): See `read_values`.
+
+    - columns ([str]): See `read_values`.
+    """
+    for rows in iter_crash_groups(source, filters, columns):
+        crash_group: Optional[CrashGroup] = None
+        vhcl_groups: Dict[str, VhclGroup] = {}
+        for row in rows:
+            record_type: str = row[1]
+            if record_type == '1':
+                crash_group = CrashGroup(
+                    Crash(*(row[index] or None for index in CRASH_INDICES))
+                )
+            elif crash_group is None:
+                continue
+            elif record_type == '2':
+                vhcl_group: VhclGroup = VhclGroup(
+                    Vhcl(*(row[index] or None for index in VHCL_INDICES))
+                )
+                vhcl_groups[row[2]] = vhcl_group
+                crash_group.vhcls.append(vhcl_group)
+            elif record_type == '3':
+                partic: Partic = Partic(
+                    *(row[index] or None for index in PARTIC_INDICES)
+                )
+                if row[2] in vhcl_groups:
+                    vhcl_groups[row[2]].partics.append(partic)
+                else:
+                    crash_group.partics.append(partic)
+        if crash_group is not None:
+            yield crash_group
+
+
+def iter_data_frames(
+    data: Union[Source, Iterable[CDS501]],
+    chunk_rows: int = 100000,
+    store: bool = False,
+    dictionaries: Optional[Dict[str, columnar.Dictionary]] = None,
+    filters: Optional[Sequence[Filter]] = None,
+    columns: Optional[Collection[str]] = None
+) -> Iterator[
+    Union[
+        Tuple[
+            pandas.DataFrame,
+            pandas.DataFrame,
+            pandas.DataFrame
+        ],
+        columnar.Store
+    ]
+]:
+    """
+    Yield `CRASH`, `VHCL` and `PARTIC` data frames (as returned by
+    `get_data_frames`) for successive chunks of a CDS501 extract, so that an
+    extract can be processed without holding all of it in memory. A crash
+    and all of its vehicle and participant rows are always yielded in the
+    same chunk.
+
+    Parameters:
+
+    - data: A CDS501 extract (an `HTTPResponse`, or the path to or a file
+      object for a saved "CDS501.txt" file), or an iterable of `CDS501`
+      instances.
+
+    - chunk_rows (int): The maximum number of rows (of all record types) in
+      each chunk. A chunk only exceeds this size if a single crash has more
+      rows.
+
+    - store (bool): If `True`, an `odot_cds.columnar.Store` is yielded for
+      each chunk in lieu of data frames.
+
+    - dictionaries ({str: odot_cds.columnar.Dictionary}): Dictionaries to
+      be shared by the stores yielded when `store=True` (see `get_store`).
+      If not provided, all chunks share new dictionaries, so their codes are
+      consistent.
+
+    - filters ([(str, str, object)]): See `get_data_frames`.
+
+    - columns ([str]): See `get_data_frames`.
+    """
+    if dictionaries is None:
+        dictionaries = {}
+    chunk: List[List[str]] = []
+
+    def get_chunk() -> Union[
+        Tuple[
+            pandas.DataFrame,
+            pandas.DataFrame,
+            pandas.DataFrame
+        ],
+        columnar.Store
+    ]:
+        if store:
+            return _get_store(_split_values(chunk), dictionaries, columns)
+        return get_data_frames(
+            [CDS501(*(value or None for value in row)) for row in chunk],
+            columns=columns
+        )
+
+    for group in iter_crash_groups(data, filters, columns):
+        if chunk and len(chunk) + len(group) > chunk_rows:
+            yield get_chunk()
+            chunk = []
+        chunk.extend(group)
+    if chunk:
+        yield get_chunk()
@@ -0,0 +1,328 @@
+"""
+This module detects which crashes changed between successive extracts of the
+same window (CDS data for recent years is revised as late reports arrive and
+records are re-coded). Each crash group (a crash row, and the rows of its
+vehicles and participants) is fingerprinted by hashing its normalized
+values, and the fingerprints are stored in a SQLite database. Comparing a new
+extract with the stored fingerprints yields the crashes which were inserted,
+updated or deleted, so that only those need to be re-loaded downstream:
+
+>>> with changes.Differ('fingerprints.db') as differ:
+...     change_set = differ.diff('2018/baker/CDS501.txt')
+...     changes.apply(change_set, 'warehouse.db')
+...     differ.commit(change_set)
+"""
+import hashlib
+import sqlite3
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from typing import (
+    Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set,
+    Tuple, Union
+)
+
+from . import cds501, warehouse
+
+# The positions of fields in a CDS501 row
+_CRASH_YR_NO_INDEX: int = cds501.CDS501_FIELD_INDICES['crash_yr_no']
+_CRASH_MO_NO_INDEX: int = cds501.CDS501_FIELD_INDICES['crash_mo_no']
+_CRASH_DAY_NO_INDEX: int = cds501.CDS501_FIELD_INDICES['crash_day_no']
+_CNTY_ID_INDEX: int = cds501.CDS501_FIELD_INDICES['cnty_id']
+
+
+def _normalize_int(value: str) -> str:
+    return str(int(value))
+
+
+def _normalize_decimal(value: str) -> str:
+    return '{:f}'.format(Decimal(value).normalize())
+
+
+_NORMALIZERS: Dict[type, Callable[[str], str]] = {
+    int: _normalize_int,
+    Decimal: _normalize_decimal
+}
+
+# The normalizer for each field, by position in a CDS501 row (fields for
+# which this is `None` are compared as they are)
+_FIELD_NORMALIZERS: Tuple[Optional[Callable[[str], str]], ...] = tuple(
+    _NORMALIZERS.get(cds501.get_field_type(field_))
+    for field_ in cds501.CDS501_FIELDS
+)
+
+
+def _normalize(index: int, value: str) -> str:
+    """
+    Normalize a value so that formatting differences (such as "01" and "1",
+    or "39.7300000" and "39.73") do not register as changes
+    """
+    normalizer: Optional[Callable[[str], str]] = _FIELD_NORMALIZERS[index]
+    if normalizer is None or not value:
+        return value
+    try:
+        return normalizer(value)
+    except (ValueError, InvalidOperation):
+        return value
+
+
+def get_fingerprint(group: Sequence[Sequence[str]]) -> bytes:
+    """
+    Get a digest of the normalized values of a crash group (see
+    `odot_cds.cds501.iter_crash_groups`). The order of the group's rows does
+    not affect its fingerprint.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for row in sorted(
+        '\x1f'.join(
+            _normalize(index, value)
+            for index, value in enumerate(values)
+        )
+        for values in group
+    ):
+        digest.update(row.encode('utf-8'))
+        digest.update(b'\x1e')
+    return digest.digest()
+
+
+def _get_crash_date(group: Sequence[Sequence[str]]) -> Optional[int]:
+    """
+    Get the date of a crash group as an integer (YYYYMMDD)
+    """
+    for values in group:
+        if values[1] == '1':
+            try:
+                return (
+                    int(values[_CRASH_YR_NO_INDEX]) * 10000 +
+                    int(values[_CRASH_MO_NO_INDEX]) * 100 +
+                    int(values[_CRASH_DAY_NO_INDEX])
+                )
+            except ValueError:
+                return None
+    return None
+
+
+def _get_county_id(group: Sequence[Sequence[str]]) -> Optional[str]:
+    for values in group:
+        if values[1] == '1':
+            return values[_CNTY_ID_INDEX] or None
+    return None
+
+
+def _get_date_number(date_: date) -> int:
+    return date_.year * 10000 + date_.month * 100 + date_.day
+
+
+@dataclass
+class ChangeSet:
+    """
+    The differences between an extract and the stored fingerprints.
+
+    - inserted, updated, deleted: The IDs of crashes which are new, which
+      have changed, and which are no longer in the extract's window.
+
+    - unchanged_count: The number of crashes which have not changed.
+
+    - groups: The rows of each inserted or updated crash (see
+      `odot_cds.cds501.iter_crash_groups`), in the order of the extract.
+
+    - fingerprints: The fingerprint, date (as an integer, YYYYMMDD) and
+      county ID of each inserted or updated crash.
+    """
+
+    inserted: List[str] = field(default_factory=list)
+    updated: List[str] = field(default_factory=list)
+    deleted: List[str] = field(default_factory=list)
+    unchanged_count: int = 0
+    groups: List[List[List[str]]] = field(default_factory=list)
+    fingerprints: Dict[
+        str,
+        Tuple[bytes, Optional[int], Optional[str]]
+    ] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return bool(self.inserted or self.updated or self.deleted)
+
+    def read_values(self) -> Iterator[List[str]]:
+        """
+        Yield the rows of each inserted or updated crash
+        """
+        for group in self.groups:
+            yield from group
+
+    def read(self) -> Iterator[cds501.CDS501]:
+        """
+        Yield a `CDS501` instance for each row of each inserted or updated
+        crash. The result may be passed to any function accepting an iterable
+        of `CDS501` instances, such as `odot_cds.warehouse.load`.
+        """
+        for values in self.read_values():
+            yield cds501.CDS501(*(value or None for value in values))
+
+
+class Differ:
+    """
+    Compares extracts with the fingerprints of the crashes committed from
+    previous extracts.
+
+    Parameters:
+
+    - path (str): The path to a SQLite database in which fingerprints are
+      stored (by default, fingerprints are stored in an in-memory database).
+    """
+
+    def __init__(self, path: str = ':memory:') -> None:
+        self.connection: sqlite3.Connection = sqlite3.connect(path)
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS CRASH_FINGERPRINT (\n'
+            '    CRASH_ID TEXT PRIMARY KEY,\n'
+            '    FINGERPRINT BLOB,\n'
+            '    CRASH_DT INTEGER,\n'
+            '    CNTY_ID TEXT\n'
+            ') WITHOUT ROWID'
+        )
+        self.connection.commit()
+
+    def __enter__(self) -> 'Differ':
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __len__(self) -> int:
+        return self.connection.execute(
+            'SELECT COUNT(*) FROM CRASH_FINGERPRINT'
+        ).fetchone()[0]
+
+    def _get_window_crash_ids(
+        self,
+        begin_date: Optional[date],
+        end_date: Optional[date],
+        counties: Optional[Iterable[str]]
+    ) -> Iterator[str]:
+        """
+        Yield the IDs of stored crashes within a window
+        """
+        conditions: List[str] = []
+        parameters: List[object] = []
+        if begin_date is not None:
+            conditions.append('CRASH_DT >= ?')
+            parameters.append(_get_date_number(begin_date))
+        if end_date is not None:
+            conditions.append('CRASH_DT <= ?')
+            parameters.append(_get_date_number(end_date))
+        if counties is not None:
+            county_list: List[str] = list(counties)
+            conditions.append('CNTY_ID IN (%s)' % ', '.join(
+                '?' for _ in county_list
+            ))
+            parameters += county_list
+        for crash_id, in self.connection.execute(
+            'SELECT CRASH_ID FROM CRASH_FINGERPRINT%s' % (
+                (' WHERE ' + ' AND '.join(conditions)) if conditions else ''
+            ),
+            parameters
+        ):
+            yield crash_id
+
+    def diff(
+        self,
+        source: Union[cds501.Source, Iterable[cds501.CDS501]],
+        begin_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        counties: Optional[Iterable[str]] = None
+    ) -> ChangeSet:
+        """
+        Compare an extract (in which the rows of each crash are consecutive)
+        with the stored fingerprints. The fingerprints are not modified (see
+        `commit`).
+
+        Parameters:
+
+        - source (http.client.HTTPResponse|str|typing.IO|[CDS501]): A CDS501
+          extract (or the path to a saved "CDS501.txt" file), or an iterable
+          of `CDS501` instances, such as is returned by
+          `odot_cds.cds501.read()`.
+
+        - begin_date (datetime.date), end_date (datetime.date), counties
+          ([str]): The window of the extract. Stored crashes within the window
+          (on or after `begin_date`, on or before `end_date`, and in any of
+          `counties`, each if provided) which are not in the extract are
+          reported as deleted. By default, every stored crash is within the
+          window.
+        """
+        change_set: ChangeSet = ChangeSet()
+        seen: Set[str] = set()
+        for group in cds501.iter_crash_groups(source):
+            crash_id: str = group[0][0]
+            seen.add(crash_id)
+            fingerprint: bytes = get_fingerprint(group)
+            row: Optional[Tuple[bytes]] = self.connection.execute(
+                'SELECT FINGERPRINT FROM CRASH_FINGERPRINT WHERE CRASH_ID = ?',
+                (crash_id,)
+            ).fetchone()
+            if row is not None and row[0] == fingerprint:
+                change_set.unchanged_count += 1
+                continue
+            (
+                change_set.inserted
+                if row is None else
+                change_set.updated
+            ).append(crash_id)
+            change_set.groups.append(group)
+            change_set.fingerprints[crash_id] = (
+                fingerprint,
+                _get_crash_date(group),
+                _get_county_id(group)
+            )
+        change_set.deleted = [
+            crash_id
+            for crash_id in self._get_window_crash_ids(
+                begin_date,
+                end_date,
+                counties
+            )
+            if crash_id not in seen
+        ]
+        return change_set
+
+    def commit(self, change_set: ChangeSet) -> None:
+        """
+        Store the fingerprints of inserted and updated crashes, and remove
+        those of deleted crashes
+        """
+        with self.connection:
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO CRASH_FINGERPRINT '
+                '(CRASH_ID, FINGERPRINT, CRASH_DT, CNTY_ID) '
+                'VALUES (?, ?, ?, ?)',
+                (
+                    (crash_id,) + values
+                    for crash_id, values in change_set.fingerprints.items()
+                )
+            )
+            self.connection.executemany(
+                'DELETE FROM CRASH_FINGERPRINT WHERE CRASH_ID = ?',
+                ((crash_id,) for crash_id in change_set.deleted)
+            )
+
+
+def apply(change_set: ChangeSet, path: str) -> Dict[str, int]:
+    """
+    Apply a change set to a warehouse (see `odot_cds.warehouse`): the rows of
+    deleted and updated crashes are deleted (so that vehicles and
+    participants removed from an updated crash do not linger), and the rows
+    of inserted and updated crashes are loaded. Returns the number of rows
+    loaded into each table.
+
+    Parameters:
+
+    - change_set (ChangeSet): The changes.
+
+    - path (str): The path to the SQLite database.
+    """
+    warehouse.delete(path, change_set.deleted + change_set.updated)
+    return warehouse.load(change_set.read(), path)
@@ -0,0 +1,1154 @@
+"""
+This module provides a dictionary-encoded, columnar, in-memory representation
+of the CDS501 "crash", "vhcl" and "partic" tables. Code columns are held as
+arrays of small integers referencing a `Dictionary` which is shared by all
+columns drawing values from the same domain, while integer and flag columns
+are held as narrow numpy arrays accompanied by a null mask, and decimal columns
+are held exactly, as integers scaled by a power of ten.
+
+A store is most easily obtained by calling
+`odot_cds.cds501.get_data_frames(data, store=True)`.
+"""
+import json
+import os
+import sqlite3
+from dataclasses import dataclass
+from decimal import ROUND_FLOOR, Decimal
+from typing import (
+    Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+)
+
+import numpy
+import pandas
+
+# The name of the file describing a store saved with `Store.write`
+MANIFEST: str = 'manifest.json'
+
+# The names of the `Offsets` attributes of a store
+OFFSETS: Tuple[str, ...] = (
+    'crash_vhcl_offsets',
+    'crash_partic_offsets',
+    'vhcl_partic_offsets'
+)
+
+
+def _get_integer_dtype(minimum: int, maximum: int) -> numpy.dtype:
+    """
+    Get the narrowest signed integer data type capable of representing all
+    values between `minimum` and `maximum`
+    """
+    for dtype in (numpy.int8, numpy.int16, numpy.int32):
+        information: numpy.iinfo = numpy.iinfo(dtype)
+        if information.min <= minimum and maximum <= information.max:
+            return numpy.dtype(dtype)
+    return numpy.dtype(numpy.int64)
+
+
+class Dictionary:
+    """
+    An append-only mapping of values to integer codes. A dictionary may be
+    shared by multiple columns drawing values from the same domain: for
+    example, `crash_cause_1_cd`, `vhcl_cause_1_cd` and `partic_cause_1_cd`
+    all draw from the CDS510 "CAUSE" decode table.
+
+    Parameters:
+
+    - values ([str]): Values with which to seed the dictionary, such as the
+      complete set of codes found in a CDS510 decode table.
+    """
+
+    def __init__(self, values: Iterable[str] = ()) -> None:
+        self.values: List[str] = []
+        self.index: Dict[str, int] = {}
+        self._dtype: Optional[pandas.CategoricalDtype] = None
+        self.update(values)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __repr__(self) -> str:
+        return '%s(%s)' % (self.__class__.__name__, repr(self.values))
+
+    def __getstate__(self) -> Dict[str, object]:
+        # The cached data type is not pickled, as it can be re-built from the
+        # dictionary's values
+        return dict(self.__dict__, _dtype=None)
+
+    def add(self, value: str) -> int:
+        """
+        Get the code for `value`, adding `value` to the dictionary if it is
+        not already present
+        """
+        code: Optional[int] = self.index.get(value)
+        if code is None:
+            code = len(self.values)
+            self.index[value] = code
+            self.values.append(value)
+        return code
+
+    def update(self, values: Iterable[str]) -> None:
+        """
+        Add each of the provided values which are not already present
+        """
+        for value in values:
+            self.add(value)
+
+    @property
+    def dtype(self) -> pandas.CategoricalDtype:
+        """
+        A categorical data type with this dictionary's values as categories.
+        The same data type instance is returned until new values are added,
+        so that columns sharing this dictionary also share categories.
+        """
+        if self._dtype is None or len(self._dtype.categories) != len(self):
+            self._dtype = pandas.CategoricalDtype(
+                pandas.Index(self.values, dtype=object)
+            )
+        return self._dtype
+
+    def encode(self, values: Sequence[str]) -> numpy.ndarray:
+        """
+        Return an array of codes for `values`, in which empty strings
+        (null values) are represented by `-1`.
+        """
+        local_codes, uniques = pandas.factorize(
+            numpy.asarray(values, dtype=object)
+        )
+        # Translate codes local to this batch into dictionary codes, appending
+        # `-1` so that missing values (`-1`) are looked up as `-1`
+        lookup: numpy.ndarray = numpy.array(
+            [
+                -1 if value == '' else self.add(value)
+                for value in uniques
+            ] + [-1],
+            dtype=numpy.int64
+        )
+        return lookup[local_codes].astype(
+            _get_integer_dtype(-1, len(self))
+        )
+
+
+@dataclass
+class CodeColumn:
+    """
+    A dictionary-encoded column, wherein `codes` are positions in
+    `dictionary.values`, and `-1` represents a null value.
+    """
+
+    codes: numpy.ndarray
+    dictionary: Dictionary
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def take(self, indices: numpy.ndarray) -> 'CodeColumn':
+        return CodeColumn(self.codes[indices], self.dictionary)
+
+    def to_pandas(self) -> pandas.Categorical:
+        """
+        Convert this column to a `pandas.Categorical` (without copying any
+        string values)
+        """
+        return pandas.Categorical.from_codes(
+            self.codes,
+            dtype=self.dictionary.dtype
+        )
+
+
+@dataclass
+class IntegerColumn:
+    """
+    An integer column, wherein `mask` is `True` for null values.
+    """
+
+    values: numpy.ndarray
+    mask: numpy.ndarray
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def take(self, indices: numpy.ndarray) -> 'IntegerColumn':
+        return IntegerColumn(self.values[indices], self.mask[indices])
+
+    def to_pandas(
+        self,
+        dtype: Optional[str] = None
+    ) -> pandas.arrays.IntegerArray:
+        """
+        Convert this column to a nullable integer array, of the given pandas
+        data type (such as "Int16") if all values fit within it
+        """
+        values: numpy.ndarray = self.values
+        if dtype is not None:
+            numpy_dtype: numpy.dtype = numpy.dtype(dtype.lower())
+            information: numpy.iinfo = numpy.iinfo(numpy_dtype)
+            present: numpy.ndarray = values[~self.mask]
+            if not len(present) or (
+                information.min <= present.min() and
+                present.max() <= information.max
+            ):
+                values = values.astype(numpy_dtype, copy=False)
+        return pandas.arrays.IntegerArray(values, self.mask)
+
+
+@dataclass
+class FlagColumn:
+    """
+    A boolean column, wherein `mask` is `True` for null values.
+    """
+
+    values: numpy.ndarray
+    mask: numpy.ndarray
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def take(self, indices: numpy.ndarray) -> 'FlagColumn':
+        return FlagColumn(self.values[indices], self.mask[indices])
+
+    def to_pandas(self) -> pandas.arrays.BooleanArray:
+        return pandas.arrays.BooleanArray(self.values, self.mask)
+
+
+@dataclass
+class FloatColumn:
+    """
+    A floating point column, wherein null values are represented by `NaN`.
+    """
+
+    values: numpy.ndarray
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def take(self, indices: numpy.ndarray) -> 'FloatColumn':
+        return FloatColumn(self.values[indices])
+
+    def to_pandas(self) -> numpy.ndarray:
+        return self.values
+
+
+_COMPARISONS: Dict[str, Callable[[numpy.ndarray, int], numpy.ndarray]] = {
+    '=': numpy.equal,
+    '==': numpy.equal,
+    '!=': numpy.not_equal,
+    '<': numpy.less,
+    '<=': numpy.less_equal,
+    '>': numpy.greater,
+    '>=': numpy.greater_equal
+}
+
+
+@dataclass
+class FixedPointColumn:
+    """
+    An exact decimal column, wherein `values` are integers scaled by
+    `10 ** scale` (a `mp_no` of "292.50", with a scale of 2, is held as
+    `29250`), and `mask` is `True` for null values.
+    """
+
+    values: numpy.ndarray
+    mask: numpy.ndarray
+    scale: int
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def take(self, indices: numpy.ndarray) -> 'FixedPointColumn':
+        return FixedPointColumn(
+            self.values[indices],
+            self.mask[indices],
+            self.scale
+        )
+
+    def rescale(self, scale: int) -> 'FixedPointColumn':
+        """
+        Return this column with a greater (or equal) scale
+        """
+        if scale < self.scale:
+            raise ValueError(
+                'A scale of %s cannot hold values with a scale of %s' % (
+                    scale,
+                    self.scale
+                )
+            )
+        return FixedPointColumn(
+            self.values * 10 ** (scale - self.scale),
+            self.mask,
+            scale
+        )
+
+    def to_floats(self) -> numpy.ndarray:
+        """
+        Convert this column to a float64 array (each value being the float
+        nearest its decimal value), with null values represented by `NaN`
+        """
+        return numpy.where(
+            self.mask,
+            numpy.nan,
+            self.values / 10 ** self.scale
+        )
+
+    def to_decimals(self) -> numpy.ndarray:
+        """
+        Convert this column to an array of `Decimal` values (of `object` data
+        type), with null values represented by `None`
+        """
+        decimals: numpy.ndarray = numpy.empty(len(self), dtype=object)
+        for index, (value, null) in enumerate(zip(
+            self.values.tolist(),
+            self.mask.tolist()
+        )):
+            if not null:
+                decimals[index] = Decimal(value).scaleb(-self.scale)
+        return decimals
+
+    def to_pandas(self) -> numpy.ndarray:
+        return self.to_floats()
+
+    def compare(
+        self,
+        operator: str,
+        value: Union[str, int, float, Decimal]
+    ) -> numpy.ndarray:
+        """
+        Compare each value with `value` exactly (floats are compared by their
+        shortest decimal representation: `0.1` is compared as "0.1"),
+        returning a boolean array which is `False` for null values.
+
+        Parameters:
+
+        - operator (str): One of "=", "==", "!=", "<", "<=", ">" or ">=".
+
+        - value (str|int|float|decimal.Decimal): The value with which to
+          compare.
+        """
+        scaled: Decimal = Decimal(str(value)).scaleb(self.scale)
+        floor: int = int(scaled.to_integral_value(rounding=ROUND_FLOOR))
+        if scaled != floor:
+            # No scaled integer equals `value`, which lies between `floor`
+            # and `floor + 1`
+            if operator in ('=', '=='):
+                return numpy.zeros(len(self), dtype=bool)
+            if operator == '!=':
+                return ~self.mask
+            if operator in ('<', '<='):
+                operator, scaled = '<=', floor
+            else:
+                operator, scaled = '>', floor
+        return _COMPARISONS[operator](self.values, int(scaled)) & ~self.mask
+
+    def argsort(self) -> numpy.ndarray:
+        """
+        Get the indices which sort this column (stably), with null values
+        last
+        """
+        return numpy.lexsort((self.values, self.mask))
+
+
+Column = Union[
+    CodeColumn,
+    IntegerColumn,
+    FlagColumn,
+    FloatColumn,
+    FixedPointColumn
+]
+
+
+# The greatest number of digits (before and after the decimal point) of a
+# value which can be parsed as a float, and scaled, exactly
+_FLOAT_DIGITS: int = 15
+
+# The greatest number of digits of a scaled value which fits in an int64
+_INT64_DIGITS: int = 18
+
+
+def _parse_scaled_integers(
+    array: numpy.ndarray,
+    scale: int
+) -> numpy.ndarray:
+    """
+    Parse (non-empty, unsigned) decimal strings having no more than `scale`
+    significant decimal places into integers scaled by `10 ** scale`, by
+    parsing their integer and fractional parts separately
+    """
+    parts: numpy.ndarray = numpy.char.partition(array, '.')
+    integer_parts: numpy.ndarray = numpy.char.lstrip(parts[:, 0], '0')
+    fractions: numpy.ndarray = numpy.char.ljust(
+        numpy.char.rstrip(parts[:, 2], '0'),
+        scale,
+        '0'
+    )
+    if (numpy.char.str_len(integer_parts) + scale > _INT64_DIGITS).any():
+        raise ValueError(
+            'Values have more than %s digits' % str(_INT64_DIGITS)
+        )
+    if not (
+        (numpy.char.isdigit(integer_parts) | (integer_parts == '')) &
+        (numpy.char.isdigit(fractions) | (fractions == ''))
+    ).all():
+        raise ValueError('Values are not decimal numbers')
+    integers: numpy.ndarray = numpy.where(
+        integer_parts == '',
+        '0',
+        integer_parts
+    ).astype(numpy.int64) * 10 ** scale
+    if scale:
+        integers += fractions.astype(numpy.int64)
+    return integers
+
+
+def parse_fixed_point(
+    values: Sequence[str],
+    scale: int
+) -> Tuple[numpy.ndarray, numpy.ndarray]:
+    """
+    Parse decimal strings (an empty string representing a null value) into
+    integers scaled by `10 ** scale`, without rounding: a `ValueError` is
+    raised if a value has more significant decimal places than `scale`, or
+    if its scaled value has more than 18 digits. Returns the scaled values
+    (as int64) and a null mask.
+    """
+    array: numpy.ndarray = numpy.char.strip(numpy.asarray(values, dtype=str))
+    mask: numpy.ndarray = array == ''
+    if not len(array):
+        return numpy.zeros(0, dtype=numpy.int64), mask
+    point: numpy.ndarray = numpy.char.find(array, '.')
+    places: numpy.ndarray = numpy.where(
+        point >= 0,
+        numpy.char.str_len(numpy.char.rstrip(array, '0')) - point - 1,
+        0
+    )
+    if (places > scale).any():
+        raise ValueError(
+            'Values have more than %s decimal places' % str(scale)
+        )
+    signed: numpy.ndarray = (
+        numpy.char.startswith(array, '-') | numpy.char.startswith(array, '+')
+    )
+    digits: numpy.ndarray = (
+        numpy.char.str_len(array) - (point >= 0) - signed
+    )
+    if (digits <= _FLOAT_DIGITS).all():
+        # A value of 15 or fewer digits is parsed to within half of a unit
+        # in its last place, so rounding the scaled value recovers it exactly
+        return numpy.where(
+            mask,
+            0,
+            numpy.rint(
+                numpy.where(mask, '0', array).astype(numpy.float64) *
+                10 ** scale
+            ).astype(numpy.int64)
+        ), mask
+    negative: numpy.ndarray = numpy.char.startswith(array, '-')
+    unsigned: numpy.ndarray = numpy.where(
+        signed,
+        numpy.char.lstrip(array, '+-'),
+        array
+    )
+    if (numpy.char.str_len(unsigned) + signed != numpy.char.str_len(
+        array
+    )).any():
+        raise ValueError('Values are not decimal numbers')
+    integers: numpy.ndarray = _parse_scaled_integers(
+        numpy.where(mask, '0', unsigned),
+        scale
+    )
+    return numpy.where(
+        mask,
+        0,
+        numpy.where(negative, -integers, integers)
+    ), mask
+
+
+def encode(
+    values: Sequence[str],
+    type_: type,
+    dictionary: Optional[Dictionary] = None,
+    scale: Optional[int] = None
+) -> Column:
+    """
+    Encode a sequence of string values (as found in a CDS501 extract, where
+    an empty string represents a null value) as a column.
+
+    Parameters:
+
+    - values ([str]): The values to encode.
+
+    - type_ (type): The type of the field being encoded: `str` values are
+      dictionary-encoded, `int` and `bool` values are encoded as integer and
+      flag columns, and `Decimal` and `float` values are encoded as floating
+      point columns.
+
+    - dictionary (Dictionary): The dictionary to use for encoding `str`
+      values. If not provided, a new dictionary is created.
+
+    - scale (int): If provided, `Decimal` values are encoded as a fixed point
+      column, with this number of decimal places (see `FixedPointColumn`).
+    """
+    if type_ is Decimal and scale is not None:
+        return FixedPointColumn(*parse_fixed_point(values, scale), scale)
+    if type_ is str:
+        if dictionary is None:
+            dictionary = Dictionary()
+        return CodeColumn(dictionary.encode(values), dictionary)
+    array: numpy.ndarray = numpy.asarray(values, dtype=str)
+    mask: numpy.ndarray = array == ''
+    if type_ is bool:
+        return FlagColumn(array == '1', mask)
+    if type_ is int:
+        integers: numpy.ndarray = numpy.where(mask, '0', array).astype(
+            numpy.int64
+        )
+        return IntegerColumn(
+            integers.astype(
+                _get_integer_dtype(integers.min(), integers.max())
+                if len(integers) else
+                numpy.int8
+            ),
+            mask
+        )
+    if type_ in (Decimal, float):
+        return FloatColumn(
+            numpy.where(mask, 'nan', array).astype(numpy.float64)
+        )
+    raise TypeError(type_)
+
+
+@dataclass
+class Table:
+    """
+    A set of equal-length columns, keyed by field name.
+    """
+
+    name: str
+    columns: Dict[str, Column]
+
+    def __len__(self) -> int:
+        for column in self.columns.values():
+            return len(column)
+        return 0
+
+    def __getitem__(self, name: str) -> Column:
+        return self.columns[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+    def take(self, indices: numpy.ndarray) -> 'Table':
+        """
+        Return a table comprised of the rows at the given `indices`
+        """
+        return Table(
+            self.name,
+            {
+                name: column.take(indices)
+                for name, column in self.columns.items()
+            }
+        )
+
+    def to_data_frame(
+        self,
+        dtypes: Optional[Dict[str, str]] = None
+    ) -> pandas.DataFrame:
+        """
+        Convert this table to a data frame, with `category` data types for
+        code columns, and nullable `Int*`/`boolean` data types for integer and
+        flag columns.
+
+        Parameters:
+
+        - dtypes ({str: str}): Nullable integer data types for integer
+          columns, by name (see `IntegerColumn.to_pandas`). By default,
+          integer columns have the narrowest data type fitting their values.
+        """
+        return pandas.DataFrame(
+            {
+                name: (
+                    column.to_pandas(dtypes.get(name))
+                    if dtypes and isinstance(column, IntegerColumn) else
+                    column.to_pandas()
+                )
+                for name, column in self.columns.items()
+            },
+            copy=False
+        )
+
+
+@dataclass
+class Offsets:
+    """
+    The rows of a child table belonging to each row of a parent table: the
+    children of parent row `i` are rows `starts[i]` through `ends[i] - 1`.
+    Ranges are in parent order, and do not overlap, but need not cover every
+    child row (participants who are not vehicle occupants belong to no
+    vehicle).
+    """
+
+    starts: numpy.ndarray
+    ends: numpy.ndarray
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @property
+    def counts(self) -> numpy.ndarray:
+        """
+        The number of children of each parent row
+        """
+        return self.ends - self.starts
+
+    def get_parent_indices(self, child_count: int) -> numpy.ndarray:
+        """
+        Get the index of the parent row of each of `child_count` child rows
+        (`-1` for rows having no parent), with which parent values can be
+        broadcast to child rows: `parent_values[indices]`
+        """
+        indices: numpy.ndarray = numpy.full(
+            child_count,
+            -1,
+            dtype=numpy.int64
+        )
+        counts: numpy.ndarray = self.counts
+        # Each row is its range's start, plus its position within the range
+        indices[
+            numpy.repeat(self.starts - numpy.cumsum(counts) + counts, counts) +
+            numpy.arange(counts.sum())
+        ] = numpy.repeat(numpy.arange(len(self)), counts)
+        return indices
+
+    def reduce(
+        self,
+        ufunc: numpy.ufunc,
+        values: numpy.ndarray,
+        initial: object = 0
+    ) -> numpy.ndarray:
+        """
+        Reduce the values of child rows to one value for each parent row,
+        using `ufunc.reduceat` (for example, `offsets.reduce(numpy.maximum,
+        severities)`). Parents having no children are assigned `initial`.
+        """
+        values = numpy.asarray(values)
+        if not len(self):
+            return numpy.empty(0, dtype=values.dtype)
+        # Reducing at interleaved starts and ends leaves each range in an
+        # even position, regardless of any gaps between ranges
+        indices: numpy.ndarray = numpy.empty(len(self) * 2, dtype=numpy.int64)
+        indices[0::2] = self.starts
+        indices[1::2] = self.ends
+        padded: numpy.ndarray = numpy.append(
+            values,
+            numpy.zeros(1, dtype=values.dtype)
+        )
+        reduced: numpy.ndarray = ufunc.reduceat(padded, indices)[0::2]
+        return numpy.where(self.counts > 0, reduced, initial)
+
+    @classmethod
+    def from_parent_indices(
+        cls,
+        parent_indices: numpy.ndarray,
+        parent_count: int
+    ) -> Optional['Offsets']:
+        """
+        Get the offsets of child rows from the index of each child's parent
+        row (`-1` for rows having no parent), or `None` if the children of
+        each parent are not contiguous, and in parent order
+        """
+        parent_indices = numpy.asarray(parent_indices, dtype=numpy.int64)
+        rows: numpy.ndarray = numpy.flatnonzero(parent_indices >= 0)
+        parents: numpy.ndarray = parent_indices[rows]
+        if len(parents) and (numpy.diff(parents) < 0).any():
+            return None
+        counts: numpy.ndarray = numpy.bincount(
+            parents,
+            minlength=parent_count
+        )
+        firsts: numpy.ndarray = numpy.searchsorted(
+            parents,
+            numpy.arange(parent_count)
+        )
+        starts: numpy.ndarray = numpy.append(
+            rows,
+            len(parent_indices)
+        )[firsts]
+        ends: numpy.ndarray = numpy.where(
+            counts > 0,
+            numpy.append(rows, 0)[firsts + counts - 1] + 1,
+            starts
+        )
+        if ((ends - starts) != counts).any():
+            return None
+        return cls(starts, ends)
+
+    @classmethod
+    def from_keys(
+        cls,
+        parent_keys: Sequence[str],
+        child_keys: Sequence[str]
+    ) -> Optional['Offsets']:
+        """
+        Get the offsets of child rows, matched to parent rows by key (such
+        as `crash_id`), or `None` if a parent key is repeated, or the children
+        of each parent are not contiguous, and in parent order
+        """
+        positions: Dict[str, int] = {
+            key: index for index, key in enumerate(parent_keys)
+        }
+        if len(positions) != len(parent_keys):
+            return None
+        return cls.from_parent_indices(
+            numpy.array(
+                [positions.get(key, -1) for key in child_keys],
+                dtype=numpy.int64
+            ),
+            len(parent_keys)
+        )
+
+
+@dataclass
+class Store:
+    """
+    The CDS501 "crash", "vhcl" and "partic" tables, along with the
+    dictionaries their code columns share. A store can be unpacked in the same
+    manner as the tuple returned by `odot_cds.cds501.get_data_frames`:
+
+    >>> crash, vhcl, partic = cds501.get_data_frames(response, store=True)
+    """
+
+    crash: Table
+    vhcl: Table
+    partic: Table
+    dictionaries: Dict[str, Dictionary]
+    # The vehicle and participant rows of each crash, and the participant
+    # rows of each vehicle (`None` if rows are not grouped by crash and
+    # vehicle)
+    crash_vhcl_offsets: Optional[Offsets] = None
+    crash_partic_offsets: Optional[Offsets] = None
+    vhcl_partic_offsets: Optional[Offsets] = None
+
+    def __iter__(self) -> Iterator[Table]:
+        yield self.crash
+        yield self.vhcl
+        yield self.partic
+
+    def get_data_frames(
+        self,
+        dtypes: Optional[Dict[str, str]] = None
+    ) -> Tuple[
+        pandas.DataFrame,
+        pandas.DataFrame,
+        pandas.DataFrame
+    ]:
+        """
+        Return a `tuple` of 3 data frames: one representing the `CRASH`
+        table, one representing the `VHCL` table, and one representing the
+        `PARTIC` table (see `Table.to_data_frame`).
+        """
+        return (
+            self.crash.to_data_frame(dtypes),
+            self.vhcl.to_data_frame(dtypes),
+            self.partic.to_data_frame(dtypes)
+        )
+
+    def write(
+        self,
+        directory: str,
+        metadata: Optional[Dict[str, object]] = None
+    ) -> None:
+        """
+        Save this store in a directory, as one ".npy" file for each array (of
+        codes, values or null masks) of each column, and a JSON manifest
+        holding the dictionaries, the type of each column and `metadata`
+        (such as a hash of the extract from which the store was parsed). The
+        manifest is written last, so an interrupted write leaves no manifest.
+
+        Parameters:
+
+        - directory (str): The directory in which to save the store (created
+          if it does not exist).
+
+        - metadata ({str: object}): JSON-serializable values to save in the
+          manifest, which are returned by `read_manifest`.
+        """
+        os.makedirs(directory, exist_ok=True)
+        manifest_path: str = os.path.join(directory, MANIFEST)
+        if os.path.exists(manifest_path):
+            os.remove(manifest_path)
+        domains: Dict[int, str] = {
+            id(dictionary): domain
+            for domain, dictionary in self.dictionaries.items()
+        }
+        dictionaries: Dict[str, List[str]] = {
+            domain: list(dictionary.values)
+            for domain, dictionary in self.dictionaries.items()
+        }
+        tables: Dict[str, Dict[str, Dict[str, object]]] = {}
+        for table in self:
+            columns: Dict[str, Dict[str, object]] = {}
+            for name, column in table.columns.items():
+                arrays: Dict[str, numpy.ndarray]
+                if isinstance(column, CodeColumn):
+                    domain: str = domains.get(id(column.dictionary), name)
+                    dictionaries.setdefault(
+                        domain,
+                        list(column.dictionary.values)
+                    )
+                    columns[name] = {'type': 'code', 'domain': domain}
+                    arrays = {'codes': column.codes}
+                elif isinstance(column, FloatColumn):
+                    columns[name] = {'type': 'float'}
+                    arrays = {'values': column.values}
+                elif isinstance(column, FixedPointColumn):
+                    columns[name] = {'type': 'fixed', 'scale': column.scale}
+                    arrays = {'values': column.values, 'mask': column.mask}
+                else:
+                    columns[name] = {
+                        'type': (
+                            'integer'
+                            if isinstance(column, IntegerColumn) else
+                            'flag'
+                        )
+                    }
+                    arrays = {'values': column.values, 'mask': column.mask}
+                for part, array in arrays.items():
+                    numpy.save(
+                        os.path.join(
+                            directory,
+                            '%s.%s.%s.npy' % (table.name, name, part)
+                        ),
+                        numpy.ascontiguousarray(array)
+                    )
+            tables[table.name] = columns
+        offsets: List[str] = []
+        for name in OFFSETS:
+            offsets_: Optional[Offsets] = getattr(self, name)
+            if offsets_ is not None:
+                offsets.append(name)
+                for part in ('starts', 'ends'):
+                    numpy.save(
+                        os.path.join(directory, '%s.%s.npy' % (name, part)),
+                        getattr(offsets_, part)
+                    )
+        with open(manifest_path + '.tmp', 'w', encoding='utf-8') as file:
+            json.dump(
+                {
+                    'metadata': metadata or {},
+                    'dictionaries': dictionaries,
+                    'tables': tables,
+                    'offsets': offsets
+                },
+                file
+            )
+        os.replace(manifest_path + '.tmp', manifest_path)
+
+    @classmethod
+    def read(
+        cls,
+        directory: str,
+        mmap_mode: Optional[str] = 'r'
+    ) -> 'Store':
+        """
+        Load a store saved with `Store.write`. By default, arrays are memory
+        mapped (read-only) rather than read, so a store loads without copying
+        its arrays, and processes loading the same store share its pages.
+
+        Parameters:
+
+        - directory (str): The directory in which the store was saved.
+
+        - mmap_mode (str): See `numpy.load` (`None` reads arrays into
+          memory).
+        """
+        manifest: Optional[Dict[str, object]] = read_manifest(directory)
+        if manifest is None:
+            raise FileNotFoundError(os.path.join(directory, MANIFEST))
+
+        def load(name: str) -> numpy.ndarray:
+            return numpy.load(
+                os.path.join(directory, name + '.npy'),
+                mmap_mode=mmap_mode
+            )
+
+        dictionaries: Dict[str, Dictionary] = {
+            domain: Dictionary(values)
+            for domain, values in manifest['dictionaries'].items()
+        }
+        tables: List[Table] = []
+        for table_name in ('crash', 'vhcl', 'partic'):
+            columns: Dict[str, Column] = {}
+            for name, description in manifest['tables'][table_name].items():
+                prefix: str = '%s.%s.' % (table_name, name)
+                type_: str = description['type']
+                if type_ == 'code':
+                    columns[name] = CodeColumn(
+                        load(prefix + 'codes'),
+                        dictionaries[description['domain']]
+                    )
+                elif type_ == 'float':
+                    columns[name] = FloatColumn(load(prefix + 'values'))
+                elif type_ == 'fixed':
+                    columns[name] = FixedPointColumn(
+                        load(prefix + 'values'),
+                        load(prefix + 'mask'),
+                        description['scale']
+                    )
+                else:
+                    columns[name] = (
+                        IntegerColumn if type_ == 'integer' else FlagColumn
+                    )(load(prefix + 'values'), load(prefix + 'mask'))
+            tables.append(Table(table_name, columns))
+        crash, vhcl, partic = tables
+        return cls(
+            crash,
+            vhcl,
+            partic,
+            dictionaries,
+            **{
+                name: Offsets(
+                    load(name + '.starts'),
+                    load(name + '.ends')
+                )
+                for name in manifest['offsets']
+            }
+        )
+
+
+def read_manifest(directory: str) -> Optional[Dict[str, object]]:
+    """
+    Read the manifest of a store saved with `Store.write`, or return `None` if
+    there is none. The `metadata` saved with the store is found under the
+    "metadata" key.
+    """
+    path: str = os.path.join(directory, MANIFEST)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def get_floats(
+    values: Union[Column, pandas.Series, numpy.ndarray, Sequence[object]]
+) -> numpy.ndarray:
+    """
+    Get a float64 array from a column, series or array, with null values
+    represented by `NaN`
+    """
+    if isinstance(values, (IntegerColumn, FlagColumn)):
+        return numpy.where(values.mask, numpy.nan, values.values)
+    if isinstance(values, FloatColumn):
+        return values.values
+    if isinstance(values, FixedPointColumn):
+        return values.to_floats()
+    if isinstance(values, CodeColumn):
+        # Only the distinct values need to be parsed
+        return pandas.to_numeric(
+            pandas.Series(values.dictionary.values + ['']),
+            errors='coerce'
+        ).to_numpy(dtype=numpy.float64, na_value=numpy.nan)[values.codes]
+    if isinstance(values, pandas.Series):
+        return pandas.to_numeric(values, errors='coerce').to_numpy(
+            dtype=numpy.float64,
+            na_value=numpy.nan
+        )
+    return numpy.asarray(values, dtype=numpy.float64)
+
+
+def get_strings(
+    values: Union[Column, pandas.Series, numpy.ndarray, Sequence[object]]
+) -> numpy.ndarray:
+    """
+    Get an array of strings (of `object` data type) from a column, series or
+    array, with null values represented by empty strings
+    """
+    if isinstance(values, CodeColumn):
+        return numpy.array(
+            values.dictionary.values + [''],
+            dtype=object
+        )[values.codes]
+    if isinstance(values, (IntegerColumn, FlagColumn)):
+        return numpy.where(
+            values.mask,
+            '',
+            values.values.astype(str)
+        ).astype(object)
+    if isinstance(values, FixedPointColumn):
+        return numpy.array(
+            [
+                '' if value is None else '{:f}'.format(value)
+                for value in values.to_decimals()
+            ],
+            dtype=object
+        )
+    if isinstance(values, FloatColumn):
+        values = values.values
+    return numpy.array(
+        [
+            '' if pandas.isna(value) else str(value)
+            for value in values
+        ],
+        dtype=object
+    )
+
+
+def _concatenate_columns(
+    columns: Sequence[Column],
+    lookups: Sequence[Optional[numpy.ndarray]],
+    dictionary: Optional[Dictionary]
+) -> Column:
+    """
+    Concatenate columns of the same type. The codes of code columns are
+    translated into `dictionary` using `lookups` (one per column).
+    """
+    if isinstance(columns[0], CodeColumn):
+        return CodeColumn(
+            numpy.concatenate([
+                lookup[column.codes]
+                for column, lookup in zip(columns, lookups)
+            ]).astype(_get_integer_dtype(-1, len(dictionary))),
+            dictionary
+        )
+    if isinstance(columns[0], FloatColumn):
+        return FloatColumn(
+            numpy.concatenate([column.values for column in columns])
+        )
+    if isinstance(columns[0], FixedPointColumn):
+        scale: int = max(column.scale for column in columns)
+        columns = [column.rescale(scale) for column in columns]
+        return FixedPointColumn(
+            numpy.concatenate([column.values for column in columns]),
+            numpy.concatenate([column.mask for column in columns]),
+            scale
+        )
+    return type(columns[0])(
+        numpy.concatenate([column.values for column in columns]),
+        numpy.concatenate([column.mask for column in columns])
+    )
+
+
+def concatenate(
+    stores: Sequence[Store],
+    dictionaries: Optional[Dict[str, Dictionary]] = None
+) -> Store:
+    """
+    Concatenate the tables of several stores, in order, into one store. The
+    codes of each store are translated into a single set of dictionaries.
+
+    Parameters:
+
+    - stores ([Store]): The stores to concatenate (there must be at least
+      one).
+
+    - dictionaries ({str: Dictionary}): Dictionaries into which codes are
+      translated, keyed by domain (such as those returned by
+      `load_dictionaries`). Dictionaries are created as needed if not
+      provided.
+    """
+    if dictionaries is None:
+        dictionaries = {}
+    # For each store, a lookup translating the codes of each of its
+    # dictionaries (keyed by `id`) into codes in `dictionaries`
+    store_lookups: List[Dict[int, numpy.ndarray]] = []
+    store_domains: List[Dict[int, str]] = []
+    for store in stores:
+        lookups: Dict[int, numpy.ndarray] = {}
+        domains: Dict[int, str] = {}
+        for domain, dictionary in store.dictionaries.items():
+            if domain not in dictionaries:
+                dictionaries[domain] = Dictionary()
+            # Append `-1`, so that null values (`-1`) are looked up as `-1`
+            lookups[id(dictionary)] = numpy.array(
+                [
+                    dictionaries[domain].add(value)
+                    for value in dictionary.values
+                ] + [-1],
+                dtype=numpy.int64
+            )
+            domains[id(dictionary)] = domain
+        store_lookups.append(lookups)
+        store_domains.append(domains)
+    tables: List[Table] = []
+    for store_tables in zip(*stores):
+        table: Table = store_tables[0]
+        columns: Dict[str, Column] = {}
+        for name, column in table.columns.items():
+            dictionary: Optional[Dictionary] = None
+            if isinstance(column, CodeColumn):
+                dictionary = dictionaries[
+                    store_domains[0][id(column.dictionary)]
+                ]
+            store_columns: List[Column] = [
+                store_table[name]
+                for store_table in store_tables
+            ]
+            columns[name] = _concatenate_columns(
+                store_columns,
+                [
+                    lookups.get(id(getattr(store_column, 'dictionary', None)))
+                    for lookups, store_column in zip(
+                        store_lookups,
+                        store_columns
+                    )
+                ],
+                dictionary
+            )
+        tables.append(Table(table.name, columns))
+    crash, vhcl, partic = tables
+    offsets: Dict[str, Optional[Offsets]] = {}
+    for name, children in zip(OFFSETS, ('vhcl', 'partic', 'partic')):
+        store_offsets: List[Optional[Offsets]] = [
+            getattr(store, name) for store in stores
+        ]
+        if any(offsets_ is None for offsets_ in store_offsets):
+            offsets[name] = None
+            continue
+        # Shift the offsets of each store by the number of child rows in the
+        # stores preceding it
+        shifts: numpy.ndarray = numpy.cumsum(
+            [0] + [len(getattr(store, children)) for store in stores[:-1]]
+        )
+        offsets[name] = Offsets(
+            numpy.concatenate([
+                offsets_.starts + shift
+                for offsets_, shift in zip(store_offsets, shifts)
+            ]),
+            numpy.concatenate([
+                offsets_.ends + shift
+                for offsets_, shift in zip(store_offsets, shifts)
+            ])
+        )
+    return Store(crash, vhcl, partic, dictionaries, **offsets)
+
+
+def load_dictionaries(
+    path: str,
+    tables: Dict[str, str]
+) -> Dict[str, Dictionary]:
+    """
+    Load dictionaries from a CDS510 decode database which has been converted
+    to SQLite (such as "sources/cds510.db"), seeding each with the full set of
+    codes from the corresponding decode table. Seeding all stores from the
+    same database ensures that their codes are directly comparable.
+
+    Parameters:
+
+    - path (str): The path to a SQLite database.
+
+    - tables ({str: str}): A mapping of column names to decode table names
+      (such as `odot_cds.cds501.DECODE_TABLES`). The code is read from the
+      first column of each table.
+    """
+    dictionaries: Dict[str, Dictionary] = {}
+    connection: sqlite3.Connection = sqlite3.connect(path)
+    try:
+        for table_name in sorted(set(tables.values())):
+            cursor: sqlite3.Cursor = connection.execute(
+                'SELECT * FROM "%s"' % table_name
+            )
+            dictionaries[table_name] = Dictionary(
+                str(row[0]).strip()
+                for row in cursor
+                if row[0] is not None
+            )
+    finally:
+        connection.close()
+    return dictionaries
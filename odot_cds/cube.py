@@ -0,0 +1,335 @@
+"""
+This module aggregates parsed crashes into a cube of counts by year, month,
+county, city, crash severity and road type, from which the summary reports
+otherwise requested from CDS ("CDS150", "CDS160", "CDS200", "CDS250" and
+"CDS280") are computed locally. A cube is built incrementally, one table or
+data frame of crashes at a time, and only its (much smaller) aggregates are
+retained:
+
+>>> summary = cube.Cube()
+>>> for crash, vhcl, partic in cds501.iter_data_frames('CDS501.txt'):
+...     summary.add(crash)
+>>> summary.get_report(client.Extract.CDS280, county='03')
+"""
+import os
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy
+import pandas
+
+from . import columnar
+from .client import Extract
+
+# The dimensions of the cube, in order
+DIMENSIONS: Tuple[str, ...] = (
+    'crash_yr_no',
+    'crash_mo_no',
+    'cnty_id',
+    'city_sect_id',
+    'crash_svrty_cd',
+    'road_typ'
+)
+
+# Dimensions holding integers (the remaining dimensions hold codes)
+_INTEGER_DIMENSIONS: Tuple[str, ...] = (
+    'crash_yr_no',
+    'crash_mo_no',
+    'city_sect_id'
+)
+
+# Crash table fields which are summed, in addition to counting crashes
+SUMMED_FIELDS: Tuple[str, ...] = (
+    'tot_fatal_cnt',
+    'tot_inj_cnt',
+    'tot_inj_lvl_a_cnt',
+    'tot_inj_lvl_b_cnt',
+    'tot_inj_lvl_c_cnt',
+    'tot_vhcl_cnt',
+    'tot_per_invlv_cnt'
+)
+
+# The measures of the cube
+MEASURES: Tuple[str, ...] = ('crash_cnt',) + SUMMED_FIELDS
+
+# The road type (corresponding to the "query type" of a CDS summary report:
+# "rdoSumQueryType<road type>") of each road control code (`rd_cntl_cd`)
+ROAD_TYPES: Dict[str, str] = {
+    '1': 'CITY',
+    '2': 'STATE',
+    '3': 'CITY',
+    '4': 'STATE',
+    '5': 'STATE',
+    '6': 'CNTY',
+    '7': 'CITY',
+    '8': 'STATE',
+    '9': 'CNTY'
+}
+
+# Crash severity codes (`crash_svrty_cd`)
+FATAL: str = '2'
+NON_FATAL_INJURY: str = '4'
+PROPERTY_DAMAGE_ONLY: str = '5'
+
+# The dimension by which each summary report is grouped
+REPORT_DIMENSIONS: Dict[Extract, str] = {
+    Extract.CDS150: 'crash_yr_no',
+    Extract.CDS160: 'crash_svrty_cd',
+    Extract.CDS200: 'cnty_id',
+    Extract.CDS250: 'city_sect_id',
+    Extract.CDS280: 'crash_mo_no'
+}
+
+
+def get_road_types(
+    crashes: Union[columnar.Table, pandas.DataFrame]
+) -> numpy.ndarray:
+    """
+    Get the road type ("STATE", "CNTY" or "CITY", or an empty string if
+    unknown) of each crash, from its road control code
+    """
+    road_controls: numpy.ndarray = columnar.get_strings(
+        crashes['rd_cntl_cd']
+    )
+    return numpy.array(
+        [ROAD_TYPES.get(code, '') for code in road_controls.tolist()],
+        dtype=object
+    )
+
+
+def aggregate(
+    crashes: Union[columnar.Table, pandas.DataFrame]
+) -> pandas.DataFrame:
+    """
+    Count and sum crashes by each combination of `DIMENSIONS`, returning a
+    data frame having a column for each dimension and each of `MEASURES`.
+    Null integer dimensions are represented by `-1`, and null codes by an
+    empty string.
+    """
+    columns: Dict[str, numpy.ndarray] = {}
+    for dimension in DIMENSIONS:
+        if dimension == 'road_typ':
+            columns[dimension] = get_road_types(crashes)
+        elif dimension in _INTEGER_DIMENSIONS:
+            columns[dimension] = numpy.nan_to_num(
+                columnar.get_floats(crashes[dimension]),
+                nan=-1
+            ).astype(numpy.int64)
+        else:
+            columns[dimension] = columnar.get_strings(crashes[dimension])
+    columns['crash_cnt'] = numpy.ones(len(crashes), dtype=numpy.int64)
+    for field_name in SUMMED_FIELDS:
+        columns[field_name] = numpy.nan_to_num(
+            columnar.get_floats(crashes[field_name])
+        ).astype(numpy.int64)
+    return pandas.DataFrame(columns).groupby(
+        list(DIMENSIONS),
+        as_index=False,
+        sort=True
+    ).sum()
+
+
+@dataclass
+class Cube:
+    """
+    Crash counts and sums (`MEASURES`), by each combination of `DIMENSIONS`
+    having at least one crash.
+    """
+
+    data: pandas.DataFrame = field(
+        default_factory=lambda: pandas.DataFrame(
+            {
+                column_name: pandas.Series(
+                    dtype=(
+                        str
+                        if column_name in DIMENSIONS and
+                        column_name not in _INTEGER_DIMENSIONS else
+                        numpy.int64
+                    )
+                )
+                for column_name in DIMENSIONS + MEASURES
+            }
+        )
+    )
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def add(self, crashes: Union[columnar.Table, pandas.DataFrame]) -> None:
+        """
+        Add a table or data frame of crashes (such as the "crash" data frame
+        from each chunk yielded by `odot_cds.cds501.iter_data_frames`).
+        Crashes should be added only once: adding overlapping extracts
+        counts their common crashes twice.
+        """
+        aggregates: pandas.DataFrame = aggregate(crashes)
+        if len(self.data):
+            aggregates = pandas.concat(
+                [self.data, aggregates],
+                ignore_index=True
+            ).groupby(list(DIMENSIONS), as_index=False, sort=True).sum()
+        self.data = aggregates
+
+    @classmethod
+    def from_crashes(
+        cls,
+        crashes: Iterable[Union[columnar.Table, pandas.DataFrame]]
+    ) -> 'Cube':
+        """
+        Build a cube from an iterable of crash tables or data frames
+        """
+        cube: Cube = cls()
+        for table in crashes:
+            cube.add(table)
+        return cube
+
+    def select(
+        self,
+        begin_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        county: Optional[str] = None,
+        city: Optional[Union[str, int]] = None,
+        road_type: Optional[str] = None
+    ) -> pandas.DataFrame:
+        """
+        Get the rows of the cube in a window of months, and optionally only
+        those of a county, city or road type.
+
+        Parameters:
+
+        - begin_date (datetime.date): Include crashes from the month of this
+          date onward (the cube does not resolve days).
+
+        - end_date (datetime.date): Include crashes through the month of
+          this date.
+
+        - county (str): A county ID (`cnty_id`), such as "03".
+
+        - city (str|int): A city section ID (`city_sect_id`).
+
+        - road_type (str): "STATE", "CNTY" or "CITY", or a CDS summary
+          report query type, such as "rdoSumQueryTypeSTATE" (the query type
+          "rdoSumQueryTypeALL" includes every road type).
+        """
+        data: pandas.DataFrame = self.data
+        months: pandas.Series = (
+            data['crash_yr_no'] * 12 + data['crash_mo_no'] - 1
+        )
+        mask: pandas.Series = pandas.Series(True, index=data.index)
+        if begin_date is not None:
+            mask &= months >= begin_date.year * 12 + begin_date.month - 1
+        if end_date is not None:
+            mask &= months <= end_date.year * 12 + end_date.month - 1
+        if county is not None:
+            mask &= data['cnty_id'] == county
+        if city is not None:
+            mask &= data['city_sect_id'] == int(city)
+        if road_type is not None:
+            road_type = road_type.replace('rdoSumQueryType', '')
+            if road_type != 'ALL':
+                mask &= data['road_typ'] == road_type
+        return data[mask]
+
+    def count(self, **filters: object) -> int:
+        """
+        Count the crashes matching the filters accepted by `select`
+        """
+        return int(self.select(**filters)['crash_cnt'].sum())
+
+    def get_report(
+        self,
+        extract: Extract,
+        begin_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        county: Optional[str] = None,
+        city: Optional[Union[str, int]] = None,
+        query_type: str = 'rdoSumQueryTypeALL'
+    ) -> pandas.DataFrame:
+        """
+        Compute a summary report, with a row for each year ("CDS150"), crash
+        severity ("CDS160"), county ("CDS200"), city ("CDS250") or month
+        ("CDS280"), indexed by code, and columns counting fatal, non-fatal
+        injury, property damage only and total crashes, and the people
+        killed and injured (in total, and by injury level).
+
+        Parameters:
+
+        - extract (odot_cds.client.Extract): The report.
+
+        - begin_date (datetime.date): See `select`.
+
+        - end_date (datetime.date): See `select`.
+
+        - county (str): See `select`.
+
+        - city (str|int): See `select`.
+
+        - query_type (str): The type of roads included, as for an "All
+          Roads" summary report requested with `odot_cds.client.Client`:
+          "rdoSumQueryTypeALL" (the default), "rdoSumQueryTypeCNTY",
+          "rdoSumQueryTypeCITY" or "rdoSumQueryTypeSTATE".
+        """
+        if extract not in REPORT_DIMENSIONS:
+            raise ValueError(
+                '%s cannot be computed from a cube' % repr(extract)
+            )
+        data: pandas.DataFrame = self.select(
+            begin_date=begin_date,
+            end_date=end_date,
+            county=county,
+            city=city,
+            road_type=query_type
+        )
+        severities: pandas.Series = data['crash_svrty_cd']
+        report: pandas.DataFrame = pandas.DataFrame({
+            REPORT_DIMENSIONS[extract]: data[REPORT_DIMENSIONS[extract]],
+            'fatal_crashes': data['crash_cnt'].where(
+                severities == FATAL,
+                0
+            ),
+            'non_fatal_crashes': data['crash_cnt'].where(
+                severities == NON_FATAL_INJURY,
+                0
+            ),
+            'pdo_crashes': data['crash_cnt'].where(
+                severities == PROPERTY_DAMAGE_ONLY,
+                0
+            ),
+            'total_crashes': data['crash_cnt'],
+            'people_killed': data['tot_fatal_cnt'],
+            'people_injured': data['tot_inj_cnt'],
+            'people_injured_a': data['tot_inj_lvl_a_cnt'],
+            'people_injured_b': data['tot_inj_lvl_b_cnt'],
+            'people_injured_c': data['tot_inj_lvl_c_cnt']
+        })
+        return report.groupby(REPORT_DIMENSIONS[extract], sort=True).sum()
+
+    def write(self, path: str) -> None:
+        """
+        Save this cube as a CSV file
+        """
+        self.data.to_csv(path, index=False)
+
+    @classmethod
+    def read(cls, path: str) -> 'Cube':
+        """
+        Load a cube saved with `write`
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+        data: pandas.DataFrame = pandas.read_csv(
+            path,
+            dtype={
+                dimension: (
+                    numpy.int64
+                    if dimension in _INTEGER_DIMENSIONS else
+                    str
+                )
+                for dimension in DIMENSIONS
+            },
+            keep_default_na=False
+        )
+        measures: List[str] = list(MEASURES)
+        data[measures] = data[measures].astype(numpy.int64)
+        return cls(data[list(DIMENSIONS + MEASURES)])
@@ -0,0 +1,800 @@
+"""
+This module decodes CDS501 code columns into labels drawn from the decode
+tables of the CDS510 "Decode" database. Each decode table is loaded once into
+sorted arrays of codes and labels, and each column is decoded by looking up
+its distinct values (rather than each row), then re-mapping its codes in a
+single vectorized step. Codes from decode tables which change over time (such
+as "HWY_HIST" and "CITY_FIPS_HIST") can be resolved as of each crash's year:
+
+>>> decoder = decode.load('sources/cds510.db')
+>>> crash, vhcl, partic = cds501.get_data_frames('CDS501.txt', store=True)
+>>> decoder.decode(crash['wthr_cond_cd'], 'wthr_cond_cd', 'long')
+['Cloudy', 'Clear', 'Cloudy', 'Clear', 'Cloudy', ...]
+Categories (10, object): ['Unknown', 'Clear', 'Cloudy', 'Rain', ...]
+>>> decoder.decode(
+...     crash['city_sect_id'],
+...     'city_sect_id',
+...     years=crash['crash_yr_no'],
+...     table_name='CITY_FIPS_HIST'
+... )
+"""
+import csv
+import functools
+import io
+import os
+import shutil
+import sqlite3
+import subprocess
+import zipfile
+from dataclasses import dataclass, field
+from http.client import HTTPResponse
+from tempfile import TemporaryDirectory
+from typing import (
+    IO, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+)
+
+import numpy
+import pandas
+
+from . import cds501, columnar
+
+# Label column suffixes, in order of preference, for each label length. When a
+# decode table has none of these columns, its codes are used as labels.
+LABEL_SUFFIXES: Dict[str, Tuple[str, ...]] = {
+    'short': (
+        '_SHORT_DESC', '_SHORT_NM', '_MED_DESC', '_MED_NM', '_DESC', '_NM',
+        '_LONG_DESC', '_LONG_NM'
+    ),
+    'medium': (
+        '_MED_DESC', '_MED_NM', '_SHORT_DESC', '_SHORT_NM', '_DESC', '_NM',
+        '_LONG_DESC', '_LONG_NM'
+    ),
+    'long': (
+        '_LONG_DESC', '_LONG_NM', '_DESC', '_NM', '_MED_DESC', '_MED_NM',
+        '_SHORT_DESC', '_SHORT_NM'
+    )
+}
+
+# Suffixes of columns indicating that a decode table row is no longer in use
+TERMINATION_SUFFIXES: Tuple[str, ...] = ('_TERMNT_DT', '_TERMNT_YR_NO')
+
+# Suffixes of columns holding the first year in which a row is in use
+START_SUFFIXES: Tuple[str, ...] = ('_START_YR_NO',)
+
+# Decode tables in which a code may have a different meaning in different
+# years, mapped to the column holding their value (`None` indicating that
+# labels are chosen using `LABEL_SUFFIXES`). Each row is in use from its start
+# year (or, lacking one, from the year after the previous row for the same
+# code ends) through the year of its termination.
+HISTORY_TABLES: Dict[str, Optional[str]] = {
+    'CITY_FIPS_HIST': 'FIPS_CITY_ID',
+    'URB_AREA_FIPS_HIST': 'FIPS_URB_AREA_ID',
+    'CITY_SECT': None,
+    'HWY_HIST': None,
+    'FUNC_CLASS': None
+}
+
+MINIMUM_YEAR: int = 0
+MAXIMUM_YEAR: int = 9999
+
+Values = Union[
+    columnar.Column,
+    pandas.Categorical,
+    pandas.Series,
+    numpy.ndarray,
+    Sequence[object]
+]
+
+
+def get_key(value: object) -> str:
+    """
+    Normalize a code for comparison: codes are compared as strings, without
+    surrounding whitespace (decode tables pad some codes with spaces, and
+    store others as integers)
+    """
+    return '' if value is None else str(value).strip()
+
+
+def _is_null(value: object) -> bool:
+    return value is None or get_key(value) == ''
+
+
+def _get_year(value: object) -> Optional[int]:
+    """
+    Get the year from a year number, or from a date formatted as "YYYY-MM-DD"
+    """
+    key: str = get_key(value)
+    return int(key[:4]) if key else None
+
+
+def _find_column(
+    column_names: Sequence[str],
+    suffixes: Tuple[str, ...]
+) -> Optional[int]:
+    for index, column_name in enumerate(column_names):
+        if column_name.upper().endswith(suffixes):
+            return index
+    return None
+
+
+def _get_label_dtypes(
+    labels: Dict[str, numpy.ndarray]
+) -> Tuple[Dict[str, numpy.ndarray], Dict[str, pandas.CategoricalDtype]]:
+    """
+    Factorize each array of labels, returning the codes and a categorical
+    data type for each label length
+    """
+    label_codes: Dict[str, numpy.ndarray] = {}
+    dtypes: Dict[str, pandas.CategoricalDtype] = {}
+    for label, label_values in labels.items():
+        codes, categories = pandas.factorize(label_values)
+        label_codes[label] = codes
+        dtypes[label] = pandas.CategoricalDtype(
+            pandas.Index(categories, dtype=object)
+        )
+    return label_codes, dtypes
+
+
+def _get_label_column(
+    column_names: Sequence[str],
+    label: str
+) -> Optional[int]:
+    """
+    Get the index of the preferred label column for a label length
+    """
+    for suffix in LABEL_SUFFIXES[label]:
+        for index, column_name in enumerate(column_names):
+            if column_name.upper().endswith(suffix):
+                return index
+    return None
+
+
+@dataclass
+class DecodeTable:
+    """
+    A decode table held as a sorted array of codes (`keys`), along with one
+    array of labels per label length, aligned with `keys`. Labels are also
+    held as codes into a categorical data type (`dtypes`), so that every
+    column decoded using this table shares the same categories.
+    """
+
+    name: str
+    keys: numpy.ndarray
+    labels: Dict[str, numpy.ndarray]
+    label_codes: Dict[str, numpy.ndarray] = field(default_factory=dict)
+    dtypes: Dict[str, pandas.CategoricalDtype] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self.label_codes, self.dtypes = _get_label_dtypes(self.labels)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @classmethod
+    def from_rows(
+        cls,
+        name: str,
+        column_names: Sequence[str],
+        rows: Iterable[Sequence[object]]
+    ) -> 'DecodeTable':
+        """
+        Build a decode table from the rows of a CDS510 decode table, in which
+        the first column holds the code. Where a code appears in more than one
+        row, a row which has not been terminated is preferred.
+
+        Parameters:
+
+        - name (str): The name of the decode table.
+
+        - column_names ([str]): The names of the table's columns.
+
+        - rows ([[object]]): The table's rows.
+        """
+        termination_indices: Tuple[int, ...] = tuple(
+            index
+            for index, column_name in enumerate(column_names)
+            if column_name.upper().endswith(TERMINATION_SUFFIXES)
+        )
+        label_indices: Dict[str, Optional[int]] = {
+            label: _get_label_column(column_names, label)
+            for label in LABEL_SUFFIXES.keys()
+        }
+        rows = sorted(
+            (
+                row for row in rows
+                if not _is_null(row[0])
+            ),
+            key=lambda row: (
+                get_key(row[0]),
+                any(not _is_null(row[index]) for index in termination_indices)
+            )
+        )
+        keys: numpy.ndarray = numpy.array(
+            [get_key(row[0]) for row in rows],
+            dtype=str
+        )
+        # The first (preferred) row for each code
+        keys, indices = numpy.unique(keys, return_index=True)
+        return cls(
+            name=name,
+            keys=keys,
+            labels={
+                label: numpy.array(
+                    [
+                        get_key(
+                            rows[row_index][
+                                0 if label_index is None else label_index
+                            ]
+                        ) or get_key(rows[row_index][0])
+                        for row_index in indices
+                    ],
+                    dtype=object
+                )
+                for label, label_index in label_indices.items()
+            }
+        )
+
+    def get_label_codes(
+        self,
+        keys: Sequence[object],
+        label: str = 'short'
+    ) -> numpy.ndarray:
+        """
+        Look up the position of each code's label in `self.dtypes[label]`,
+        returning `-1` for null or unknown codes
+        """
+        keys = numpy.array([get_key(key) for key in keys], dtype=str)
+        if not (len(keys) and len(self.keys)):
+            return numpy.full(len(keys), -1, dtype=numpy.int64)
+        positions: numpy.ndarray = numpy.searchsorted(self.keys, keys).clip(
+            0, len(self.keys) - 1
+        )
+        return numpy.where(
+            self.keys[positions] == keys,
+            self.label_codes[label][positions],
+            -1
+        )
+
+
+@dataclass
+class HistoryTable:
+    """
+    A decode table in which a code may have more than one row, each in use
+    for a range of years. Rows are sorted by code and start year, so that the
+    row in use for any (code, year) pair can be found with a binary search.
+
+    - keys: A sorted array of the distinct codes.
+
+    - row_keys: The position in `keys` of each row's code.
+
+    - starts/ends: The first and last year in which each row is in use.
+
+    - labels: An array of labels, aligned with the rows, for each label
+      length.
+    """
+
+    name: str
+    keys: numpy.ndarray
+    row_keys: numpy.ndarray
+    starts: numpy.ndarray
+    ends: numpy.ndarray
+    labels: Dict[str, numpy.ndarray]
+    label_codes: Dict[str, numpy.ndarray] = field(default_factory=dict)
+    dtypes: Dict[str, pandas.CategoricalDtype] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self.label_codes, self.dtypes = _get_label_dtypes(self.labels)
+        # Combine each row's code and start year into one sorted integer, to
+        # search on both at once
+        self._search_keys: numpy.ndarray = (
+            self.row_keys.astype(numpy.int64) * (MAXIMUM_YEAR + 1) +
+            self.starts
+        )
+        # The last (current) row for each code
+        self._current_rows: numpy.ndarray = numpy.searchsorted(
+            self.row_keys,
+            numpy.arange(len(self.keys)),
+            side='right'
+        ) - 1
+
+    def __len__(self) -> int:
+        return len(self.row_keys)
+
+    @classmethod
+    def from_rows(
+        cls,
+        name: str,
+        column_names: Sequence[str],
+        rows: Iterable[Sequence[object]],
+        value_column: Optional[str] = None
+    ) -> 'HistoryTable':
+        """
+        Build a history table from the rows of a CDS510 decode table, in
+        which the first column holds the code.
+
+        Parameters:
+
+        - name (str): The name of the decode table.
+
+        - column_names ([str]): The names of the table's columns.
+
+        - rows ([[object]]): The table's rows.
+
+        - value_column (str): The column to use for labels of every length
+          (by default, labels are chosen using `LABEL_SUFFIXES`).
+        """
+        start_index: Optional[int] = _find_column(
+            column_names,
+            START_SUFFIXES
+        )
+        end_index: Optional[int] = _find_column(
+            column_names,
+            TERMINATION_SUFFIXES
+        )
+        label_indices: Dict[str, Optional[int]] = {
+            label: (
+                _get_label_column(column_names, label)
+                if value_column is None else
+                list(column_names).index(value_column)
+            )
+            for label in LABEL_SUFFIXES.keys()
+        }
+        records: List[Tuple[str, Optional[int], int, Sequence[object]]] = [
+            (
+                get_key(row[0]),
+                None if start_index is None else _get_year(row[start_index]),
+                (
+                    None if end_index is None else _get_year(row[end_index])
+                ) or MAXIMUM_YEAR,
+                row
+            )
+            for row in rows
+            if not _is_null(row[0])
+        ]
+        records.sort(key=lambda record: (
+            record[0],
+            record[2],
+            MINIMUM_YEAR if record[1] is None else record[1]
+        ))
+        starts: List[int] = []
+        previous_key: Optional[str] = None
+        previous_end: int = MINIMUM_YEAR - 1
+        for key, start, end, row in records:
+            if key != previous_key:
+                previous_end = MINIMUM_YEAR - 1
+            starts.append(previous_end + 1 if start is None else start)
+            previous_key, previous_end = key, end
+        order: List[int] = sorted(
+            range(len(records)),
+            key=lambda index: (records[index][0], starts[index])
+        )
+        keys, row_keys = numpy.unique(
+            numpy.array([records[index][0] for index in order], dtype=str),
+            return_inverse=True
+        )
+        return cls(
+            name=name,
+            keys=keys,
+            row_keys=row_keys,
+            starts=numpy.array(
+                [starts[index] for index in order],
+                dtype=numpy.int64
+            ),
+            ends=numpy.array(
+                [records[index][2] for index in order],
+                dtype=numpy.int64
+            ),
+            labels={
+                label: numpy.array(
+                    [
+                        get_key(
+                            records[index][3][
+                                0 if label_index is None else label_index
+                            ]
+                        ) or records[index][0]
+                        for index in order
+                    ],
+                    dtype=object
+                )
+                for label, label_index in label_indices.items()
+            }
+        )
+
+    def get_key_indices(self, keys: Sequence[object]) -> numpy.ndarray:
+        """
+        Get the position of each code in `self.keys`, or `-1` for null or
+        unknown codes
+        """
+        keys = numpy.array([get_key(key) for key in keys], dtype=str)
+        if not (len(keys) and len(self.keys)):
+            return numpy.full(len(keys), -1, dtype=numpy.int64)
+        positions: numpy.ndarray = numpy.searchsorted(self.keys, keys).clip(
+            0, len(self.keys) - 1
+        )
+        return numpy.where(self.keys[positions] == keys, positions, -1)
+
+    def get_row_indices(
+        self,
+        key_indices: numpy.ndarray,
+        years: Optional[numpy.ndarray] = None
+    ) -> numpy.ndarray:
+        """
+        Find the row in use for each code (given as a position in
+        `self.keys`) in the corresponding year, or `-1` where no row was in
+        use. If `years` are not provided, the current row for each code is
+        found.
+        """
+        valid: numpy.ndarray = key_indices >= 0
+        if years is None:
+            return numpy.where(
+                valid,
+                self._current_rows[key_indices.clip(0)],
+                -1
+            )
+        positions: numpy.ndarray = numpy.searchsorted(
+            self._search_keys,
+            key_indices.astype(numpy.int64) * (MAXIMUM_YEAR + 1) + years,
+            side='right'
+        ) - 1
+        valid &= (years >= MINIMUM_YEAR) & (positions >= 0)
+        positions = positions.clip(0)
+        valid &= (
+            (self.row_keys[positions] == key_indices) &
+            (self.ends[positions] >= years)
+        )
+        return numpy.where(valid, positions, -1)
+
+    def get_label_codes(
+        self,
+        keys: Sequence[object],
+        label: str = 'short'
+    ) -> numpy.ndarray:
+        """
+        Look up the position of each code's current label in
+        `self.dtypes[label]`, returning `-1` for null or unknown codes
+        """
+        row_indices: numpy.ndarray = self.get_row_indices(
+            self.get_key_indices(keys)
+        )
+        return numpy.where(
+            row_indices >= 0,
+            self.label_codes[label][row_indices],
+            -1
+        )
+
+
+Table = Union[DecodeTable, HistoryTable]
+
+
+def _get_codes(values: Values) -> Tuple[numpy.ndarray, Sequence[object]]:
+    """
+    Represent a column as an array of codes (`-1` representing null values)
+    into a sequence of distinct values
+    """
+    if isinstance(values, columnar.CodeColumn):
+        return values.codes, values.dictionary.values
+    if isinstance(values, (columnar.IntegerColumn, columnar.FlagColumn)):
+        codes, uniques = pandas.factorize(values.values)
+        return numpy.where(values.mask, -1, codes), uniques
+    if isinstance(values, columnar.FloatColumn):
+        values = values.values
+    if isinstance(values, columnar.FixedPointColumn):
+        values = values.to_decimals()
+    if isinstance(values, pandas.Series):
+        values = values.array
+    if isinstance(values, pandas.Categorical):
+        return values.codes, values.categories
+    return pandas.factorize(numpy.asarray(values, dtype=object))
+
+
+def _get_years(years: Union[int, Values], length: int) -> numpy.ndarray:
+    """
+    Get an array of years (`-1` representing null values) from a column of
+    year numbers, or from a single year
+    """
+    if isinstance(years, int):
+        return numpy.full(length, years, dtype=numpy.int64)
+    codes, uniques = _get_codes(years)
+    lookup: numpy.ndarray = numpy.array(
+        [
+            -1 if _is_null(value) else int(get_key(value))
+            for value in uniques
+        ] + [-1],
+        dtype=numpy.int64
+    )
+    return lookup[codes]
+
+
+@dataclass
+class Decoder:
+    """
+    The decode tables of a CDS510 "Decode" database, keyed by table name, and
+    a mapping of CDS501 column names to the table from which each column's
+    codes are drawn (by default, `odot_cds.cds501.DECODE_TABLES`).
+    """
+
+    tables: Dict[str, Table]
+    column_tables: Dict[str, str] = field(
+        default_factory=lambda: dict(cds501.DECODE_TABLES)
+    )
+
+    def decode(
+        self,
+        values: Values,
+        column_name: str,
+        label: str = 'short',
+        years: Optional[Union[int, Values]] = None,
+        table_name: Optional[str] = None
+    ) -> pandas.Categorical:
+        """
+        Decode a column of codes as a categorical of labels. Null codes, and
+        codes not found in the decode table, are decoded as null values.
+
+        Parameters:
+
+        - values (odot_cds.columnar.Column|pandas.Series|[object]): The codes
+          to decode: a column from a columnar store, a series or categorical,
+          or any sequence of codes.
+
+        - column_name (str): The name of the CDS501 column (for example,
+          "wthr_cond_cd").
+
+        - label (str): "short", "medium" or "long".
+
+        - years (int|odot_cds.columnar.Column|pandas.Series|[object]): The
+          year in which each code was recorded (such as the `crash_yr_no`
+          column), or a single year for all codes. For tables in
+          `HISTORY_TABLES`, each code is decoded using the row in use during
+          its year (codes not in use during their year are decoded as null
+          values). If not provided, the current row is used.
+
+        - table_name (str): The decode table to use, if not the table
+          mapped to `column_name` (for example, "CITY_FIPS_HIST" may be
+          used to decode `city_sect_id` as FIPS place codes).
+        """
+        table: Table = self.tables[
+            table_name or self.column_tables[column_name]
+        ]
+        codes, uniques = _get_codes(values)
+        label_codes: numpy.ndarray
+        if years is None or not isinstance(table, HistoryTable):
+            # Append `-1`, so that null values (`-1`) are looked up as `-1`
+            label_codes = numpy.append(
+                table.get_label_codes(uniques, label),
+                -1
+            )[codes]
+        else:
+            row_indices: numpy.ndarray = table.get_row_indices(
+                numpy.append(table.get_key_indices(uniques), -1)[codes],
+                _get_years(years, len(codes))
+            )
+            label_codes = numpy.where(
+                row_indices >= 0,
+                table.label_codes[label][row_indices],
+                -1
+            )
+        return pandas.Categorical.from_codes(
+            label_codes,
+            dtype=table.dtypes[label]
+        )
+
+    def decode_data_frame(
+        self,
+        data: Union[pandas.DataFrame, columnar.Table],
+        label: str = 'short',
+        suffix: Optional[str] = None,
+        year_column: Optional[str] = 'crash_yr_no'
+    ) -> pandas.DataFrame:
+        """
+        Decode every code column in a data frame, or in a table from a
+        columnar store, for which a decode table is available.
+
+        Parameters:
+
+        - data (pandas.DataFrame|odot_cds.columnar.Table): A "crash", "vhcl"
+          or "partic" table.
+
+        - label (str): "short", "medium" or "long".
+
+        - suffix (str): If provided, decoded columns are added alongside the
+          code columns, with this suffix appended to their names (for
+          example, "_short_desc"). Otherwise, code columns are replaced.
+
+        - year_column (str): The column holding the year of each row, which
+          is used to decode columns drawn from `HISTORY_TABLES`, if present.
+        """
+        data_frame: pandas.DataFrame = (
+            data.to_data_frame()
+            if isinstance(data, columnar.Table) else
+            data.copy(deep=False)
+        )
+        years: Optional[numpy.ndarray] = (
+            _get_years(
+                (
+                    data[year_column]
+                    if isinstance(data, columnar.Table) else
+                    data_frame[year_column]
+                ),
+                len(data_frame)
+            )
+            if year_column is not None and year_column in data_frame else
+            None
+        )
+        for column_name in tuple(data_frame.columns):
+            table_name: Optional[str] = self.column_tables.get(column_name)
+            if table_name is None or table_name not in self.tables:
+                continue
+            decoded: pandas.Categorical = self.decode(
+                (
+                    data[column_name]
+                    if isinstance(data, columnar.Table) else
+                    data_frame[column_name]
+                ),
+                column_name,
+                label,
+                years
+            )
+            if suffix is None:
+                data_frame[column_name] = decoded
+            else:
+                data_frame.insert(
+                    data_frame.columns.get_loc(column_name) + 1,
+                    column_name + suffix,
+                    decoded
+                )
+        return data_frame
+
+
+def _get_table_names(table_names: Optional[Iterable[str]]) -> List[str]:
+    return sorted(
+        set(cds501.DECODE_TABLES.values()) | set(HISTORY_TABLES.keys())
+        if table_names is None else
+        table_names
+    )
+
+
+def _get_table(
+    name: str,
+    column_names: Sequence[str],
+    rows: Iterable[Sequence[object]]
+) -> Table:
+    if name in HISTORY_TABLES:
+        return HistoryTable.from_rows(
+            name,
+            column_names,
+            rows,
+            HISTORY_TABLES[name]
+        )
+    return DecodeTable.from_rows(name, column_names, rows)
+
+
+def read_sqlite(
+    path: str,
+    table_names: Optional[Iterable[str]] = None
+) -> Dict[str, Table]:
+    """
+    Read decode tables from a CDS510 "Decode" database which has been
+    converted to SQLite (such as "sources/cds510.db").
+
+    Parameters:
+
+    - path (str): The path to a SQLite database.
+
+    - table_names ([str]): The tables to read (by default, all tables
+      referenced by `odot_cds.cds501.DECODE_TABLES`, and the tables in
+      `HISTORY_TABLES`).
+    """
+    tables: Dict[str, Table] = {}
+    connection: sqlite3.Connection = sqlite3.connect(path)
+    try:
+        for table_name in _get_table_names(table_names):
+            cursor: sqlite3.Cursor = connection.execute(
+                'SELECT * FROM "%s"' % table_name
+            )
+            tables[table_name] = _get_table(
+                table_name,
+                [description[0] for description in cursor.description],
+                cursor
+            )
+    finally:
+        connection.close()
+    return tables
+
+
+def _run_mdbtools(*arguments: str) -> str:
+    """
+    Run an mdbtools command (https://github.com/mdbtools/mdbtools), which is
+    needed to read Microsoft Access databases
+    """
+    if shutil.which(arguments[0]) is None:
+        raise FileNotFoundError(
+            '`%s` was not found: reading a CDS510 Microsoft Access database '
+            'requires mdbtools (alternatively, convert the database to '
+            'SQLite and use `read_sqlite`)' % arguments[0]
+        )
+    return subprocess.run(
+        arguments,
+        check=True,
+        stdout=subprocess.PIPE,
+        universal_newlines=True
+    ).stdout
+
+
+def _read_mdb_path(
+    path: str,
+    table_names: Optional[Iterable[str]]
+) -> Dict[str, Table]:
+    available_table_names: List[str] = _run_mdbtools(
+        'mdb-tables', '-1', path
+    ).split('\n')
+    tables: Dict[str, Table] = {}
+    for table_name in _get_table_names(table_names):
+        if table_name not in available_table_names:
+            continue
+        reader: Iterator[List[str]] = csv.reader(
+            io.StringIO(_run_mdbtools(
+                'mdb-export',
+                '-D', '%Y-%m-%d %H:%M:%S',
+                path,
+                table_name
+            ))
+        )
+        tables[table_name] = _get_table(
+            table_name,
+            next(reader),
+            reader
+        )
+    return tables
+
+
+def read_mdb(
+    source: Union[str, HTTPResponse, IO[bytes]],
+    table_names: Optional[Iterable[str]] = None
+) -> Dict[str, Table]:
+    """
+    Read decode tables from a CDS510 "Decode" Microsoft Access database, such
+    as is retrieved using `odot_cds.client.Client().extract(...,
+    extract=Extract.CDS510)`. This requires mdbtools.
+
+    Parameters:
+
+    - source (str|http.client.HTTPResponse|typing.IO): The path to a ".mdb"
+      file, or a CDS510 response (which may be zipped).
+
+    - table_names ([str]): The tables to read (by default, all tables
+      referenced by `odot_cds.cds501.DECODE_TABLES`, and the tables in
+      `HISTORY_TABLES`).
+    """
+    if isinstance(source, (str, os.PathLike)):
+        return _read_mdb_path(str(source), table_names)
+    with TemporaryDirectory() as directory:
+        path: str = os.path.join(directory, 'CDS510.mdb')
+        with open(path, 'wb') as file:
+            shutil.copyfileobj(source, file)
+        if zipfile.is_zipfile(path):
+            with zipfile.ZipFile(path) as zip_file:
+                name: str = next(
+                    name for name in zip_file.namelist()
+                    if name.lower().endswith(('.mdb', '.accdb'))
+                )
+                path = zip_file.extract(name, os.path.join(directory, 'zip'))
+        return _read_mdb_path(path, table_names)
+
+
+@functools.lru_cache(maxsize=4)
+def load(path: str) -> Decoder:
+    """
+    Load a decoder from a CDS510 "Decode" database: either a Microsoft Access
+    database (".mdb" or ".accdb"), or a database which has been converted to
+    SQLite (such as "sources/cds510.db"). Decoders are cached, so each
+    database is only read once.
+
+    Parameters:
+
+    - path (str): The path to the database.
+    """
+    return Decoder(
+        read_mdb(path)
+        if path.lower().endswith(('.mdb', '.accdb')) else
+        read_sqlite(path)
+    )
@@ -0,0 +1,215 @@
+"""
+This module drops duplicate rows from CDS501 extracts which overlap one
+another (a county extract includes its cities, and highway extracts overlap
+both), so that combining many extracts yields each crash, vehicle and
+participant once. The keys of rows already seen are held in a SQLite
+database on disk, in front of which a Bloom filter answers most lookups for
+new keys without reading the database:
+
+>>> with dedup.Deduplicator('seen.db') as deduplicator:
+...     for path in ('multnomah/CDS501.txt', 'portland/CDS501.txt'):
+...         warehouse.load(deduplicator.read(path), 'warehouse.db')
+"""
+import hashlib
+import math
+import sqlite3
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+import numpy
+
+from . import cds501
+
+# The primary key field (by position in a CDS501 row) of each record type
+KEY_INDICES: Dict[str, int] = {
+    '1': 0,  # crash_id
+    '2': 2,  # vhcl_id
+    '3': 3  # partic_id
+}
+
+
+class BloomFilter:
+    """
+    A Bloom filter: a set which may report that it contains a value which
+    was never added (with a probability of about `error_rate`, once
+    `capacity` values have been added), but never that it lacks a value
+    which was added.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 10000000,
+        error_rate: float = 0.001
+    ) -> None:
+        self.bit_count: int = max(
+            int(-capacity * math.log(error_rate) / math.log(2) ** 2),
+            8
+        )
+        self.hash_count: int = max(
+            round(self.bit_count / max(capacity, 1) * math.log(2)),
+            1
+        )
+        self.bits: numpy.ndarray = numpy.zeros(
+            (self.bit_count + 7) // 8,
+            dtype=numpy.uint8
+        )
+
+    def _get_positions(self, value: str) -> List[int]:
+        # Positions are derived from two hashes (Kirsch-Mitzenmacher)
+        digest: bytes = hashlib.blake2b(
+            value.encode('utf-8'),
+            digest_size=16
+        ).digest()
+        first: int = int.from_bytes(digest[:8], 'little')
+        second: int = int.from_bytes(digest[8:], 'little') | 1
+        return [
+            (first + index * second) % self.bit_count
+            for index in range(self.hash_count)
+        ]
+
+    def add(self, value: str) -> None:
+        for position in self._get_positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value: str) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._get_positions(value)
+        )
+
+
+class Deduplicator:
+    """
+    Tracks the keys (`crash_id`, `vhcl_id` and `partic_id`) of the rows
+    which have been kept, across any number of extracts (and, if `path` is
+    provided, across sessions).
+
+    Parameters:
+
+    - path (str): The path to a SQLite database in which seen keys are
+      stored (by default, keys are stored in an in-memory database).
+
+    - capacity (int): The number of keys expected, used to size the Bloom
+      filter.
+
+    - error_rate (float): The rate at which the Bloom filter is to report
+      (when `capacity` keys have been seen) that a new key may have been
+      seen, requiring a lookup in the database.
+
+    - batch_size (int): The number of new keys held in memory before they
+      are written to the database.
+    """
+
+    def __init__(
+        self,
+        path: str = ':memory:',
+        capacity: int = 10000000,
+        error_rate: float = 0.001,
+        batch_size: int = 10000
+    ) -> None:
+        self.connection: sqlite3.Connection = sqlite3.connect(path)
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS SEEN_KEY (\n'
+            '    REC_TYP_CD TEXT,\n'
+            '    ID TEXT,\n'
+            '    PRIMARY KEY (REC_TYP_CD, ID)\n'
+            ') WITHOUT ROWID'
+        )
+        self.connection.commit()
+        self.batch_size: int = batch_size
+        self.bloom_filter: BloomFilter = BloomFilter(capacity, error_rate)
+        # Keys which have not yet been written to the database
+        self._pending: Set[Tuple[str, str]] = set()
+        # The number of rows kept and dropped, by record type
+        self.kept: Dict[str, int] = {
+            record_type: 0 for record_type in KEY_INDICES
+        }
+        self.dropped: Dict[str, int] = {
+            record_type: 0 for record_type in KEY_INDICES
+        }
+        for record_type, key in self.connection.execute(
+            'SELECT REC_TYP_CD, ID FROM SEEN_KEY'
+        ):
+            self.bloom_filter.add(record_type + ':' + key)
+
+    def __enter__(self) -> 'Deduplicator':
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def flush(self) -> None:
+        """
+        Write new keys to the database
+        """
+        if self._pending:
+            self.connection.executemany(
+                'INSERT OR IGNORE INTO SEEN_KEY (REC_TYP_CD, ID) '
+                'VALUES (?, ?)',
+                self._pending
+            )
+            self.connection.commit()
+            self._pending.clear()
+
+    def close(self) -> None:
+        """
+        Write new keys to the database, and close it
+        """
+        self.flush()
+        self.connection.close()
+
+    def _is_seen(self, record_type: str, key: str) -> bool:
+        if (record_type, key) in self._pending:
+            return True
+        return self.connection.execute(
+            'SELECT 1 FROM SEEN_KEY WHERE REC_TYP_CD = ? AND ID = ?',
+            (record_type, key)
+        ).fetchone() is not None
+
+    def add(self, record_type: str, key: str) -> bool:
+        """
+        Record a key as seen, returning `True` if it is new, or `False` if it
+        has been seen before
+        """
+        value: str = record_type + ':' + key
+        if value in self.bloom_filter:
+            # The key may have been seen (or this is a false positive)
+            if self._is_seen(record_type, key):
+                return False
+        else:
+            self.bloom_filter.add(value)
+        self._pending.add((record_type, key))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+        return True
+
+    def read_values(
+        self,
+        source: Union[cds501.Source, Iterable[cds501.CDS501]]
+    ) -> Iterator[List[str]]:
+        """
+        Yield the values of each row of a CDS501 extract (see
+        `odot_cds.cds501.read_values`) having a key which has not been seen.
+        Rows having an unrecognized record type are yielded.
+        """
+        for values in cds501.read_values(source):
+            record_type: str = values[1]
+            index: Optional[int] = KEY_INDICES.get(record_type)
+            if index is not None:
+                if not self.add(record_type, values[index]):
+                    self.dropped[record_type] += 1
+                    continue
+                self.kept[record_type] += 1
+            yield values
+
+    def read(
+        self,
+        source: Union[cds501.Source, Iterable[cds501.CDS501]]
+    ) -> Iterator[cds501.CDS501]:
+        """
+        Yield a `CDS501` instance for each row of a CDS501 extract having a
+        key which has not been seen. The result may be passed to any function
+        accepting an iterable of `CDS501` instances, such as
+        `odot_cds.cds501.get_data_frames` or `odot_cds.warehouse.load`.
+        """
+        for values in self.read_values(source):
+            yield cds501.CDS501(*(value or None for value in values))
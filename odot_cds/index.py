@@ -0,0 +1,203 @@
+"""
+This module provides random access to saved "CDS501.txt" files. An index of
+the byte offset and length of each crash's rows (a crash row, followed by
+the rows of its vehicles and participants) is saved in a sidecar file next
+to the extract, and a `Reader` memory-maps the extract and parses only the
+rows of the crashes requested:
+
+>>> with index.Reader('sources/cds501/2018/baker/CDS501.txt') as reader:
+...     crash_group = reader.get('1779899')
+"""
+import mmap
+import os
+from io import StringIO
+from os import PathLike
+from typing import Iterable, Iterator, List, Optional, Union
+
+import numpy
+
+from . import cds501
+
+# The suffix appended to the path of an extract to locate its index
+INDEX_SUFFIX: str = '.idx'
+
+# A record of the index: the location of a run of rows sharing a `crash_id`
+INDEX_DTYPE: numpy.dtype = numpy.dtype([
+    ('crash_id', numpy.int64),
+    ('offset', numpy.int64),
+    ('length', numpy.int64)
+])
+
+
+def get_index_path(path: Union[str, PathLike]) -> str:
+    """
+    Get the path of the sidecar index for an extract
+    """
+    return os.fspath(path) + INDEX_SUFFIX
+
+
+def _get_crash_id(line: bytes) -> int:
+    return int(line[:line.find(b',')] or b'-1')
+
+
+def build(
+    path: Union[str, PathLike],
+    index_path: Optional[Union[str, PathLike]] = None
+) -> numpy.ndarray:
+    """
+    Build the index for a saved "CDS501.txt" file, recording the byte offset
+    and length of each run of consecutive rows having the same `crash_id`,
+    and save it as a sidecar file. Returns the index (a structured array of
+    `INDEX_DTYPE`, sorted by `crash_id`).
+
+    Parameters:
+
+    - path (str): The path to a saved "CDS501.txt" file.
+
+    - index_path (str): The path where the index is saved (by default, the
+      path of the extract followed by `INDEX_SUFFIX`).
+    """
+    crash_ids: List[int] = []
+    offsets: List[int] = []
+    offset: int = 0
+    with open(path, 'rb') as file:
+        for line in file:
+            if line.strip():
+                crash_id: int = _get_crash_id(line)
+                if not crash_ids or crash_id != crash_ids[-1]:
+                    crash_ids.append(crash_id)
+                    offsets.append(offset)
+            offset += len(line)
+    records: numpy.ndarray = numpy.empty(len(crash_ids), dtype=INDEX_DTYPE)
+    records['crash_id'] = crash_ids
+    records['offset'] = offsets
+    records['length'] = numpy.diff(offsets + [offset])
+    # A stable sort keeps repeated runs of a crash in file order
+    records = records[numpy.argsort(records['crash_id'], kind='stable')]
+    with open(index_path or get_index_path(path), 'wb') as file:
+        numpy.save(file, records)
+    return records
+
+
+class Reader:
+    """
+    Reads crashes from a saved "CDS501.txt" file by seeking to their rows.
+    The index is built (see `build`) if it is missing, or older than the
+    extract.
+
+    Parameters:
+
+    - path (str): The path to a saved "CDS501.txt" file.
+
+    - index_path (str): The path of the index (by default, the path of the
+      extract followed by `INDEX_SUFFIX`).
+    """
+
+    def __init__(
+        self,
+        path: Union[str, PathLike],
+        index_path: Optional[Union[str, PathLike]] = None
+    ) -> None:
+        index_path = index_path or get_index_path(path)
+        if not (
+            os.path.exists(index_path) and
+            os.path.getmtime(index_path) >= os.path.getmtime(path)
+        ):
+            build(path, index_path)
+        self.records: numpy.ndarray = numpy.load(index_path, mmap_mode='r')
+        self._file = open(path, 'rb')
+        # Empty files cannot be memory-mapped
+        self._data: Union[mmap.mmap, bytes] = (
+            mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if os.fstat(self._file.fileno()).st_size else
+            b''
+        )
+
+    def __enter__(self) -> 'Reader':
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __contains__(self, crash_id: Union[str, int]) -> bool:
+        return len(self._get_positions(crash_id)) > 0
+
+    def close(self) -> None:
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+
+    def _get_positions(self, crash_id: Union[str, int]) -> range:
+        """
+        Get the positions, in the index, of the runs of a crash's rows
+        """
+        crash_id = int(crash_id)
+        crash_ids: numpy.ndarray = self.records['crash_id']
+        return range(
+            int(numpy.searchsorted(crash_ids, crash_id, side='left')),
+            int(numpy.searchsorted(crash_ids, crash_id, side='right'))
+        )
+
+    def _read(self, positions: Iterable[int]) -> StringIO:
+        """
+        Read the runs of rows at the given positions in the index
+        """
+        return StringIO(
+            b''.join(
+                self._data[offset:offset + length]
+                for offset, length in (
+                    (
+                        int(self.records['offset'][position]),
+                        int(self.records['length'][position])
+                    )
+                    for position in positions
+                )
+            ).decode('utf-8'),
+            newline=''
+        )
+
+    def get_values(self, crash_id: Union[str, int]) -> List[List[str]]:
+        """
+        Get the rows of a crash (see `odot_cds.cds501.read_values`), or an
+        empty list if the crash is not in the extract
+        """
+        return list(cds501.read_values(
+            self._read(self._get_positions(crash_id))
+        ))
+
+    def get(
+        self,
+        crash_id: Union[str, int]
+    ) -> Optional[cds501.CrashGroup]:
+        """
+        Get a crash, with its vehicles and participants (see
+        `odot_cds.cds501.iter_crashes`), or `None` if the crash is not in the
+        extract
+        """
+        for crash_group in cds501.iter_crashes(
+            self._read(self._get_positions(crash_id))
+        ):
+            return crash_group
+        return None
+
+    def get_many(
+        self,
+        crash_ids: Iterable[Union[str, int]]
+    ) -> Iterator[cds501.CrashGroup]:
+        """
+        Yield the crashes (see `get`) having any of `crash_ids`, in the order
+        in which they appear in the extract. Crashes which are not in the
+        extract are skipped.
+        """
+        positions: List[int] = sorted(
+            set(
+                position
+                for crash_id in crash_ids
+                for position in self._get_positions(crash_id)
+            ),
+            key=lambda position: int(self.records['offset'][position])
+        )
+        yield from cds501.iter_crashes(self._read(positions))
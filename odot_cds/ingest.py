@@ -0,0 +1,87 @@
+"""
+This module parses many saved CDS501 extracts in parallel, such as an archive
+laid out as "sources/cds501/<year>/<county>/CDS501.txt". Each file is parsed
+into a columnar store in a worker process, and the stores (rather than
+pickled dataclass instances) are sent back and merged, in the order of the
+files, into one set of "crash", "vhcl" and "partic" tables:
+
+>>> store = ingest.read_files('sources/cds501/2018/*/CDS501.txt')
+>>> crash, vhcl, partic = store.get_data_frames()
+"""
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from glob import glob
+from os import PathLike
+from typing import Dict, Iterable, List, Optional, Union
+
+from . import cds501, columnar
+
+Paths = Union[str, PathLike, Iterable[Union[str, PathLike]]]
+
+
+def get_paths(paths: Paths) -> List[str]:
+    """
+    Get a list of file paths from a glob pattern (the matching paths are
+    sorted), or from an iterable of paths (the order of which is retained).
+    """
+    if isinstance(paths, (str, PathLike)):
+        return sorted(glob(os.fspath(paths), recursive=True))
+    return [os.fspath(path) for path in paths]
+
+
+def _get_store(path: str) -> columnar.Store:
+    """
+    Parse one CDS501 file (this function is executed in worker processes)
+    """
+    return cds501.get_store(path)
+
+
+def read_files(
+    paths: Paths,
+    processes: Optional[int] = None,
+    dictionaries: Optional[Dict[str, columnar.Dictionary]] = None
+) -> columnar.Store:
+    """
+    Parse CDS501 files in a pool of processes, and return a single
+    `odot_cds.columnar.Store` holding the rows of every file. Rows are ordered
+    by file (in the order of `paths`), and then as they appear in each file,
+    regardless of the order in which the files finish parsing.
+
+    Parameters:
+
+    - paths (str|[str]): A glob pattern (such as
+      "sources/cds501/2018/*/CDS501.txt"), or a list of file paths.
+
+    - processes (int): The number of worker processes (by default, the
+      number of CPUs). If this is `1`, or there is only one file, files are
+      parsed in the current process.
+
+    - dictionaries ({str: odot_cds.columnar.Dictionary}): Dictionaries into
+      which the codes of the merged store are translated (see
+      `odot_cds.cds501.get_store`).
+    """
+    file_paths: List[str] = get_paths(paths)
+    if not file_paths:
+        return cds501.get_store((), dictionaries=dictionaries)
+    processes = min(processes or os.cpu_count() or 1, len(file_paths))
+    stores: List[columnar.Store]
+    if processes == 1:
+        stores = [_get_store(path) for path in file_paths]
+    else:
+        # The largest files are submitted first, so that the pool is not left
+        # waiting on a large file submitted last
+        order: List[int] = sorted(
+            range(len(file_paths)),
+            key=lambda index: -os.path.getsize(file_paths[index])
+        )
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            futures: List[Future] = [
+                executor.submit(_get_store, file_paths[index])
+                for index in order
+            ]
+            results: Dict[int, columnar.Store] = {
+                index: future.result()
+                for index, future in zip(order, futures)
+            }
+        stores = [results[index] for index in range(len(file_paths))]
+    return columnar.concatenate(stores, dictionaries)
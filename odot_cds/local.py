@@ -0,0 +1,528 @@
+"""
+This module answers CDS501 requests from a local warehouse (see
+`odot_cds.warehouse`) where it can, rather than from CDS. A `LocalClient`
+accepts the same arguments as `odot_cds.client.Client.extract`. It
+determines which days of a request are covered by extracts already loaded:
+a county request is covered by loaded extracts of the county, a city request
+by those of the city or of its counties, and a highway request by those of
+every county. Covered days are answered from the warehouse, and only the
+remaining days are requested from CDS:
+
+>>> local_client = local.LocalClient('warehouse.db')
+>>> response = local_client.extract(
+...     begin_date=date(2018, 1, 1),
+...     end_date=date(2018, 12, 31),
+...     road_type=client.RoadType.ALL,
+...     extract=client.Extract.CDS501,
+...     jurisdiction='rdoSumJurisdictionCNTY',
+...     county='Clackamas'
+... )
+>>> crash, vhcl, partic = cds501.get_data_frames(response)
+"""
+import csv
+import re
+import sqlite3
+from datetime import date, timedelta
+from http.client import HTTPResponse
+from io import StringIO
+from typing import (
+    Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+)
+
+from . import cds501, cube, warehouse
+from .client import (
+    DEFAULT_BEGIN_DATE, DEFAULT_END_DATE, Client, Extract, HighwayType,
+    RoadType, connect
+)
+from .warehouse import DateRange
+
+# The road type (see `odot_cds.cube.ROAD_TYPES`) selected by each "All
+# Roads" query type (by ID or label), or `None` for all road types
+QUERY_ROAD_TYPES: Dict[str, Optional[str]] = {
+    '': None,
+    'rdoSumQueryTypeALL': None,
+    'All Roads': None,
+    'rdoSumQueryTypeCNTY': 'CNTY',
+    'County Roads': 'CNTY',
+    'rdoSumQueryTypeCITY': 'CITY',
+    'City Streets': 'CITY',
+    'rdoSumQueryTypeSTATE': 'STATE',
+    'State Highways': 'STATE'
+}
+
+_COUNTY_JURISDICTIONS: Tuple[str, ...] = (
+    '',
+    'rdoSumJurisdictionCNTY',
+    'County'
+)
+_CITY_JURISDICTIONS: Tuple[str, ...] = ('rdoSumJurisdictionCITY', 'City')
+
+# The number of crashes for which vehicles and participants are queried at
+# once
+_BATCH_SIZE: int = 500
+
+_CRASH_DATE_SQL: str = (
+    '(CAST(CRASH_YR_NO AS INTEGER) * 10000 + '
+    'CAST(CRASH_MO_NO AS INTEGER) * 100 + '
+    'CAST(CRASH_DAY_NO AS INTEGER))'
+)
+
+
+def _get_date_number(date_: date) -> int:
+    return date_.year * 10000 + date_.month * 100 + date_.day
+
+
+def intersect(
+    ranges: Sequence[DateRange],
+    other_ranges: Sequence[DateRange]
+) -> List[DateRange]:
+    """
+    Get the date ranges covered by both `ranges` and `other_ranges` (each a
+    sorted list of non-overlapping, inclusive `(begin_date, end_date)`
+    tuples)
+    """
+    intersection: List[DateRange] = []
+    for begin_date, end_date in ranges:
+        for other_begin_date, other_end_date in other_ranges:
+            overlap: DateRange = (
+                max(begin_date, other_begin_date),
+                min(end_date, other_end_date)
+            )
+            if overlap[0] <= overlap[1]:
+                intersection.append(overlap)
+    return sorted(intersection)
+
+
+def get_gaps(
+    ranges: Sequence[DateRange],
+    begin_date: date,
+    end_date: date
+) -> List[DateRange]:
+    """
+    Get the date ranges from `begin_date` through `end_date` which are not
+    covered by `ranges` (a sorted list of non-overlapping, inclusive
+    `(begin_date, end_date)` tuples)
+    """
+    gaps: List[DateRange] = []
+    gap_begin_date: date = begin_date
+    for range_begin_date, range_end_date in ranges:
+        if range_end_date < gap_begin_date:
+            continue
+        if range_begin_date > end_date:
+            break
+        if range_begin_date > gap_begin_date:
+            gaps.append((gap_begin_date, range_begin_date - timedelta(days=1)))
+        gap_begin_date = range_end_date + timedelta(days=1)
+    if gap_begin_date <= end_date:
+        gaps.append((gap_begin_date, end_date))
+    return gaps
+
+
+class LocalResponse:
+    """
+    A CDS501 extract answered (at least in part) from a warehouse, which can
+    be passed to any function accepting a file object for a saved
+    "CDS501.txt" file. Rows answered from the warehouse are listed first
+    (each crash followed by its vehicles, each followed by its participants),
+    followed by those of any responses from CDS. Values read from the
+    warehouse are formatted as stored, so numbers are not padded with zeros
+    (a `vhcl_coded_seq_no` of "01" is read as "1", for example).
+
+    - covered ([(datetime.date, datetime.date)]): The date ranges answered
+      from the warehouse.
+
+    - gaps ([(datetime.date, datetime.date)]): The date ranges requested from
+      CDS.
+    """
+
+    def __init__(
+        self,
+        lines: Iterable[str],
+        covered: Sequence[DateRange] = (),
+        gaps: Sequence[DateRange] = ()
+    ) -> None:
+        self._lines: Iterable[str] = lines
+        self.covered: List[DateRange] = list(covered)
+        self.gaps: List[DateRange] = list(gaps)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._lines)
+
+    def read(self) -> str:
+        return ''.join(self)
+
+
+class LocalClient:
+    """
+    A local-first stand-in for `odot_cds.client.Client.extract`.
+
+    Parameters:
+
+    - path (str): The path to a SQLite warehouse (see `odot_cds.warehouse`),
+      ideally a copy of a CDS510 database, the "CNTY" and "CITY_SECT" tables
+      of which are used to look up counties and cities by name, and to
+      determine whether every county is covered.
+
+    - client (odot_cds.client.Client): The client used to request days which
+      are not covered (by default, `odot_cds.client.connect()` is called
+      when the first such request is made).
+
+    - store (bool): If `True` (the default), county extracts requested from
+      CDS are loaded into the warehouse and recorded as covered, so that
+      subsequent requests are answered locally.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        client: Optional[Client] = None,
+        store: bool = True
+    ) -> None:
+        self.path: str = path
+        self._client: Optional[Client] = client
+        self.store: bool = store
+
+    @property
+    def client(self) -> Client:
+        if self._client is None:
+            self._client = connect()
+        return self._client
+
+    def _get_county_ids(self, connection: sqlite3.Connection) -> List[str]:
+        try:
+            return [
+                county_id
+                for county_id, in connection.execute(
+                    'SELECT CNTY_ID FROM CNTY WHERE CNTY_TERMNT_DT IS NULL'
+                )
+            ]
+        except sqlite3.OperationalError:
+            return []
+
+    def _get_id(
+        self,
+        connection: sqlite3.Connection,
+        table_name: str,
+        value: str
+    ) -> str:
+        """
+        Look up the ID of a county ("CNTY") or city ("CITY_SECT") by name
+        (values which are not names are assumed to be IDs)
+        """
+        try:
+            row: Optional[Tuple[Any]] = connection.execute(
+                'SELECT %s_ID FROM %s WHERE UPPER(%s_NM) = UPPER(?)' % (
+                    table_name,
+                    table_name,
+                    table_name
+                ),
+                (value.strip(),)
+            ).fetchone()
+        except sqlite3.OperationalError:
+            row = None
+        return value.strip() if row is None else str(row[0])
+
+    def _get_counties_coverage(
+        self,
+        connection: sqlite3.Connection,
+        county_ids: Iterable[str]
+    ) -> List[DateRange]:
+        """
+        Get the date ranges covered for every one of `county_ids`
+        """
+        coverage: Optional[List[DateRange]] = None
+        for county_id in county_ids:
+            county_coverage: List[DateRange] = warehouse.get_coverage(
+                connection,
+                county=county_id
+            )
+            coverage = (
+                county_coverage
+                if coverage is None else
+                intersect(coverage, county_coverage)
+            )
+        return coverage or []
+
+    def _iter_lines(
+        self,
+        conditions: Sequence[str],
+        parameters: Sequence[object],
+        covered: Sequence[DateRange]
+    ) -> Iterator[str]:
+        """
+        Yield CDS501 lines for crashes in the warehouse matching `conditions`
+        on the "CRASH" table, on covered days
+        """
+        if not covered:
+            return
+        tables: Dict[str, warehouse._Table] = warehouse.TABLES
+        connection: sqlite3.Connection = sqlite3.connect(self.path)
+        try:
+            date_conditions: str = ' OR '.join(
+                '%s BETWEEN ? AND ?' % _CRASH_DATE_SQL
+                for _ in covered
+            )
+            date_parameters: List[int] = [
+                _get_date_number(date_)
+                for date_range in covered
+                for date_ in date_range
+            ]
+            crash_rows: List[Tuple[object, ...]] = connection.execute(
+                'SELECT %s FROM CRASH WHERE %s ORDER BY CRASH_ID' % (
+                    ', '.join(
+                        '"%s"' % column_name
+                        for column_name in tables['1'].column_names
+                    ),
+                    ' AND '.join(
+                        list(conditions) + ['(%s)' % date_conditions]
+                    )
+                ),
+                list(parameters) + date_parameters
+            ).fetchall()
+            for start in range(0, len(crash_rows), _BATCH_SIZE):
+                batch: List[Tuple[object, ...]] = crash_rows[
+                    start:start + _BATCH_SIZE
+                ]
+                children: Dict[str, Dict[object, List[Tuple[object, ...]]]]
+                children = {}
+                for record_type, order in (
+                    ('2', 'VHCL_CODED_SEQ_NO, VHCL_ID'),
+                    ('3', 'PARTIC_DSPLY_SEQ_NO, PARTIC_ID')
+                ):
+                    table: warehouse._Table = tables[record_type]
+                    rows: Dict[object, List[Tuple[object, ...]]] = {}
+                    for row in connection.execute(
+                        'SELECT %s FROM "%s" WHERE CRASH_ID IN (%s) '
+                        'ORDER BY CRASH_ID, %s' % (
+                            ', '.join(
+                                '"%s"' % column_name
+                                for column_name in table.column_names
+                            ),
+                            table.name,
+                            ', '.join('?' for _ in batch),
+                            order
+                        ),
+                        [crash_row[0] for crash_row in batch]
+                    ):
+                        rows.setdefault(row[0], []).append(row)
+                    children[record_type] = rows
+                for crash_row in batch:
+                    yield _get_line('1', crash_row)
+                    partic_rows: List[Tuple[object, ...]] = children[
+                        '3'
+                    ].get(crash_row[0], [])
+                    vhcl_ids: List[object] = []
+                    for vhcl_row in children['2'].get(crash_row[0], []):
+                        vhcl_ids.append(vhcl_row[1])
+                        yield _get_line('2', vhcl_row)
+                        for partic_row in partic_rows:
+                            if partic_row[1] == vhcl_row[1]:
+                                yield _get_line('3', partic_row)
+                    # Participants not associated with a vehicle
+                    for partic_row in partic_rows:
+                        if partic_row[1] not in vhcl_ids:
+                            yield _get_line('3', partic_row)
+        finally:
+            connection.close()
+
+    def _fetch(
+        self,
+        arguments: Dict[str, Any],
+        gap: DateRange
+    ) -> List[str]:
+        """
+        Request the days of a gap from CDS, and read the lines of the response
+        """
+        response: HTTPResponse = self.client.extract(**dict(
+            arguments,
+            begin_date=gap[0],
+            end_date=gap[1]
+        ))
+        return [
+            str(line, encoding='utf-8') if isinstance(line, bytes) else line
+            for line in response
+        ]
+
+    def extract(
+        self,
+        begin_date: date = DEFAULT_BEGIN_DATE,
+        end_date: date = DEFAULT_END_DATE,
+        road_type: RoadType = RoadType.ALL,
+        extract: Extract = Extract.CDS501,
+        jurisdiction: str = '',
+        county: str = '',
+        city: str = '',
+        street: str = '',
+        cross_street: str = '',
+        query_type: str = '',
+        highway: str = '',
+        begin_mile_point: float = 0.0,
+        end_mile_point: float = 0.0,
+        highway_type: HighwayType = HighwayType.ALL,
+        z_mile_points: bool = True,
+        add_mileage: bool = True,
+        non_add_mileage: bool = True,
+        record_number: int = 0,
+        display_instructions: bool = False
+    ) -> Union[HTTPResponse, LocalResponse]:
+        """
+        Request an extract, as with `odot_cds.client.Client.extract` (see
+        that method for a description of each parameter). "All Roads" and
+        "Highways" CDS501 extracts are answered from the warehouse for the
+        days it covers, and a `LocalResponse` is returned. Other extracts
+        and reports, "Local Roads" extracts, and highway extracts selecting
+        only some highway or mileage types, are requested from CDS.
+        """
+        arguments: Dict[str, Any] = dict(
+            begin_date=begin_date,
+            end_date=end_date,
+            road_type=road_type,
+            extract=extract,
+            jurisdiction=jurisdiction,
+            county=county,
+            city=city,
+            street=street,
+            cross_street=cross_street,
+            query_type=query_type,
+            highway=highway,
+            begin_mile_point=begin_mile_point,
+            end_mile_point=end_mile_point,
+            highway_type=highway_type,
+            z_mile_points=z_mile_points,
+            add_mileage=add_mileage,
+            non_add_mileage=non_add_mileage,
+            record_number=record_number,
+            display_instructions=display_instructions
+        )
+        if extract != Extract.CDS501 or not (
+            (
+                road_type == RoadType.ALL and
+                query_type in QUERY_ROAD_TYPES and
+                jurisdiction in _COUNTY_JURISDICTIONS + _CITY_JURISDICTIONS
+            ) or (
+                road_type == RoadType.HIGHWAY and
+                highway_type == HighwayType.ALL and
+                z_mile_points and add_mileage and non_add_mileage
+            )
+        ):
+            return self.client.extract(**arguments)
+        conditions: List[str] = []
+        parameters: List[object] = []
+        county_id: Optional[str] = None
+        connection: sqlite3.Connection = sqlite3.connect(self.path)
+        try:
+            warehouse.create_tables(connection)
+            if road_type == RoadType.HIGHWAY:
+                # Highways may cross any county
+                covered: List[DateRange] = self._get_counties_coverage(
+                    connection,
+                    self._get_county_ids(connection)
+                )
+                match: Optional[re.Match] = re.match(r'\s*(\d+)', highway)
+                conditions.append('HWY_NO = ?')
+                parameters.append(
+                    match.group(1).zfill(3) if match else highway.strip()
+                )
+                # A mile point of 0 is not sent to CDS, so it does not bound
+                # the range
+                if begin_mile_point:
+                    conditions.append('MP_NO >= ?')
+                    parameters.append(begin_mile_point)
+                if end_mile_point:
+                    conditions.append('MP_NO <= ?')
+                    parameters.append(end_mile_point)
+            else:
+                road_type_: Optional[str] = QUERY_ROAD_TYPES[query_type]
+                if road_type_ is not None:
+                    conditions.append('RD_CNTL_CD IN (%s)' % ', '.join(
+                        repr(code)
+                        for code, code_road_type in cube.ROAD_TYPES.items()
+                        if code_road_type == road_type_
+                    ))
+                if jurisdiction in _CITY_JURISDICTIONS:
+                    city_id: str = self._get_id(connection, 'CITY_SECT', city)
+                    conditions.append('CITY_SECT_ID = ?')
+                    parameters.append(int(city_id))
+                    # A city is covered by its own extracts, or by those of
+                    # the counties in which it has crashes
+                    county_ids: List[str] = (
+                        [self._get_id(connection, 'CNTY', county)]
+                        if county else
+                        [
+                            county_id_
+                            for county_id_, in connection.execute(
+                                'SELECT DISTINCT CNTY_ID FROM CRASH '
+                                'WHERE CITY_SECT_ID = ?',
+                                (int(city_id),)
+                            )
+                        ]
+                    )
+                    covered = warehouse.merge_ranges(
+                        warehouse.get_coverage(connection, city=city_id) +
+                        self._get_counties_coverage(connection, county_ids)
+                    )
+                else:
+                    county_id = self._get_id(connection, 'CNTY', county)
+                    conditions.append('CNTY_ID = ?')
+                    parameters.append(county_id)
+                    covered = warehouse.get_coverage(
+                        connection,
+                        county=county_id
+                    )
+        finally:
+            connection.close()
+        gaps: List[DateRange] = get_gaps(covered, begin_date, end_date)
+        fetched_lines: List[str] = []
+        for gap in gaps:
+            lines: List[str] = self._fetch(arguments, gap)
+            if (
+                self.store and
+                county_id is not None and
+                QUERY_ROAD_TYPES[query_type] is None
+            ):
+                # Store complete county extracts, so they are answered
+                # locally hereafter
+                warehouse.load(StringIO(''.join(lines)), self.path)
+                warehouse.add_coverage(
+                    self.path,
+                    gap[0],
+                    gap[1],
+                    county=county_id
+                )
+                covered.append(gap)
+            else:
+                fetched_lines += lines
+        covered = intersect(
+            warehouse.merge_ranges(covered),
+            [(begin_date, end_date)]
+        )
+        return LocalResponse(
+            _chain(
+                self._iter_lines(conditions, parameters, covered),
+                fetched_lines
+            ),
+            covered=covered,
+            gaps=gaps
+        )
+
+
+def _chain(*iterables: Iterable[str]) -> Iterator[str]:
+    for iterable in iterables:
+        yield from iterable
+
+
+def _get_line(record_type: str, row: Sequence[object]) -> str:
+    """
+    Format a row of the "CRASH", "VHCL" or "PARTIC" table of a warehouse as
+    a line of a CDS501 extract
+    """
+    values: List[str] = [''] * cds501.CDS501_COLUMN_COUNT
+    for index, value in zip(
+        warehouse.TABLES[record_type].indices,
+        row
+    ):
+        values[index] = '' if value is None else str(value)
+    values[1] = record_type
+    file: StringIO = StringIO()
+    csv.writer(file, lineterminator='\n').writerow(values)
+    return file.getvalue()
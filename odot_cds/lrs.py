@@ -0,0 +1,243 @@
+"""
+This module indexes crashes by their linear-referenced location: a route
+(by default, the combination of `hwy_no`, `hwy_sfx_no`, `rdwy_no` and
+`mlge_typ_cd`), and a measure along that route (by default, `mp_no`). Within
+each route, crashes are sorted by measure, so that range, point and segment
+queries are answered with a binary search:
+
+>>> crash, vhcl, partic = cds501.get_store('CDS501.txt')
+>>> index = lrs.MilePointIndex.from_table(crash)
+>>> crash.take(index.query_range(('001',), 280.0, 285.5))
+"""
+import bisect
+from dataclasses import dataclass
+from typing import List, Sequence, Tuple, Union
+
+import numpy
+import pandas
+
+from . import columnar
+
+# The columns identifying a state highway route, in the order in which they
+# are sorted
+ROUTE_COLUMNS: Tuple[str, ...] = (
+    'hwy_no', 'hwy_sfx_no', 'rdwy_no', 'mlge_typ_cd'
+)
+
+# The column identifying a route by its LRS key (for use with `mp_no` or
+# `seg_pt_lrs_meas` as the measure)
+LRS_COLUMNS: Tuple[str, ...] = ('lrs_val',)
+
+# A string greater than any code, used to find the end of a range of routes
+# sharing a prefix
+_MAXIMUM_STRING: str = chr(0x10FFFF)
+
+Route = Union[str, Tuple[str, ...]]
+
+
+@dataclass
+class MilePointIndex:
+    """
+    An index of rows sorted by route and then by measure.
+
+    - routes: The distinct routes, sorted, each a tuple of the values of
+      `route_columns` (with empty strings representing null values).
+
+    - offsets: The position in `order` of the first row on each route
+      (followed by the number of indexed rows).
+
+    - order: The positions of indexed rows (in the table from which the index
+      was built), sorted by route and measure.
+
+    - measures: The measure of each row in `order`.
+
+    Rows with a null measure are not indexed. Query results are positions in
+    the table from which the index was built, ordered by route and measure.
+    """
+
+    route_columns: Tuple[str, ...]
+    measure_column: str
+    routes: List[Tuple[str, ...]]
+    offsets: numpy.ndarray
+    order: numpy.ndarray
+    measures: numpy.ndarray
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    @classmethod
+    def from_table(
+        cls,
+        table: Union[columnar.Table, pandas.DataFrame],
+        route_columns: Sequence[str] = ROUTE_COLUMNS,
+        measure_column: str = 'mp_no'
+    ) -> 'MilePointIndex':
+        """
+        Build an index over the rows of a crash table or data frame.
+
+        Parameters:
+
+        - table (odot_cds.columnar.Table|pandas.DataFrame): Crashes.
+
+        - route_columns ([str]): The columns identifying a route (such as
+          `ROUTE_COLUMNS` or `LRS_COLUMNS`).
+
+        - measure_column (str): The column holding each row's measure along
+          its route (such as "mp_no" or "seg_pt_lrs_meas").
+        """
+        measures: numpy.ndarray = columnar.get_floats(table[measure_column])
+        indexed: numpy.ndarray = numpy.flatnonzero(~numpy.isnan(measures))
+        route_values: List[numpy.ndarray] = [
+            columnar.get_strings(table[column_name])[indexed]
+            for column_name in route_columns
+        ]
+        # Each route column is factorized into sorted codes, so that rows can
+        # be sorted by route (and then measure) numerically
+        route_codes: List[numpy.ndarray] = []
+        for values in route_values:
+            codes, _ = pandas.factorize(values, sort=True)
+            route_codes.append(codes)
+        sort_order: numpy.ndarray = numpy.lexsort(
+            [measures[indexed]] + route_codes[::-1]
+        )
+        sorted_codes: numpy.ndarray = (
+            numpy.stack(route_codes, axis=1)[sort_order]
+            if route_codes else
+            numpy.zeros((len(indexed), 0), dtype=numpy.int64)
+        )
+        # The first row of each route
+        starts: numpy.ndarray = numpy.flatnonzero(
+            numpy.concatenate([
+                numpy.ones(min(len(indexed), 1), dtype=bool),
+                (sorted_codes[1:] != sorted_codes[:-1]).any(axis=1)
+            ])
+        )
+        return cls(
+            route_columns=tuple(route_columns),
+            measure_column=measure_column,
+            routes=[
+                tuple(values[sort_order[start]] for values in route_values)
+                for start in starts
+            ],
+            offsets=numpy.append(starts, len(indexed)),
+            order=indexed[sort_order],
+            measures=measures[indexed][sort_order]
+        )
+
+    def get_route_indices(self, route: Route) -> range:
+        """
+        Get the indices (in `self.routes`) of the routes matching `route`: a
+        tuple of values for the leading route columns (for example,
+        `('001',)` matches every roadway and mileage type of highway 001), or
+        a single value for the first route column.
+        """
+        if isinstance(route, str):
+            route = (route,)
+        route = tuple(route)
+        return range(
+            bisect.bisect_left(self.routes, route),
+            bisect.bisect_right(
+                self.routes,
+                route + (_MAXIMUM_STRING,) * (
+                    len(self.route_columns) - len(route)
+                )
+            )
+        )
+
+    def _get_bounds(
+        self,
+        route_index: int,
+        starts: numpy.ndarray,
+        ends: numpy.ndarray
+    ) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """
+        Get the range of positions, in `self.order`, of rows on a route with
+        measures between each start and end (inclusive)
+        """
+        offset: int = int(self.offsets[route_index])
+        measures: numpy.ndarray = self.measures[
+            offset:self.offsets[route_index + 1]
+        ]
+        return (
+            offset + numpy.searchsorted(measures, starts, side='left'),
+            offset + numpy.searchsorted(measures, ends, side='right')
+        )
+
+    def query_range(
+        self,
+        route: Route,
+        start: float,
+        end: float
+    ) -> numpy.ndarray:
+        """
+        Get the positions of rows on `route` (see `get_route_indices`) with
+        measures from `start` through `end`
+        """
+        slices: List[numpy.ndarray] = []
+        for route_index in self.get_route_indices(route):
+            first, last = self._get_bounds(
+                route_index,
+                numpy.array([start]),
+                numpy.array([end])
+            )
+            slices.append(self.order[first[0]:last[0]])
+        return (
+            numpy.concatenate(slices)
+            if slices else
+            self.order[:0]
+        )
+
+    def query_point(
+        self,
+        route: Route,
+        measure: float,
+        tolerance: float = 0.0
+    ) -> numpy.ndarray:
+        """
+        Get the positions of rows on `route` within `tolerance` of a measure
+        """
+        return self.query_range(
+            route,
+            measure - tolerance,
+            measure + tolerance
+        )
+
+    def query_segments(
+        self,
+        route: Route,
+        starts: Sequence[float],
+        ends: Sequence[float]
+    ) -> List[numpy.ndarray]:
+        """
+        Get the positions of rows on `route` overlapping each of a sequence
+        of segments (which may overlap one another), given by their start and
+        end measures. All segments are searched at once.
+        """
+        starts = numpy.asarray(starts, dtype=numpy.float64)
+        ends = numpy.asarray(ends, dtype=numpy.float64)
+        results: List[List[numpy.ndarray]] = [[] for _ in starts]
+        for route_index in self.get_route_indices(route):
+            firsts, lasts = self._get_bounds(route_index, starts, ends)
+            for result, first, last in zip(results, firsts, lasts):
+                result.append(self.order[first:last])
+        return [
+            numpy.concatenate(result) if result else self.order[:0]
+            for result in results
+        ]
+
+    def count_segments(
+        self,
+        route: Route,
+        starts: Sequence[float],
+        ends: Sequence[float]
+    ) -> numpy.ndarray:
+        """
+        Count the rows on `route` overlapping each of a sequence of segments
+        """
+        starts = numpy.asarray(starts, dtype=numpy.float64)
+        ends = numpy.asarray(ends, dtype=numpy.float64)
+        counts: numpy.ndarray = numpy.zeros(len(starts), dtype=numpy.int64)
+        for route_index in self.get_route_indices(route):
+            firsts, lasts = self._get_bounds(route_index, starts, ends)
+            counts += lasts - firsts
+        return counts
@@ -0,0 +1,873 @@
+"""
+This module writes parsed CDS501 extracts to a Hive-partitioned Parquet
+dataset, and reads them back. Each of the "crash", "vhcl" and "partic" tables
+is stored in its own directory, partitioned by `crash_yr_no` and `cnty_id`:
+
+    <path>/crash/crash_yr_no=2018/cnty_id=01/part-<uuid>.parquet
+
+Vehicle and participant rows are partitioned by the year and county of their
+crash, so that all three tables can be pruned by the same filters. This
+module requires `pyarrow` (`pip install odot-cds[parquet]`).
+
+A manifest ("<path>/_manifest.json"), updated each time an extract is
+written, records the row count of each file, and a zone map of its key
+columns (see `ZONE_MAP_COLUMNS`): their minimum, maximum, null count and (if
+there are few) distinct values. `read_dataset` consults the manifest to skip
+files which cannot match its filters, without opening them.
+"""
+import json
+import os
+from dataclasses import dataclass, fields
+from decimal import Decimal
+from typing import (
+    Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+)
+from uuid import uuid4
+
+import numpy
+import pandas
+import pyarrow
+import pyarrow.dataset
+import pyarrow.parquet
+
+from . import cds501, columnar, spatial
+
+PARTITION_COLUMNS: Tuple[str, str] = ('crash_yr_no', 'cnty_id')
+
+# The partition value used when a vehicle or participant's crash is not
+# present in the same extract (this is the value Hive uses for nulls)
+DEFAULT_PARTITION: str = '__HIVE_DEFAULT_PARTITION__'
+
+# The file, in the root directory of a dataset, listing its files and their
+# zone maps
+MANIFEST: str = '_manifest.json'
+
+# The columns for which zone maps are recorded (for each table having them).
+# `lat_dd` and `longtd_dd` are the decimal degree coordinates computed for the
+# "crash" table of a columnar store.
+ZONE_MAP_COLUMNS: Tuple[str, ...] = (
+    'crash_yr_no',
+    'cnty_id',
+    'city_sect_id',
+    'crash_svrty_cd',
+    'hwy_no',
+    'lat_dd',
+    'longtd_dd'
+)
+
+# The columns which are not stored in files, but computed (for filtering, or
+# if requested) from the stored degrees, minutes and seconds
+COMPUTED_COLUMNS: Dict[str, Tuple[str, str, str]] = {
+    'lat_dd': ('lat_deg_no', 'lat_minute_no', 'lat_sec_no'),
+    'longtd_dd': ('longtd_deg_no', 'longtd_minute_no', 'longtd_sec_no')
+}
+
+# Distinct values are recorded in a zone map only for columns having no more
+# than this many in a file
+MAXIMUM_DISTINCT_VALUES: int = 64
+
+TABLES: Dict[str, type] = {
+    'crash': cds501.Crash,
+    'vhcl': cds501.Vhcl,
+    'partic': cds501.Partic
+}
+
+_ARROW_TYPES: Dict[type, pyarrow.DataType] = {
+    str: pyarrow.dictionary(pyarrow.int32(), pyarrow.string()),
+    int: pyarrow.int32(),
+    bool: pyarrow.bool_(),
+    Decimal: pyarrow.float64(),
+    float: pyarrow.float64()
+}
+
+
+# Converts filters in the form accepted by `pyarrow.parquet.read_table` to
+# an expression (this function is public in newer versions of `pyarrow`)
+_filters_to_expression = getattr(
+    pyarrow.parquet,
+    'filters_to_expression',
+    getattr(pyarrow.parquet, '_filters_to_expression', None)
+)
+
+
+def get_schema(table_name: str) -> pyarrow.Schema:
+    """
+    Get the Arrow schema used for files in the "crash", "vhcl" or "partic"
+    table (partition columns are excluded, as these are encoded in each
+    file's path)
+    """
+    return pyarrow.schema([
+        pyarrow.field(
+            field_.name,
+            _ARROW_TYPES[cds501.get_field_type(field_)]
+        )
+        for field_ in fields(TABLES[table_name])
+        if field_.name not in PARTITION_COLUMNS
+    ])
+
+
+def _get_arrow_array(
+    column: columnar.Column,
+    type_: pyarrow.DataType
+) -> pyarrow.Array:
+    """
+    Convert a column from a columnar store to an Arrow array
+    """
+    if isinstance(column, columnar.CodeColumn):
+        return pyarrow.DictionaryArray.from_arrays(
+            pyarrow.array(
+                column.codes,
+                mask=column.codes < 0,
+                type=pyarrow.int32()
+            ),
+            pyarrow.array(column.dictionary.values, type=pyarrow.string())
+        )
+    if isinstance(column, columnar.FloatColumn):
+        return pyarrow.array(
+            column.values,
+            mask=numpy.isnan(column.values),
+            type=type_
+        )
+    if isinstance(column, columnar.FixedPointColumn):
+        return pyarrow.array(column.to_floats(), mask=column.mask, type=type_)
+    return pyarrow.array(column.values, mask=column.mask, type=type_)
+
+
+def _get_partition_values(
+    table: columnar.Table
+) -> Tuple[numpy.ndarray, ...]:
+    """
+    Get an array of partition values for each partition column in a crash
+    table
+    """
+    values: List[numpy.ndarray] = []
+    for name in PARTITION_COLUMNS:
+        column: columnar.CodeColumn = table[name]
+        dictionary_values: numpy.ndarray = numpy.array(
+            column.dictionary.values + [DEFAULT_PARTITION],
+            dtype=object
+        )
+        values.append(dictionary_values[column.codes])
+    return tuple(values)
+
+
+def _get_child_partition_values(
+    crash: columnar.Table,
+    crash_partition_values: Tuple[numpy.ndarray, ...],
+    table: columnar.Table
+) -> Tuple[numpy.ndarray, ...]:
+    """
+    Look up the partition values for each row of a "vhcl" or "partic" table
+    from the row's crash
+    """
+    crash_ids: numpy.ndarray = crash['crash_id'].values
+    order: numpy.ndarray = numpy.argsort(crash_ids, kind='stable')
+    sorted_crash_ids: numpy.ndarray = crash_ids[order]
+    child_crash_ids: numpy.ndarray = table['crash_id'].values
+    positions: numpy.ndarray = numpy.searchsorted(
+        sorted_crash_ids,
+        child_crash_ids
+    ).clip(0, max(len(sorted_crash_ids) - 1, 0))
+    found: numpy.ndarray = (
+        sorted_crash_ids[positions] == child_crash_ids
+        if len(sorted_crash_ids) else
+        numpy.zeros(len(child_crash_ids), dtype=bool)
+    )
+    values: List[numpy.ndarray] = []
+    for crash_values in crash_partition_values:
+        child_values: numpy.ndarray = numpy.full(
+            len(child_crash_ids),
+            DEFAULT_PARTITION,
+            dtype=object
+        )
+        if len(sorted_crash_ids):
+            child_values[found] = crash_values[order][positions[found]]
+        values.append(child_values)
+    return tuple(values)
+
+
+@dataclass(frozen=True)
+class ColumnStatistics:
+    """
+    The zone map of a column in one file: the minimum and maximum non-null
+    values (`None` if all values are null), the number of null values, and
+    the distinct non-null values (`None` if there are more than
+    `MAXIMUM_DISTINCT_VALUES`).
+    """
+
+    minimum: Union[str, int, float, None]
+    maximum: Union[str, int, float, None]
+    null_count: int
+    values: Optional[Tuple[Union[str, int, float], ...]] = None
+
+
+@dataclass(frozen=True)
+class WrittenFile:
+    """
+    A file written to a Parquet dataset by `write_dataset`
+    """
+
+    table_name: str
+    partition: Tuple[Tuple[str, str], ...]
+    path: str
+    row_count: int
+    statistics: Tuple[Tuple[str, ColumnStatistics], ...] = ()
+
+
+def _get_value_statistics(
+    values: Sequence[Union[str, int, float]],
+    null_count: int
+) -> ColumnStatistics:
+    """
+    Get the zone map of a column from its non-null values
+    """
+    if not len(values):
+        return ColumnStatistics(None, None, null_count, ())
+    distinct_values: List[Union[str, int, float]] = sorted(set(values))
+    return ColumnStatistics(
+        minimum=distinct_values[0],
+        maximum=distinct_values[-1],
+        null_count=null_count,
+        values=(
+            tuple(distinct_values)
+            if len(distinct_values) <= MAXIMUM_DISTINCT_VALUES else
+            None
+        )
+    )
+
+
+def _get_statistics(column: columnar.Column) -> ColumnStatistics:
+    """
+    Get the zone map of a column
+    """
+    values: numpy.ndarray
+    if isinstance(column, columnar.CodeColumn):
+        strings: numpy.ndarray = columnar.get_strings(column)
+        values = strings[strings != '']
+    else:
+        floats: numpy.ndarray = columnar.get_floats(column)
+        values = floats[~numpy.isnan(floats)]
+        if isinstance(column, columnar.IntegerColumn):
+            values = values.astype(numpy.int64)
+    return _get_value_statistics(values.tolist(), len(column) - len(values))
+
+
+def _scan_file(
+    table_name: str,
+    partition: Tuple[Tuple[str, str], ...],
+    path: str
+) -> WrittenFile:
+    """
+    Compute the zone maps of a file from its contents
+    """
+    parquet_file: pyarrow.parquet.ParquetFile = pyarrow.parquet.ParquetFile(
+        path
+    )
+    row_count: int = parquet_file.metadata.num_rows
+    names: List[str] = parquet_file.schema_arrow.names
+    # Partition columns are not stored in files, so their zone maps are
+    # taken from the partition
+    statistics: Dict[str, ColumnStatistics] = {
+        name: (
+            ColumnStatistics(None, None, row_count, ())
+            if value == DEFAULT_PARTITION else
+            ColumnStatistics(value, value, 0, (value,))
+        )
+        for name, value in partition
+        if name in ZONE_MAP_COLUMNS and any(
+            field.name == name for field in fields(TABLES[table_name])
+        )
+    }
+    table: pyarrow.Table = parquet_file.read(columns=[
+        name for name in ZONE_MAP_COLUMNS if name in names
+    ])
+    for name in table.column_names:
+        statistics[name] = _get_value_statistics(
+            [value for value in table[name].to_pylist() if value is not None],
+            table[name].null_count
+        )
+    # Decimal degree coordinates are computed from the stored degrees,
+    # minutes and seconds, as they are by `odot_cds.cds501.get_store`
+    for name, prefix in (('lat_dd', 'lat'), ('longtd_dd', 'longtd')):
+        parts: Tuple[str, str, str] = (
+            prefix + '_deg_no',
+            prefix + '_minute_no',
+            prefix + '_sec_no'
+        )
+        if name in ZONE_MAP_COLUMNS and all(part in names for part in parts):
+            parts_table: pyarrow.Table = parquet_file.read(columns=parts)
+            decimal_degrees: numpy.ndarray = spatial.get_decimal_degrees(*(
+                parts_table[part].to_pandas() for part in parts
+            ))
+            values: numpy.ndarray = decimal_degrees[
+                ~numpy.isnan(decimal_degrees)
+            ]
+            statistics[name] = _get_value_statistics(
+                values.tolist(),
+                row_count - len(values)
+            )
+    return WrittenFile(
+        table_name=table_name,
+        partition=partition,
+        path=path,
+        row_count=row_count,
+        statistics=tuple(
+            (name, statistics[name])
+            for name in ZONE_MAP_COLUMNS
+            if name in statistics
+        )
+    )
+
+
+def _scan_files(
+    path: str,
+    excluded_paths: Iterable[str] = ()
+) -> List[WrittenFile]:
+    """
+    Find the files of a dataset on disk (other than `excluded_paths`), and
+    compute their zone maps from their contents. This is used to list the
+    files of a dataset written before manifests were introduced.
+    """
+    excluded: set = set(
+        os.path.normcase(os.path.abspath(excluded_path))
+        for excluded_path in excluded_paths
+    )
+    written_files: List[WrittenFile] = []
+    for table_name in TABLES:
+        table_path: str = os.path.join(path, table_name)
+        for directory, directory_names, file_names in os.walk(table_path):
+            directory_names.sort()
+            partition: Tuple[Tuple[str, str], ...] = tuple(
+                tuple(part.split('=', 1))
+                for part in os.path.relpath(
+                    directory,
+                    table_path
+                ).split(os.sep)
+                if '=' in part
+            )
+            for file_name in sorted(file_names):
+                file_path: str = os.path.join(directory, file_name)
+                if file_name.endswith('.parquet') and os.path.normcase(
+                    os.path.abspath(file_path)
+                ) not in excluded:
+                    written_files.append(
+                        _scan_file(table_name, partition, file_path)
+                    )
+    return written_files
+
+
+def _get_manifest_path(path: str) -> str:
+    return os.path.join(path, MANIFEST)
+
+
+def read_manifest(path: str) -> Optional[List[WrittenFile]]:
+    """
+    Read the files listed in the manifest of a dataset (with absolute paths),
+    or return `None` if the dataset has no manifest (datasets written before
+    manifests were introduced have none)
+    """
+    manifest_path: str = _get_manifest_path(path)
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path, encoding='utf-8') as file:
+        entries: List[Dict[str, Any]] = json.load(file)['files']
+    return [
+        WrittenFile(
+            table_name=entry['table_name'],
+            partition=tuple(
+                (name, value) for name, value in entry['partition']
+            ),
+            path=os.path.join(path, *entry['path'].split('/')),
+            row_count=entry['row_count'],
+            statistics=tuple(
+                (
+                    name,
+                    ColumnStatistics(
+                        minimum=statistics['minimum'],
+                        maximum=statistics['maximum'],
+                        null_count=statistics['null_count'],
+                        values=(
+                            None
+                            if statistics['values'] is None else
+                            tuple(statistics['values'])
+                        )
+                    )
+                )
+                for name, statistics in entry['statistics']
+            )
+        )
+        for entry in entries
+    ]
+
+
+def _write_manifest(path: str, written_files: List[WrittenFile]) -> None:
+    """
+    Add files to the manifest of a dataset. The manifest is replaced
+    atomically, so readers never see a partially written manifest. When the
+    manifest is created, files already in the dataset (written before
+    manifests were introduced) are scanned and listed first.
+    """
+    entries: List[Dict[str, Any]] = []
+    manifest_path: str = _get_manifest_path(path)
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding='utf-8') as file:
+            entries = json.load(file)['files']
+    else:
+        written_files = _scan_files(
+            path,
+            (written_file.path for written_file in written_files)
+        ) + written_files
+    for written_file in written_files:
+        entries.append({
+            'table_name': written_file.table_name,
+            'partition': [list(item) for item in written_file.partition],
+            'path': os.path.relpath(written_file.path, path).replace(
+                os.sep,
+                '/'
+            ),
+            'row_count': written_file.row_count,
+            'statistics': [
+                [
+                    name,
+                    {
+                        'minimum': statistics.minimum,
+                        'maximum': statistics.maximum,
+                        'null_count': statistics.null_count,
+                        'values': (
+                            None
+                            if statistics.values is None else
+                            list(statistics.values)
+                        )
+                    }
+                ]
+                for name, statistics in written_file.statistics
+            ]
+        })
+    with open(manifest_path + '.tmp', 'w', encoding='utf-8') as file:
+        json.dump({'files': entries}, file)
+    os.replace(manifest_path + '.tmp', manifest_path)
+
+
+def _compare(
+    value: object,
+    operator: str,
+    statistics: ColumnStatistics
+) -> bool:
+    """
+    Determine whether any value in a column having the given zone map may
+    satisfy `<column> <operator> <value>`
+    """
+    if statistics.minimum is None:
+        # Null values never satisfy a comparison
+        return False
+    # Compare filter values as the type of the column's values (numbers as
+    # floats, so that fractional values are not truncated). A value which
+    # cannot be converted does not rule out any file.
+    type_: type = (
+        str if isinstance(statistics.minimum, str) else float
+    )
+    try:
+        if operator in ('in', 'not in'):
+            operands: List[object] = [type_(item) for item in value]
+        else:
+            operand: object = type_(value)
+    except (TypeError, ValueError):
+        return True
+    if operator in ('=', '=='):
+        return (
+            operand in statistics.values
+            if statistics.values is not None else
+            statistics.minimum <= operand <= statistics.maximum
+        )
+    if operator == 'in':
+        return any(
+            _compare(item, '=', statistics) for item in operands
+        )
+    if operator == '!=':
+        return not statistics.minimum == statistics.maximum == operand
+    if operator == 'not in':
+        return statistics.values is None or not set(
+            statistics.values
+        ).issubset(operands)
+    if operator == '<':
+        return statistics.minimum < operand
+    if operator == '<=':
+        return statistics.minimum <= operand
+    if operator == '>':
+        return statistics.maximum > operand
+    if operator == '>=':
+        return statistics.maximum >= operand
+    # Other operators are not used for pruning
+    return True
+
+
+def may_match(
+    written_file: WrittenFile,
+    filters: Optional[List[Tuple[str, str, object]]]
+) -> bool:
+    """
+    Determine, from its partition and zone map, whether a file may hold rows
+    matching `filters` (see `read_dataset`). Filters on columns without a
+    zone map, or in disjunctive normal form (a list of lists of filters,
+    any of which may match) are evaluated conservatively.
+    """
+    if not filters:
+        return True
+    if isinstance(filters[0], list):
+        return any(
+            may_match(written_file, conjunction)
+            for conjunction in filters
+        )
+    statistics: Dict[str, ColumnStatistics] = dict(written_file.statistics)
+    for name, value in written_file.partition:
+        if name not in statistics:
+            statistics[name] = (
+                ColumnStatistics(None, None, written_file.row_count, ())
+                if value == DEFAULT_PARTITION else
+                ColumnStatistics(value, value, 0, (value,))
+            )
+    for name, operator, value in filters:
+        if name in statistics and not _compare(
+            value,
+            operator,
+            statistics[name]
+        ):
+            return False
+    return True
+
+
+def _write_table(
+    path: str,
+    table: columnar.Table,
+    partition_values: Tuple[numpy.ndarray, ...],
+    row_group_size: Optional[int]
+) -> List[WrittenFile]:
+    """
+    Write one file to each partition of a table represented in
+    `partition_values`
+    """
+    schema: pyarrow.Schema = get_schema(table.name)
+    partitions: Dict[Tuple[str, ...], numpy.ndarray] = pandas.DataFrame(
+        dict(zip(PARTITION_COLUMNS, partition_values))
+    ).groupby(list(PARTITION_COLUMNS), sort=True).indices
+    written_files: List[WrittenFile] = []
+    dictionary_columns: List[str] = [
+        field_.name
+        for field_ in schema
+        if pyarrow.types.is_dictionary(field_.type)
+    ]
+    for key, indices in sorted(partitions.items()):
+        partition: Tuple[Tuple[str, str], ...] = tuple(
+            zip(PARTITION_COLUMNS, key)
+        )
+        directory: str = os.path.join(
+            path,
+            table.name,
+            *('%s=%s' % item for item in partition)
+        )
+        os.makedirs(directory, exist_ok=True)
+        partition_table: columnar.Table = table.take(indices)
+        arrow_table: pyarrow.Table = pyarrow.Table.from_arrays(
+            [
+                _get_arrow_array(partition_table[field_.name], field_.type)
+                for field_ in schema
+            ],
+            schema=schema
+        )
+        file_path: str = os.path.join(
+            directory,
+            'part-%s.parquet' % uuid4().hex
+        )
+        pyarrow.parquet.write_table(
+            arrow_table,
+            file_path,
+            row_group_size=row_group_size,
+            use_dictionary=dictionary_columns,
+            write_statistics=True
+        )
+        written_files.append(WrittenFile(
+            table_name=table.name,
+            partition=partition,
+            path=file_path,
+            row_count=len(indices),
+            statistics=tuple(
+                (name, _get_statistics(partition_table[name]))
+                for name in ZONE_MAP_COLUMNS
+                if name in partition_table
+            )
+        ))
+    return written_files
+
+
+def write_dataset(
+    data: Union[
+        columnar.Store,
+        cds501.Source,
+        Tuple[
+            List[cds501.Crash],
+            List[cds501.Vhcl],
+            List[cds501.Partic]
+        ],
+        Iterable[cds501.CDS501]
+    ],
+    path: str,
+    row_group_size: Optional[int] = None
+) -> List[WrittenFile]:
+    """
+    Append a parsed CDS501 extract to a Hive-partitioned Parquet dataset.
+    New files are added to each affected partition, and existing files are
+    never rewritten, so extracts can be appended incrementally. The new
+    files, and their zone maps, are added to the manifest of the dataset.
+    Returns a list of the files written.
+
+    Parameters:
+
+    - data (odot_cds.columnar.Store): A columnar store (as returned by
+      `odot_cds.cds501.get_data_frames(..., store=True)`), or any input
+      accepted by `odot_cds.cds501.get_data_frames`.
+
+    - path (str): The root directory of the dataset.
+
+    - row_group_size (int): The maximum number of rows per row group (the
+      default is determined by `pyarrow`). Min/max statistics are written
+      for each row group.
+    """
+    store: columnar.Store = (
+        data
+        if isinstance(data, columnar.Store) else
+        cds501.get_store(data)
+    )
+    crash_partition_values: Tuple[numpy.ndarray, ...] = (
+        _get_partition_values(store.crash)
+    )
+    written_files: List[WrittenFile] = _write_table(
+        path,
+        store.crash,
+        crash_partition_values,
+        row_group_size
+    )
+    for table in (store.vhcl, store.partic):
+        written_files += _write_table(
+            path,
+            table,
+            _get_child_partition_values(
+                store.crash,
+                crash_partition_values,
+                table
+            ),
+            row_group_size
+        )
+    _write_manifest(path, written_files)
+    return written_files
+
+
+def get_files(
+    path: str,
+    table_name: Optional[str] = None,
+    filters: Optional[List[Tuple[str, str, object]]] = None
+) -> List[WrittenFile]:
+    """
+    Get the files of a dataset which may hold rows matching `filters`,
+    according to its manifest (see `may_match`).
+
+    Parameters:
+
+    - path (str): The root directory of the dataset.
+
+    - table_name (str): "crash", "vhcl" or "partic" (by default, files of
+      every table are returned).
+
+    - filters ([(str, str, object)]): See `read_dataset`. Filters may also
+      reference `lat_dd` and `longtd_dd`, which are recorded in zone maps
+      (but not stored in files), to find the files holding crashes within
+      a bounding box.
+    """
+    written_files: Optional[List[WrittenFile]] = read_manifest(path)
+    if written_files is None:
+        raise FileNotFoundError(_get_manifest_path(path))
+    return [
+        written_file
+        for written_file in written_files
+        if (
+            table_name is None or
+            written_file.table_name == table_name
+        ) and may_match(written_file, filters)
+    ]
+
+
+def _get_filter_names(filters: Optional[List[Any]]) -> List[str]:
+    """
+    Get the names of the columns referenced by filters in the form accepted
+    by `read_dataset`
+    """
+    if not filters:
+        return []
+    if isinstance(filters[0], list):
+        return [
+            name
+            for conjunction in filters
+            for name in _get_filter_names(conjunction)
+        ]
+    return [filter_[0] for filter_ in filters]
+
+
+def _get_row_filters(
+    filters: Optional[List[Any]],
+    names: Iterable[str]
+) -> Optional[List[Any]]:
+    """
+    Remove filters on columns among `names` (computed columns, which cannot
+    be filtered while files are read) from filters in the form accepted by
+    `read_dataset`. Returns `None` if no filters remain (or if a conjunction
+    of filters in disjunctive normal form has none, and so matches every
+    row).
+    """
+    if not filters:
+        return None
+    if isinstance(filters[0], list):
+        conjunctions: List[Optional[List[Any]]] = [
+            _get_row_filters(conjunction, names)
+            for conjunction in filters
+        ]
+        if any(conjunction is None for conjunction in conjunctions):
+            return None
+        return conjunctions
+    return [
+        filter_ for filter_ in filters if filter_[0] not in names
+    ] or None
+
+
+def read_dataset(
+    path: str,
+    table_name: str = 'crash',
+    columns: Optional[Sequence[str]] = None,
+    filters: Optional[List[Tuple[str, str, object]]] = None
+) -> pandas.DataFrame:
+    """
+    Read one table from a dataset written by `write_dataset` as a data frame.
+
+    Parameters:
+
+    - path (str): The root directory of the dataset.
+
+    - table_name (str): "crash", "vhcl" or "partic".
+
+    - columns ([str]): The columns to read (all stored columns are read by
+      default). The columns of the "crash" table may include the computed
+      columns `lat_dd` and `longtd_dd` (see `COMPUTED_COLUMNS`).
+
+    - filters ([(str, str, object)]): Filters in the form accepted by
+      `pyarrow.parquet.read_table`, for example:
+      `[('crash_yr_no', '=', '2018'), ('cnty_id', 'in', ('01', '02'))]`.
+      Filters on partition columns skip entire partitions, and filters on
+      other columns skip row groups using their statistics. If the dataset
+      has a manifest, files whose zone maps cannot match the filters are
+      skipped without being opened. Filters on the computed columns
+      `lat_dd` and `longtd_dd` (of the "crash" table) are applied once
+      their values are computed. A `ValueError` is raised if filters
+      reference any other column which the table does not have.
+    """
+    partition_schema: pyarrow.Schema = pyarrow.schema([
+        pyarrow.field(name, pyarrow.string())
+        for name in PARTITION_COLUMNS
+    ])
+    partitioning: pyarrow.dataset.Partitioning = (
+        pyarrow.dataset.partitioning(partition_schema, flavor='hive')
+    )
+    schema: pyarrow.Schema = pyarrow.unify_schemas([
+        get_schema(table_name),
+        partition_schema
+    ])
+    computed_columns: Dict[str, Tuple[str, str, str]] = {
+        name: parts
+        for name, parts in COMPUTED_COLUMNS.items()
+        if all(part in schema.names for part in parts)
+    }
+    filter_names: List[str] = _get_filter_names(filters)
+    unknown_names: List[str] = [
+        name
+        for name in filter_names + list(columns or ())
+        if name not in schema.names and name not in computed_columns
+    ]
+    if unknown_names:
+        raise ValueError(
+            'The %s table has no column named %s' % (
+                repr(table_name),
+                ', '.join(sorted(set(map(repr, unknown_names))))
+            )
+        )
+    # Computed columns which are filtered, or requested
+    computed_names: List[str] = [
+        name
+        for name in computed_columns
+        if name in filter_names or (columns is not None and name in columns)
+    ]
+    read_columns: Optional[List[str]] = None
+    if columns is not None:
+        # Columns needed to compute requested or filtered columns, and (if
+        # rows are filtered once these are computed) filtered columns, are
+        # read as well
+        read_columns = [name for name in columns if name in schema.names]
+        for name in computed_names:
+            read_columns += computed_columns[name]
+        if any(name in computed_columns for name in filter_names):
+            read_columns += filter_names
+        read_columns = [
+            name
+            for index, name in enumerate(read_columns)
+            if name in schema.names and name not in read_columns[:index]
+        ]
+    row_filters: Optional[List[Any]] = _get_row_filters(
+        filters,
+        computed_columns
+    )
+    table: pyarrow.Table
+    if not os.path.exists(_get_manifest_path(path)):
+        table = pyarrow.parquet.read_table(
+            os.path.join(path, table_name),
+            columns=read_columns,
+            filters=row_filters,
+            partitioning=partitioning
+        )
+    else:
+        file_paths: List[str] = sorted(
+            written_file.path
+            for written_file in get_files(path, table_name, filters)
+        )
+        table = pyarrow.dataset.dataset(
+            file_paths,
+            schema=schema,
+            format='parquet',
+            partitioning=partitioning,
+            partition_base_dir=os.path.join(path, table_name)
+        ).to_table(
+            columns=read_columns,
+            filter=(
+                None
+                if not row_filters else
+                _filters_to_expression(row_filters)
+            )
+        )
+    if not computed_names:
+        return table.to_pandas()
+    for name in computed_names:
+        table = table.append_column(
+            name,
+            pyarrow.array(
+                spatial.get_decimal_degrees(*(
+                    table[part].to_pandas()
+                    for part in computed_columns[name]
+                )),
+                from_pandas=True
+            )
+        )
+    if row_filters != filters:
+        # Rows are filtered once computed columns have their values
+        table = pyarrow.dataset.dataset(table).to_table(
+            filter=_filters_to_expression(filters)
+        )
+    return table.select(
+        list(columns) if columns is not None else [
+            name for name in table.column_names if name in schema.names
+        ]
+    ).to_pandas()
@@ -0,0 +1,304 @@
+"""
+This module plans CDS501 requests of a consistent size. Rather than
+requesting every county one quarter at a time (some such requests are empty,
+while others are too large to complete), the number of records in each month
+is first estimated from a cube of crash counts (see `odot_cds.cube`) or from
+monthly counts (such as those of a "CDS280" summary report). Consecutive
+months are then grouped into windows estimated to hold about `target_rows`
+records: windows are widened for sparse rural counties, and narrowed (to
+fractions of a month, if need be) for populous counties:
+
+>>> summary = cube.Cube.read('cube.csv')
+>>> requests = schedule.plan(summary, ('26', '34'), date(2015, 1, 1),
+...                          date(2019, 12, 31))
+>>> responses = [request.extract(client.connect()) for request in requests]
+"""
+import calendar
+import math
+from dataclasses import dataclass
+from datetime import date, timedelta
+from http.client import HTTPResponse
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import pandas
+
+from . import cube
+from .client import Client, Extract, RoadType
+
+# The number of CDS501 records (crash, vehicle and participant rows) which
+# each request should return
+TARGET_ROWS: int = 20000
+
+# A (year, month) tuple
+Month = Tuple[int, int]
+
+
+@dataclass(frozen=True)
+class Request:
+    """
+    The parameters of one "All Roads" CDS501 request, and the number of
+    records it is estimated to return.
+    """
+
+    begin_date: date
+    end_date: date
+    county: str = ''
+    city: str = ''
+    query_type: str = 'rdoSumQueryTypeALL'
+    estimated_rows: float = 0.0
+
+    @property
+    def jurisdiction(self) -> str:
+        return (
+            'rdoSumJurisdictionCITY'
+            if self.city else
+            'rdoSumJurisdictionCNTY'
+        )
+
+    def extract(
+        self,
+        client: Client,
+        extract: Extract = Extract.CDS501
+    ) -> HTTPResponse:
+        """
+        Submit this request using `odot_cds.client.Client.extract`
+        """
+        return client.extract(
+            begin_date=self.begin_date,
+            end_date=self.end_date,
+            road_type=RoadType.ALL,
+            extract=extract,
+            jurisdiction=self.jurisdiction,
+            county=self.county,
+            city=self.city,
+            query_type=self.query_type
+        )
+
+
+def _get_months(begin_date: date, end_date: date) -> List[Month]:
+    """
+    Get the months from `begin_date` through `end_date`
+    """
+    return [
+        (index // 12, index % 12 + 1)
+        for index in range(
+            begin_date.year * 12 + begin_date.month - 1,
+            end_date.year * 12 + end_date.month
+        )
+    ]
+
+
+def get_monthly_rows(
+    summary: cube.Cube,
+    county: Optional[str] = None,
+    city: Optional[Union[str, int]] = None,
+    query_type: str = 'rdoSumQueryTypeALL'
+) -> pandas.Series:
+    """
+    Estimate the number of CDS501 records in each month (indexed by
+    `(year, month)` tuples) from the crashes of a cube, as one crash row,
+    plus a row for each vehicle and person involved. Months between the
+    first and last months of the cube having no crashes are estimated to
+    have no records.
+
+    Parameters:
+
+    - summary (odot_cds.cube.Cube): Crash counts.
+
+    - county (str): A county ID (`cnty_id`).
+
+    - city (str|int): A city section ID (`city_sect_id`).
+
+    - query_type (str): A CDS summary report query type, such as
+      "rdoSumQueryTypeALL" or "rdoSumQueryTypeSTATE".
+    """
+    data: pandas.DataFrame = summary.data
+    if not len(data):
+        return pandas.Series(dtype=float)
+    known_months: pandas.Series = (
+        data['crash_yr_no'] * 12 + data['crash_mo_no'] - 1
+    )
+    known_months = known_months[data['crash_mo_no'] > 0]
+    selected: pandas.DataFrame = summary.select(
+        county=county,
+        city=city,
+        road_type=query_type
+    )
+    rows: pandas.Series = (
+        selected['crash_cnt'] +
+        selected['tot_vhcl_cnt'] +
+        selected['tot_per_invlv_cnt']
+    ).groupby(
+        [selected['crash_yr_no'], selected['crash_mo_no']]
+    ).sum().astype(float)
+    months: List[Month] = [
+        (int(index // 12), int(index % 12 + 1))
+        for index in range(
+            int(known_months.min()),
+            int(known_months.max()) + 1
+        )
+    ]
+    return pandas.Series(
+        [rows.get(month, 0.0) for month in months],
+        index=pandas.MultiIndex.from_tuples(months),
+        dtype=float
+    )
+
+
+def get_windows(
+    monthly_rows: Union[pandas.Series, Dict[Month, float]],
+    begin_date: date,
+    end_date: date,
+    target_rows: float = TARGET_ROWS,
+    maximum_months: Optional[int] = None
+) -> List[Tuple[date, date, float]]:
+    """
+    Divide the dates from `begin_date` through `end_date` into windows, each
+    estimated to hold no more than `target_rows` records (unless that of a
+    single day exceeds it), and as few windows as possible. Returns a list of
+    `(begin_date, end_date, estimated_rows)` tuples.
+
+    Parameters:
+
+    - monthly_rows (pandas.Series|{(int, int): float}): The estimated number
+      of records in each month, indexed by `(year, month)` tuples, such as is
+      returned by `get_monthly_rows`. Months for which there is no estimate
+      are estimated to hold the mean of the months for which there is one.
+
+    - begin_date (datetime.date): The first day of the first window.
+
+    - end_date (datetime.date): The last day of the last window.
+
+    - target_rows (float): The number of records each window should hold.
+
+    - maximum_months (int): If provided, windows span no more than this many
+      months.
+    """
+    if isinstance(monthly_rows, pandas.Series):
+        monthly_rows = {
+            (int(year), int(month)): float(rows)
+            for (year, month), rows in monthly_rows.items()
+        }
+    default: float = (
+        sum(monthly_rows.values()) / len(monthly_rows)
+        if monthly_rows else
+        0.0
+    )
+    # Each month is divided into equal parts holding no more than
+    # `target_rows` records, which are then merged greedily
+    parts: List[Tuple[date, date, float]] = []
+    for year, month in _get_months(begin_date, end_date):
+        first_day: date = max(date(year, month, 1), begin_date)
+        last_day: date = min(
+            date(year, month, calendar.monthrange(year, month)[1]),
+            end_date
+        )
+        day_count: int = (last_day - first_day).days + 1
+        rows: float = monthly_rows.get((year, month), default) * (
+            day_count / calendar.monthrange(year, month)[1]
+        )
+        part_count: int = min(
+            max(math.ceil(rows / target_rows), 1),
+            day_count
+        )
+        # Parts differ in length by up to a day, so the longest may need to
+        # be shortened further
+        while part_count < day_count and (
+            rows * math.ceil(day_count / part_count) / day_count >
+            target_rows
+        ):
+            part_count += 1
+        for part in range(part_count):
+            part_begin: int = part * day_count // part_count
+            part_end: int = (part + 1) * day_count // part_count
+            parts.append((
+                first_day + timedelta(days=part_begin),
+                first_day + timedelta(days=part_end - 1),
+                rows * (part_end - part_begin) / day_count
+            ))
+    windows: List[Tuple[date, date, float]] = []
+    for part_begin_date, part_end_date, rows in parts:
+        if windows:
+            window_begin_date, _, window_rows = windows[-1]
+            if (
+                window_rows + rows <= target_rows and (
+                    maximum_months is None or
+                    len(_get_months(window_begin_date, part_end_date)) <=
+                    maximum_months
+                )
+            ):
+                windows[-1] = (
+                    window_begin_date,
+                    part_end_date,
+                    window_rows + rows
+                )
+                continue
+        windows.append((part_begin_date, part_end_date, rows))
+    return windows
+
+
+def plan(
+    summary: cube.Cube,
+    counties: Iterable[str],
+    begin_date: date,
+    end_date: date,
+    target_rows: float = TARGET_ROWS,
+    maximum_months: Optional[int] = None,
+    query_type: str = 'rdoSumQueryTypeALL',
+    skip_empty: bool = True
+) -> List[Request]:
+    """
+    Plan CDS501 requests covering every crash in each of `counties` from
+    `begin_date` through `end_date`, each estimated to return about
+    `target_rows` records (see `get_windows`).
+
+    Parameters:
+
+    - summary (odot_cds.cube.Cube): Crash counts, from which the number of
+      records in each county and month is estimated.
+
+    - counties ([str]): County IDs (`cnty_id`), such as "26".
+
+    - begin_date (datetime.date): The first day for which to request crashes.
+
+    - end_date (datetime.date): The last day for which to request crashes.
+
+    - target_rows (float): The number of records each request should return.
+
+    - maximum_months (int): If provided, requests span no more than this
+      many months.
+
+    - query_type (str): A CDS summary report query type, such as
+      "rdoSumQueryTypeALL" or "rdoSumQueryTypeSTATE".
+
+    - skip_empty (bool): If `True`, windows in which the cube has no crashes
+      are not requested (months outside of those in the cube are always
+      requested).
+    """
+    requests: List[Request] = []
+    for county in counties:
+        monthly_rows: pandas.Series = get_monthly_rows(
+            summary,
+            county=county,
+            query_type=query_type
+        )
+        for window_begin_date, window_end_date, rows in get_windows(
+            monthly_rows,
+            begin_date,
+            end_date,
+            target_rows,
+            maximum_months
+        ):
+            if skip_empty and not rows and all(
+                month in monthly_rows.index
+                for month in _get_months(window_begin_date, window_end_date)
+            ):
+                continue
+            requests.append(Request(
+                begin_date=window_begin_date,
+                end_date=window_end_date,
+                county=county,
+                query_type=query_type,
+                estimated_rows=rows
+            ))
+    return requests
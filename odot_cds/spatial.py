@@ -0,0 +1,372 @@
+"""
+This module converts CDS501 crash coordinates from degrees, minutes and
+seconds to decimal degrees, and indexes crashes in a uniform grid so that
+bounding box, radius and nearest-neighbor queries can be answered without
+scanning every crash:
+
+>>> crash, vhcl, partic = cds501.get_store('CDS501.txt')
+>>> index = spatial.GridIndex.from_table(crash)
+>>> crash.take(index.query_radius(45.5152, -122.6784, 1000))
+"""
+import math
+from dataclasses import dataclass
+from typing import List, Optional, Tuple, Union
+
+import numpy
+import pandas
+
+from . import columnar
+
+# The mean radius of the Earth, in meters
+EARTH_RADIUS: float = 6371008.8
+
+# The length of one degree of latitude (on a sphere of radius
+# `EARTH_RADIUS`, as distances are measured), in meters
+DEGREE_LENGTH: float = EARTH_RADIUS * math.pi / 180
+
+Array = Union[columnar.Column, pandas.Series, numpy.ndarray]
+
+
+def get_decimal_degrees(
+    degrees: Array,
+    minutes: Array,
+    seconds: Array
+) -> numpy.ndarray:
+    """
+    Convert arrays of degrees, minutes and seconds (such as the `lat_deg_no`,
+    `lat_minute_no` and `lat_sec_no` columns) to decimal degrees. The sign of
+    each result is that of its degrees, and the result is `NaN` if any part
+    is null.
+    """
+    degrees = columnar.get_floats(degrees)
+    return numpy.copysign(
+        numpy.abs(degrees) +
+        columnar.get_floats(minutes) / 60 +
+        columnar.get_floats(seconds) / 3600,
+        degrees
+    )
+
+
+def get_distances(
+    latitude: float,
+    longitude: float,
+    latitudes: numpy.ndarray,
+    longitudes: numpy.ndarray
+) -> numpy.ndarray:
+    """
+    Get the great-circle (haversine) distance, in meters, from one point to
+    each of an array of points
+    """
+    latitude_radians: float = numpy.radians(latitude)
+    latitudes_radians: numpy.ndarray = numpy.radians(latitudes)
+    haversine: numpy.ndarray = (
+        numpy.sin((latitudes_radians - latitude_radians) / 2) ** 2 +
+        numpy.cos(latitude_radians) * numpy.cos(latitudes_radians) *
+        numpy.sin(numpy.radians(longitudes - longitude) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS * numpy.arcsin(numpy.sqrt(haversine.clip(0, 1)))
+
+
+@dataclass
+class GridIndex:
+    """
+    A uniform grid of points. Points are sorted by cell (row-major), and
+    `offsets` holds the position in `order` of the first point in each cell,
+    so the points in any run of adjacent cells in a row form one slice.
+    Points with null coordinates are not indexed. Query results are the
+    positions of points in the arrays from which the index was built (such
+    as the rows of a crash table), in ascending order.
+    """
+
+    latitudes: numpy.ndarray
+    longitudes: numpy.ndarray
+    cell_size: float
+    minimum_latitude: float
+    minimum_longitude: float
+    row_count: int
+    column_count: int
+    order: numpy.ndarray
+    offsets: numpy.ndarray
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    @classmethod
+    def from_arrays(
+        cls,
+        latitudes: Array,
+        longitudes: Array,
+        cell_size: float = 0.01
+    ) -> 'GridIndex':
+        """
+        Build an index from arrays of latitudes and longitudes, in decimal
+        degrees.
+
+        Parameters:
+
+        - latitudes (numpy.ndarray): Latitudes.
+
+        - longitudes (numpy.ndarray): Longitudes.
+
+        - cell_size (float): The width and height of each cell, in degrees.
+        """
+        latitudes = columnar.get_floats(latitudes)
+        longitudes = columnar.get_floats(longitudes)
+        indexed: numpy.ndarray = numpy.flatnonzero(
+            ~(numpy.isnan(latitudes) | numpy.isnan(longitudes))
+        )
+        minimum_latitude: float = (
+            float(latitudes[indexed].min()) if len(indexed) else 0.0
+        )
+        minimum_longitude: float = (
+            float(longitudes[indexed].min()) if len(indexed) else 0.0
+        )
+        rows: numpy.ndarray = (
+            (latitudes[indexed] - minimum_latitude) // cell_size
+        ).astype(numpy.int64)
+        columns: numpy.ndarray = (
+            (longitudes[indexed] - minimum_longitude) // cell_size
+        ).astype(numpy.int64)
+        row_count: int = int(rows.max()) + 1 if len(indexed) else 0
+        column_count: int = int(columns.max()) + 1 if len(indexed) else 0
+        cells: numpy.ndarray = rows * column_count + columns
+        cell_order: numpy.ndarray = numpy.argsort(cells, kind='stable')
+        return cls(
+            latitudes=latitudes,
+            longitudes=longitudes,
+            cell_size=cell_size,
+            minimum_latitude=minimum_latitude,
+            minimum_longitude=minimum_longitude,
+            row_count=row_count,
+            column_count=column_count,
+            order=indexed[cell_order],
+            offsets=numpy.searchsorted(
+                cells[cell_order],
+                numpy.arange(row_count * column_count + 1)
+            )
+        )
+
+    @classmethod
+    def from_table(
+        cls,
+        table: Union[columnar.Table, pandas.DataFrame],
+        cell_size: float = 0.01
+    ) -> 'GridIndex':
+        """
+        Build an index over the rows of a crash table or data frame having
+        `lat_dd` and `longtd_dd` columns (as in stores returned by
+        `odot_cds.cds501.get_store`), or else the degrees, minutes and
+        seconds columns from which these are computed.
+
+        Parameters:
+
+        - table (odot_cds.columnar.Table|pandas.DataFrame): Crashes.
+
+        - cell_size (float): The width and height of each cell, in degrees.
+        """
+        if 'lat_dd' in table and 'longtd_dd' in table:
+            return cls.from_arrays(
+                table['lat_dd'],
+                table['longtd_dd'],
+                cell_size
+            )
+        return cls.from_arrays(
+            get_decimal_degrees(
+                table['lat_deg_no'],
+                table['lat_minute_no'],
+                table['lat_sec_no']
+            ),
+            get_decimal_degrees(
+                table['longtd_deg_no'],
+                table['longtd_minute_no'],
+                table['longtd_sec_no']
+            ),
+            cell_size
+        )
+
+    def _get_candidates(
+        self,
+        minimum_latitude: float,
+        minimum_longitude: float,
+        maximum_latitude: float,
+        maximum_longitude: float
+    ) -> numpy.ndarray:
+        """
+        Get the points in all cells overlapping a bounding box
+        """
+        if not len(self):
+            return self.order
+        first_row: int = max(
+            int((minimum_latitude - self.minimum_latitude) // self.cell_size),
+            0
+        )
+        last_row: int = min(
+            int((maximum_latitude - self.minimum_latitude) // self.cell_size),
+            self.row_count - 1
+        )
+        first_column: int = max(
+            int(
+                (minimum_longitude - self.minimum_longitude) // self.cell_size
+            ),
+            0
+        )
+        last_column: int = min(
+            int(
+                (maximum_longitude - self.minimum_longitude) // self.cell_size
+            ),
+            self.column_count - 1
+        )
+        if first_row > last_row or first_column > last_column:
+            return self.order[:0]
+        slices: List[numpy.ndarray] = [
+            self.order[
+                self.offsets[row * self.column_count + first_column]:
+                self.offsets[row * self.column_count + last_column + 1]
+            ]
+            for row in range(first_row, last_row + 1)
+        ]
+        return numpy.concatenate(slices)
+
+    def query_bbox(
+        self,
+        minimum_latitude: float,
+        minimum_longitude: float,
+        maximum_latitude: float,
+        maximum_longitude: float
+    ) -> numpy.ndarray:
+        """
+        Get the positions of all points within a bounding box (inclusive)
+        """
+        candidates: numpy.ndarray = self._get_candidates(
+            minimum_latitude,
+            minimum_longitude,
+            maximum_latitude,
+            maximum_longitude
+        )
+        latitudes: numpy.ndarray = self.latitudes[candidates]
+        longitudes: numpy.ndarray = self.longitudes[candidates]
+        return numpy.sort(candidates[
+            (latitudes >= minimum_latitude) &
+            (latitudes <= maximum_latitude) &
+            (longitudes >= minimum_longitude) &
+            (longitudes <= maximum_longitude)
+        ])
+
+    def _get_radius_candidates(
+        self,
+        latitude: float,
+        longitude: float,
+        radius: float
+    ) -> numpy.ndarray:
+        # The angle subtended by `radius` at the center of the sphere on
+        # which distances are measured (with a margin for rounding errors)
+        angle: float = radius / EARTH_RADIUS * (1 + 1e-9)
+        latitude_delta: float = math.degrees(angle)
+        # The greatest difference in longitude between the point and a point
+        # within `radius` of it (every longitude, if a pole is within range)
+        longitude_delta: float = 180.0
+        if abs(latitude) + latitude_delta < 90.0:
+            longitude_delta = math.degrees(math.asin(min(
+                math.sin(angle) / math.cos(math.radians(latitude)),
+                1.0
+            )))
+        return self._get_candidates(
+            latitude - latitude_delta,
+            longitude - longitude_delta,
+            latitude + latitude_delta,
+            longitude + longitude_delta
+        )
+
+    def query_radius(
+        self,
+        latitude: float,
+        longitude: float,
+        radius: float
+    ) -> numpy.ndarray:
+        """
+        Get the positions of all points within `radius` meters of a point
+        """
+        candidates: numpy.ndarray = self._get_radius_candidates(
+            latitude,
+            longitude,
+            radius
+        )
+        return numpy.sort(candidates[
+            get_distances(
+                latitude,
+                longitude,
+                self.latitudes[candidates],
+                self.longitudes[candidates]
+            ) <= radius
+        ])
+
+    def query_nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        k: int = 1,
+        maximum_radius: Optional[float] = None
+    ) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """
+        Get the positions of the `k` points nearest to a point, and their
+        distances in meters, ordered by distance. The search starts in the
+        cells around the point and widens until `k` points are found.
+
+        Parameters:
+
+        - latitude (float): The latitude of the point.
+
+        - longitude (float): The longitude of the point.
+
+        - k (int): The number of points to find.
+
+        - maximum_radius (float): If provided, only points within this
+          distance (in meters) are returned.
+        """
+        k = min(k, len(self))
+        radius: float = self.cell_size * DEGREE_LENGTH
+        # Searching a radius greater than this covers every point (the
+        # distance to the farthest corner of the grid, with a margin)
+        limit: float = (
+            1.01 * get_distances(
+                latitude,
+                longitude,
+                numpy.array([
+                    self.minimum_latitude,
+                    self.minimum_latitude +
+                    self.row_count * self.cell_size
+                ]).repeat(2),
+                numpy.array([
+                    self.minimum_longitude,
+                    self.minimum_longitude +
+                    self.column_count * self.cell_size
+                ] * 2)
+            ).max()
+            if len(self) else
+            0.0
+        )
+        if maximum_radius is not None:
+            limit = min(limit, maximum_radius)
+        while True:
+            radius = min(radius, limit)
+            candidates: numpy.ndarray = self._get_radius_candidates(
+                latitude,
+                longitude,
+                radius
+            )
+            distances: numpy.ndarray = get_distances(
+                latitude,
+                longitude,
+                self.latitudes[candidates],
+                self.longitudes[candidates]
+            )
+            within: numpy.ndarray = distances <= radius
+            # Points beyond `radius` may be nearer than candidates outside
+            # the searched cells, so only points within `radius` are final
+            if within.sum() >= k or radius >= limit:
+                candidates, distances = candidates[within], distances[within]
+                nearest: numpy.ndarray = numpy.lexsort(
+                    (candidates, distances)
+                )[:k]
+                return candidates[nearest], distances[nearest]
+            radius *= 2
@@ -0,0 +1,519 @@
+"""
+This module reads the Safety Priority Index System (SPIS) layers published by
+ODOT (such as "sources/tdb/trandata/GIS_data/Safety/spis_2014_16.zip"), and
+computes SPIS-style scores from parsed CDS501 crashes.
+
+SPIS scores state highway segments 0.10 miles long, at every 0.01 mile along
+each route (a "sliding window"), using three years of crashes. Segments with
+at least three crashes, or at least one fatal crash, are scored from three
+indicators, each of which is scaled logarithmically against the segment with
+the greatest value:
+
+- Frequency (25 points): The number of crashes.
+
+- Rate (25 points): Crashes per million vehicle miles traveled.
+
+- Severity (50 points): 100 points for each fatal or serious injury ("A")
+  crash, 10 points for each moderate ("B") or minor ("C") injury crash, and
+  1 point for each property damage only crash.
+
+>>> crash, vhcl, partic = cds501.get_store('CDS501.txt')
+>>> scores = spis.get_scores(crash, years=(2016, 2017, 2018))
+>>> published = spis.read('spis_2014_16.zip')
+"""
+import os
+import zipfile
+from typing import (
+    Callable, Dict, List, Optional, Sequence, Tuple, Union
+)
+
+import numpy
+import pandas
+
+from . import columnar, lrs
+
+# The length of each scored segment, in miles
+SEGMENT_LENGTH: float = 0.1
+
+# The distance between the start of each scored segment, in miles
+STEP: float = 0.01
+
+# The number of years of crashes scored at once
+WINDOW_YEARS: int = 3
+
+# Segments with fewer crashes than this (and no fatal crash) are not scored
+MINIMUM_CRASHES: int = 3
+
+# Severity classes, in order of precedence, and the fields of the crash table
+# counting participants having the corresponding injury (a crash is classed
+# by its most severe injury, and crashes having no injury are
+# "property damage only")
+SEVERITY_FIELDS: Dict[str, Optional[str]] = {
+    'fatal': 'tot_fatal_cnt',
+    'inj_lvl_a': 'tot_inj_lvl_a_cnt',
+    'inj_lvl_b': 'tot_inj_lvl_b_cnt',
+    'inj_lvl_c': 'tot_inj_lvl_c_cnt',
+    'pdo': None
+}
+
+# The severity value of one crash in each severity class
+SEVERITY_WEIGHTS: Dict[str, int] = {
+    'fatal': 100,
+    'inj_lvl_a': 100,
+    'inj_lvl_b': 10,
+    'inj_lvl_c': 10,
+    'pdo': 1
+}
+
+# The maximum points awarded by each indicator
+FREQUENCY_POINTS: float = 25.0
+RATE_POINTS: float = 25.0
+SEVERITY_POINTS: float = 50.0
+
+# Shapefile shape types holding a single point
+_POINT_SHAPE_TYPES: Tuple[int, ...] = (1, 11, 21)
+
+# The encoding of DBF text fields, when a ".cpg" file does not specify one
+_DBF_ENCODING: str = 'latin-1'
+
+# Given a route and the start of each segment on the route (in miles),
+# returns the average daily traffic of each segment
+DailyVolumes = Callable[[Tuple[str, ...], numpy.ndarray], numpy.ndarray]
+
+
+def _get_dbf_column(
+    values: numpy.ndarray,
+    field_type: str,
+    decimal_count: int,
+    encoding: str
+) -> Union[numpy.ndarray, pandas.api.extensions.ExtensionArray]:
+    """
+    Convert the (fixed width) values of one DBF field
+    """
+    text: numpy.ndarray = numpy.char.strip(
+        numpy.char.decode(values, encoding)
+    )
+    if field_type in 'NF':
+        numbers: pandas.Series = pandas.to_numeric(
+            pandas.Series(text),
+            errors='coerce'
+        )
+        if field_type == 'N' and not decimal_count:
+            return numbers.astype('Int64').array
+        return numbers.to_numpy(dtype=numpy.float64, na_value=numpy.nan)
+    if field_type == 'D':
+        return pandas.to_datetime(
+            pandas.Series(text),
+            format='%Y%m%d',
+            errors='coerce'
+        ).array
+    if field_type == 'L':
+        upper: numpy.ndarray = numpy.char.upper(text)
+        return pandas.array(
+            numpy.where(
+                numpy.isin(upper, ('T', 'Y')),
+                True,
+                numpy.where(numpy.isin(upper, ('F', 'N')), False, None)
+            ),
+            dtype='boolean'
+        )
+    strings: numpy.ndarray = text.astype(object)
+    strings[text == ''] = None
+    return strings
+
+
+def read_dbf(data: bytes, encoding: Optional[str] = None) -> pandas.DataFrame:
+    """
+    Parse a dBASE (".dbf") table, such as the attribute table of a
+    shapefile. Records are parsed all at once, as fixed-width fields, and
+    deleted records are skipped.
+
+    Parameters:
+
+    - data (bytes): The contents of a ".dbf" file.
+
+    - encoding (str): The encoding of text fields (by default, "latin-1").
+    """
+    record_count: int = int.from_bytes(data[4:8], 'little')
+    header_length: int = int.from_bytes(data[8:10], 'little')
+    record_length: int = int.from_bytes(data[10:12], 'little')
+    field_names: List[str] = []
+    field_types: List[str] = []
+    field_lengths: List[int] = []
+    decimal_counts: List[int] = []
+    # Field descriptors are 32 bytes each, and are terminated by 0x0D
+    position: int
+    for position in range(32, header_length - 1, 32):
+        if data[position] == 0x0D:
+            break
+        field_names.append(
+            data[position:position + 11].split(b'\0')[0].decode('ascii')
+        )
+        field_types.append(chr(data[position + 11]))
+        field_lengths.append(data[position + 16])
+        decimal_counts.append(data[position + 17])
+    records: numpy.ndarray = numpy.frombuffer(
+        data,
+        dtype=numpy.dtype({
+            'names': ['_deleted'] + field_names,
+            'formats': ['S1'] + ['S%s' % length for length in field_lengths],
+            'itemsize': record_length
+        }),
+        count=record_count,
+        offset=header_length
+    )
+    records = records[records['_deleted'] != b'*']
+    return pandas.DataFrame({
+        field_name.lower(): _get_dbf_column(
+            records[field_name],
+            field_type,
+            decimal_count,
+            encoding or _DBF_ENCODING
+        )
+        for field_name, field_type, decimal_count in zip(
+            field_names,
+            field_types,
+            decimal_counts
+        )
+    })
+
+
+def _get_record_offsets(shp: bytes, shx: Optional[bytes]) -> numpy.ndarray:
+    """
+    Get the byte offset of each record in a ".shp" file, from its ".shx"
+    index if available
+    """
+    if shx is not None:
+        # Offsets are big-endian, and are counted in 16-bit words
+        return numpy.frombuffer(
+            shx,
+            dtype='>i4',
+            offset=100
+        )[::2].astype(numpy.int64) * 2
+    offsets: List[int] = []
+    offset: int = 100
+    while offset + 8 <= len(shp):
+        offsets.append(offset)
+        offset += 8 + 2 * int.from_bytes(shp[offset + 4:offset + 8], 'big')
+    return numpy.array(offsets, dtype=numpy.int64)
+
+
+def read_points(
+    shp: bytes,
+    shx: Optional[bytes] = None
+) -> Tuple[numpy.ndarray, numpy.ndarray]:
+    """
+    Get the X and Y coordinates of each record in a point shapefile. Null
+    shapes have `NaN` coordinates.
+
+    Parameters:
+
+    - shp (bytes): The contents of a ".shp" file.
+
+    - shx (bytes): The contents of the corresponding ".shx" file. If
+      provided, records are located using this index, rather than by reading
+      each record's header.
+    """
+    shape_type: int = int.from_bytes(shp[32:36], 'little')
+    if shape_type not in _POINT_SHAPE_TYPES:
+        raise ValueError(
+            'Only point shapefiles are supported, but the shape type is %s'
+            % str(shape_type)
+        )
+    offsets: numpy.ndarray = _get_record_offsets(shp, shx)
+    contents: numpy.ndarray = numpy.frombuffer(shp, dtype=numpy.uint8)
+
+    def get_values(position: int, dtype: str) -> numpy.ndarray:
+        size: int = numpy.dtype(dtype).itemsize
+        return contents[
+            (offsets + position)[:, None] + numpy.arange(size)
+        ].copy().view(dtype).ravel()
+
+    shape_types: numpy.ndarray = get_values(8, '<i4')
+    x: numpy.ndarray = get_values(12, '<f8')
+    y: numpy.ndarray = get_values(20, '<f8')
+    null: numpy.ndarray = shape_types == 0
+    x[null] = numpy.nan
+    y[null] = numpy.nan
+    return x, y
+
+
+def _read_files(path: str) -> Dict[str, bytes]:
+    """
+    Read the component files of a shapefile, keyed by their extension, from
+    a zip archive, or from the directory of a ".shp" or ".dbf" file
+    """
+    files: Dict[str, bytes] = {}
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as zip_file:
+            names: List[str] = zip_file.namelist()
+            stems: List[str] = [
+                name[:-4] for name in names
+                if name.lower().endswith('.dbf')
+            ]
+            if not stems:
+                raise ValueError(
+                    '%s does not contain a shapefile (a file geodatabase is '
+                    'not supported)' % path
+                )
+            for name in names:
+                stem, extension = os.path.splitext(name)
+                if stem == stems[0] and extension.lower() in (
+                    '.dbf', '.shp', '.shx', '.cpg'
+                ):
+                    files[extension.lower()] = zip_file.read(name)
+        return files
+    stem: str = os.path.splitext(path)[0]
+    for extension in ('.dbf', '.shp', '.shx', '.cpg'):
+        if os.path.exists(stem + extension):
+            with open(stem + extension, 'rb') as file:
+                files[extension] = file.read()
+    if '.dbf' not in files:
+        raise FileNotFoundError(stem + '.dbf')
+    return files
+
+
+def read(path: str) -> pandas.DataFrame:
+    """
+    Read a published SPIS layer (or any point shapefile) as a data frame,
+    with lower-case column names (such as "hwynumb", "mp", "spis_score" and
+    "lrs_key"). If the shapefile's geometry is available, "x" and "y"
+    columns hold each point's coordinates (in the layer's projection: for
+    SPIS layers, Oregon Lambert, in international feet).
+
+    Parameters:
+
+    - path (str): The path to a zip archive containing a shapefile (such as
+      "sources/tdb/trandata/GIS_data/Safety/spis_2014_16.zip"), or to a
+      ".dbf" or ".shp" file.
+    """
+    files: Dict[str, bytes] = _read_files(path)
+    encoding: Optional[str] = (
+        files['.cpg'].decode('ascii').strip() or None
+        if '.cpg' in files else
+        None
+    )
+    data_frame: pandas.DataFrame = read_dbf(files['.dbf'], encoding)
+    if '.shp' in files:
+        x, y = read_points(files['.shp'], files.get('.shx'))
+        if len(x) == len(data_frame):
+            data_frame['x'] = x
+            data_frame['y'] = y
+    return data_frame
+
+
+def get_severity_classes(
+    crashes: Union[columnar.Table, pandas.DataFrame]
+) -> numpy.ndarray:
+    """
+    Get the position, in `SEVERITY_FIELDS`, of the severity class of each
+    crash
+    """
+    conditions: List[numpy.ndarray] = [
+        columnar.get_floats(crashes[field_name]) > 0
+        for field_name in SEVERITY_FIELDS.values()
+        if field_name is not None
+    ]
+    return numpy.select(
+        conditions,
+        range(len(conditions)),
+        len(conditions)
+    ).astype(numpy.int8)
+
+
+def _get_indicator(values: numpy.ndarray, points: float) -> numpy.ndarray:
+    """
+    Scale values logarithmically, such that the greatest value is awarded
+    `points`
+    """
+    maximum: float = (
+        float(numpy.nanmax(values))
+        if len(values) and not numpy.isnan(values).all() else
+        0.0
+    )
+    if maximum <= 0:
+        return numpy.zeros(len(values))
+    return numpy.nan_to_num(
+        points * numpy.log1p(values) / numpy.log1p(maximum)
+    )
+
+
+def get_scores(
+    crashes: Union[columnar.Table, pandas.DataFrame],
+    years: Optional[Sequence[int]] = None,
+    daily_volumes: Optional[DailyVolumes] = None,
+    route_columns: Sequence[str] = lrs.LRS_COLUMNS,
+    measure_column: str = 'mp_no',
+    segment_length: float = SEGMENT_LENGTH,
+    step: float = STEP,
+    minimum_crashes: int = MINIMUM_CRASHES
+) -> pandas.DataFrame:
+    """
+    Score every segment of `segment_length` miles, starting at each multiple
+    of `step` along each route, which meets the SPIS crash criteria. Crashes
+    are counted in every segment overlapping them, and segments are counted
+    all at once from cumulative sums over crashes sorted by route and mile
+    point (see `odot_cds.lrs.MilePointIndex`), so scoring all of the state's
+    highways takes seconds.
+
+    Returns a data frame with a row for each scored segment, ordered by
+    route and mile point, having the `route_columns`, "start" and "end" (mile
+    points), a count of crashes in each class of `SEVERITY_FIELDS` (such as
+    "fatal_cnt" and "pdo_cnt"), "crash_cnt", "severity_val", "crash_rate",
+    the indicators ("frequency_indicator", "rate_indicator" and
+    "severity_indicator"), "spis_score", and "percentile" (the percentage of
+    scored segments having a score no greater than this segment's).
+
+    Parameters:
+
+    - crashes (odot_cds.columnar.Table|pandas.DataFrame): Crashes, such as
+      the "crash" table of a store returned by `odot_cds.ingest.read_files`.
+
+    - years ([int]): The years of crashes to score (by default, the latest
+      year of crashes and the two preceding years).
+
+    - daily_volumes (typing.Callable): A function which, given a route (a
+      tuple of `route_columns` values) and an array of segment starts,
+      returns the average daily traffic of each segment. Crash rates cannot
+      be computed without traffic volumes: if this is not provided,
+      "crash_rate" is `NaN`, and the rate indicator is zero.
+
+    - route_columns ([str]): The columns identifying a route. Crashes whose
+      value for the first of these is null (crashes not on a state highway)
+      are not scored.
+
+    - measure_column (str): The column holding each crash's mile point.
+
+    - segment_length (float): The length of each segment, in miles.
+
+    - step (float): The distance between the starts of segments, in miles.
+      Crash mile points are rounded to a multiple of this distance.
+
+    - minimum_crashes (int): Segments with fewer crashes (and no fatal
+      crash) are not scored.
+    """
+    index: lrs.MilePointIndex = lrs.MilePointIndex.from_table(
+        crashes,
+        route_columns,
+        measure_column
+    )
+    crash_years: numpy.ndarray = columnar.get_floats(
+        crashes['crash_yr_no']
+    )[index.order]
+    if years is None:
+        last_year: int = (
+            int(numpy.nanmax(crash_years))
+            if not numpy.isnan(crash_years).all() else
+            0
+        )
+        years = range(last_year - WINDOW_YEARS + 1, last_year + 1)
+    route_ids: numpy.ndarray = numpy.repeat(
+        numpy.arange(len(index.routes)),
+        numpy.diff(index.offsets)
+    )
+    on_route: numpy.ndarray = numpy.array(
+        [route[0] != '' for route in index.routes],
+        dtype=bool
+    )
+    selected: numpy.ndarray = (
+        numpy.isin(crash_years, list(years)) &
+        on_route[route_ids]
+    )
+    length: int = int(round(segment_length / step))
+    units: numpy.ndarray = numpy.round(
+        index.measures[selected] / step
+    ).astype(numpy.int64)
+    route_ids = route_ids[selected]
+    classes: numpy.ndarray = get_severity_classes(
+        crashes
+    )[index.order][selected]
+    # Each crash is given a sort key combining its route and mile point
+    # (which are already sorted), such that the segments of each route
+    # occupy a distinct range of keys
+    shift: int = int(units.min()) - length if len(units) else 0
+    units -= shift
+    span: int = int(units.max()) + length + 1 if len(units) else 1
+    keys: numpy.ndarray = route_ids * span + units
+    # Only segments overlapping a crash can be scored
+    starts: numpy.ndarray = numpy.unique(
+        (keys[:, None] - numpy.arange(length)).ravel()
+    )
+    firsts: numpy.ndarray = numpy.searchsorted(keys, starts, side='left')
+    lasts: numpy.ndarray = numpy.searchsorted(
+        keys,
+        starts + length,
+        side='left'
+    )
+    cumulative_counts: numpy.ndarray = numpy.zeros(
+        (len(keys) + 1, len(SEVERITY_FIELDS)),
+        dtype=numpy.int64
+    )
+    cumulative_counts[numpy.arange(1, len(keys) + 1), classes] = 1
+    cumulative_counts = cumulative_counts.cumsum(axis=0)
+    counts: numpy.ndarray = (
+        cumulative_counts[lasts] - cumulative_counts[firsts]
+    )
+    crash_counts: numpy.ndarray = counts.sum(axis=1)
+    qualified: numpy.ndarray = (
+        (crash_counts >= minimum_crashes) | (counts[:, 0] > 0)
+    )
+    starts, counts, crash_counts = (
+        starts[qualified],
+        counts[qualified],
+        crash_counts[qualified]
+    )
+    segment_routes: numpy.ndarray = starts // span
+    segment_starts: numpy.ndarray = numpy.round(
+        (starts % span + shift) * step,
+        6
+    )
+    severity_values: numpy.ndarray = counts @ numpy.array(
+        list(SEVERITY_WEIGHTS.values()),
+        dtype=numpy.int64
+    )
+    crash_rates: numpy.ndarray = numpy.full(len(starts), numpy.nan)
+    if daily_volumes is not None:
+        route_id: int
+        for route_id in numpy.unique(segment_routes):
+            in_route: numpy.ndarray = segment_routes == route_id
+            crash_rates[in_route] = crash_counts[in_route] * 1e6 / (
+                numpy.asarray(
+                    daily_volumes(
+                        index.routes[route_id],
+                        segment_starts[in_route]
+                    ),
+                    dtype=numpy.float64
+                ) * 365 * len(years) * segment_length
+            )
+    data_frame: pandas.DataFrame = pandas.DataFrame({
+        column_name: numpy.array(
+            [route[position] for route in index.routes],
+            dtype=object
+        )[segment_routes]
+        for position, column_name in enumerate(index.route_columns)
+    })
+    data_frame['start'] = segment_starts
+    data_frame['end'] = numpy.round(segment_starts + segment_length, 6)
+    for position, severity in enumerate(SEVERITY_FIELDS.keys()):
+        data_frame[severity + '_cnt'] = counts[:, position]
+    data_frame['crash_cnt'] = crash_counts
+    data_frame['severity_val'] = severity_values
+    data_frame['crash_rate'] = crash_rates
+    data_frame['frequency_indicator'] = _get_indicator(
+        crash_counts.astype(numpy.float64),
+        FREQUENCY_POINTS
+    )
+    data_frame['rate_indicator'] = _get_indicator(crash_rates, RATE_POINTS)
+    data_frame['severity_indicator'] = _get_indicator(
+        severity_values.astype(numpy.float64),
+        SEVERITY_POINTS
+    )
+    data_frame['spis_score'] = (
+        data_frame['frequency_indicator'] +
+        data_frame['rate_indicator'] +
+        data_frame['severity_indicator']
+    )
+    data_frame['percentile'] = (
+        data_frame['spis_score'].rank(method='max', pct=True) * 100
+    )
+    return data_frame
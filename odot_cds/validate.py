@@ -0,0 +1,192 @@
+"""
+This module checks the referential integrity of a CDS501 extract in a single
+pass over its rows, holding only the keys of each row (in hash sets and
+dictionaries) rather than the rows themselves. A truncated download (such as
+an incomplete page of records) shows up as vehicles or participants whose
+crash is missing, or as crashes having fewer vehicles than they count:
+
+>>> report = validate.validate('CDS501.txt')
+>>> report.valid
+True
+"""
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from . import cds501
+
+# The positions of fields in a CDS501 row
+_TOT_VHCL_CNT_INDEX: int = cds501.CDS501_FIELD_INDICES['tot_vhcl_cnt']
+_TOT_PER_INVLV_CNT_INDEX: int = cds501.CDS501_FIELD_INDICES[
+    'tot_per_invlv_cnt'
+]
+
+# The vehicle ID of participants who are not vehicle occupants (pedestrians,
+# pedal cyclists, etc.)
+NON_MOTORIST_VHCL_IDS: Tuple[str, ...] = ('', '0')
+
+# A crash ID, the count stated by the crash row, and the number of rows found
+CountMismatch = Tuple[str, int, int]
+
+
+@dataclass
+class Report:
+    """
+    The results of validating an extract.
+
+    - crash_count, vhcl_count, partic_count: The number of rows of each
+      record type.
+
+    - unknown_record_count: The number of rows having an unrecognized record
+      type (`rec_typ_cd`).
+
+    - duplicate_crash_ids, duplicate_vhcl_ids, duplicate_partic_ids: Primary
+      keys appearing in more than one row (once for each repetition).
+
+    - orphan_vhcl_ids: Vehicles whose crash is missing.
+
+    - orphan_partic_ids: Participants whose crash, or vehicle, is missing.
+
+    - misattributed_partic_ids: Participants whose vehicle belongs to a
+      different crash.
+
+    - vhcl_count_mismatches: Crashes whose `tot_vhcl_cnt` differs from the
+      number of their vehicle rows.
+
+    - partic_count_mismatches: Crashes having more participant rows than
+      their `tot_per_invlv_cnt`. Extracts include fewer participant rows than
+      persons involved (uninjured passengers are not included), so only an
+      excess is an error.
+    """
+
+    crash_count: int = 0
+    vhcl_count: int = 0
+    partic_count: int = 0
+    unknown_record_count: int = 0
+    duplicate_crash_ids: List[str] = field(default_factory=list)
+    duplicate_vhcl_ids: List[str] = field(default_factory=list)
+    duplicate_partic_ids: List[str] = field(default_factory=list)
+    orphan_vhcl_ids: List[str] = field(default_factory=list)
+    orphan_partic_ids: List[str] = field(default_factory=list)
+    misattributed_partic_ids: List[str] = field(default_factory=list)
+    vhcl_count_mismatches: List[CountMismatch] = field(default_factory=list)
+    partic_count_mismatches: List[CountMismatch] = field(
+        default_factory=list
+    )
+
+    @property
+    def valid(self) -> bool:
+        """
+        `True` if no integrity errors were found
+        """
+        return not (
+            self.unknown_record_count or
+            self.duplicate_crash_ids or
+            self.duplicate_vhcl_ids or
+            self.duplicate_partic_ids or
+            self.orphan_vhcl_ids or
+            self.orphan_partic_ids or
+            self.misattributed_partic_ids or
+            self.vhcl_count_mismatches or
+            self.partic_count_mismatches
+        )
+
+    def get_summary(self) -> Dict[str, int]:
+        """
+        Get the number of rows, and the number of each type of error found
+        """
+        return {
+            'crash_count': self.crash_count,
+            'vhcl_count': self.vhcl_count,
+            'partic_count': self.partic_count,
+            'unknown_record_count': self.unknown_record_count,
+            'duplicate_crash_ids': len(self.duplicate_crash_ids),
+            'duplicate_vhcl_ids': len(self.duplicate_vhcl_ids),
+            'duplicate_partic_ids': len(self.duplicate_partic_ids),
+            'orphan_vhcl_ids': len(self.orphan_vhcl_ids),
+            'orphan_partic_ids': len(self.orphan_partic_ids),
+            'misattributed_partic_ids': len(self.misattributed_partic_ids),
+            'vhcl_count_mismatches': len(self.vhcl_count_mismatches),
+            'partic_count_mismatches': len(self.partic_count_mismatches)
+        }
+
+
+def _get_count(value: str) -> int:
+    return int(value) if value else 0
+
+
+def validate(
+    data: Union[cds501.Source, Iterable[cds501.CDS501]]
+) -> Report:
+    """
+    Validate the keys of a CDS501 extract, in one pass over its rows (which
+    need not be grouped by crash).
+
+    Parameters:
+
+    - data (http.client.HTTPResponse|str|typing.IO|[CDS501]): A CDS501
+      extract (or the path to a saved "CDS501.txt" file), or an iterable of
+      `CDS501` instances.
+    """
+    report: Report = Report()
+    # The counts stated by each crash row
+    stated_counts: Dict[str, Tuple[int, int]] = {}
+    # The number of vehicle and participant rows referencing each crash
+    vhcl_counts: Dict[str, int] = {}
+    partic_counts: Dict[str, int] = {}
+    # The crash of each vehicle
+    vhcl_crash_ids: Dict[str, str] = {}
+    partic_ids: Set[str] = set()
+    # The participant, crash and vehicle IDs of each participant row
+    partic_keys: List[Tuple[str, str, str]] = []
+    for values in cds501.read_values(data):
+        crash_id: str = values[0]
+        record_type: str = values[1]
+        if record_type == '1':
+            report.crash_count += 1
+            if crash_id in stated_counts:
+                report.duplicate_crash_ids.append(crash_id)
+            stated_counts[crash_id] = (
+                _get_count(values[_TOT_VHCL_CNT_INDEX]),
+                _get_count(values[_TOT_PER_INVLV_CNT_INDEX])
+            )
+        elif record_type == '2':
+            report.vhcl_count += 1
+            vhcl_id: str = values[2]
+            if vhcl_id in vhcl_crash_ids:
+                report.duplicate_vhcl_ids.append(vhcl_id)
+            vhcl_crash_ids[vhcl_id] = crash_id
+            vhcl_counts[crash_id] = vhcl_counts.get(crash_id, 0) + 1
+        elif record_type == '3':
+            report.partic_count += 1
+            partic_id: str = values[3]
+            if partic_id in partic_ids:
+                report.duplicate_partic_ids.append(partic_id)
+            partic_ids.add(partic_id)
+            partic_counts[crash_id] = partic_counts.get(crash_id, 0) + 1
+            partic_keys.append((partic_id, crash_id, values[2]))
+        else:
+            report.unknown_record_count += 1
+    # Child rows are checked after all rows have been read, so that a crash
+    # or vehicle may follow the rows referencing it
+    for vhcl_id, crash_id in vhcl_crash_ids.items():
+        if crash_id not in stated_counts:
+            report.orphan_vhcl_ids.append(vhcl_id)
+    for partic_id, crash_id, vhcl_id in partic_keys:
+        if crash_id not in stated_counts:
+            report.orphan_partic_ids.append(partic_id)
+        elif vhcl_id not in NON_MOTORIST_VHCL_IDS:
+            vhcl_crash_id: Optional[str] = vhcl_crash_ids.get(vhcl_id)
+            if vhcl_crash_id is None:
+                report.orphan_partic_ids.append(partic_id)
+            elif vhcl_crash_id != crash_id:
+                report.misattributed_partic_ids.append(partic_id)
+    for crash_id, (vhcl_count, partic_count) in stated_counts.items():
+        if vhcl_counts.get(crash_id, 0) != vhcl_count:
+            report.vhcl_count_mismatches.append(
+                (crash_id, vhcl_count, vhcl_counts.get(crash_id, 0))
+            )
+        if partic_counts.get(crash_id, 0) > partic_count:
+            report.partic_count_mismatches.append(
+                (crash_id, partic_count, partic_counts.get(crash_id, 0))
+            )
+    return report
@@ -0,0 +1,413 @@
+"""
+This module loads CDS501 extracts into a SQLite database, as "CRASH", "VHCL"
+and "PARTIC" tables matching the fact tables of the CDS510 "Decode" database.
+Loading into a copy of a CDS510 database which has been converted to SQLite
+(such as "sources/cds510.db") allows facts to be joined with the decode
+tables locally:
+
+>>> from shutil import copyfile
+>>> copyfile('sources/cds510.db', 'warehouse.db')
+>>> warehouse.load('CDS501.txt', 'warehouse.db')
+>>> connection = sqlite3.connect('warehouse.db')
+>>> connection.execute(
+...     'SELECT WTHR_COND.WTHR_COND_LONG_DESC, COUNT(*) '
+...     'FROM CRASH JOIN WTHR_COND USING (WTHR_COND_CD) '
+...     'GROUP BY WTHR_COND.WTHR_COND_LONG_DESC'
+... ).fetchall()
+"""
+import sqlite3
+from dataclasses import Field, dataclass, fields
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import (
+    Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+)
+
+from . import cds501
+
+# Fields which are named differently in the CDS510 database
+_COLUMN_NAMES: Dict[str, str] = {
+    'tot_sfty_equip_use_unknown_qty': 'TOT_SFTY_EQUIP_USE_UNKNWN_QTY',
+    'vhcl_mvmnt_cd': 'MVMNT_CD'
+}
+
+_SQL_TYPES: Dict[type, str] = {
+    str: 'TEXT',
+    int: 'INTEGER',
+    bool: 'BOOLEAN',
+    Decimal: 'DOUBLE',
+    float: 'DOUBLE'
+}
+
+_CONVERTERS: Dict[type, Callable[[str], object]] = {
+    str: str,
+    int: int,
+    bool: lambda value: value == '1',
+    Decimal: float,
+    float: float
+}
+
+# Secondary indexes, which are built after loading (and are named so that
+# they can be dropped prior to loading)
+INDEXES: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    'CRASH_YR_NO_CNTY_ID_IDX': ('CRASH', ('CRASH_YR_NO', 'CNTY_ID')),
+    'CRASH_CITY_SECT_ID_IDX': ('CRASH', ('CITY_SECT_ID',)),
+    'CRASH_HWY_NO_MP_NO_IDX': ('CRASH', ('HWY_NO', 'MP_NO')),
+    'VHCL_CRASH_ID_IDX': ('VHCL', ('CRASH_ID',)),
+    'PARTIC_CRASH_ID_IDX': ('PARTIC', ('CRASH_ID',)),
+    'PARTIC_VHCL_ID_IDX': ('PARTIC', ('VHCL_ID',))
+}
+
+
+def get_column_name(field_name: str) -> str:
+    """
+    Get the name of the CDS510 column corresponding to a CDS501 field
+    """
+    return _COLUMN_NAMES.get(field_name, field_name.upper())
+
+
+@dataclass(frozen=True)
+class _Table:
+    """
+    The information needed to create and load one table
+    """
+
+    name: str
+    primary_key: str
+    indices: Tuple[int, ...]
+    column_names: Tuple[str, ...]
+    column_types: Tuple[type, ...]
+
+    @property
+    def create_sql(self) -> str:
+        return 'CREATE TABLE IF NOT EXISTS "%s" (\n    %s\n)' % (
+            self.name,
+            ',\n    '.join(
+                '"%s" %s%s' % (
+                    column_name,
+                    _SQL_TYPES[column_type],
+                    (
+                        ' PRIMARY KEY'
+                        if column_name == self.primary_key else
+                        ''
+                    )
+                )
+                for column_name, column_type in zip(
+                    self.column_names,
+                    self.column_types
+                )
+            )
+        )
+
+    @property
+    def upsert_sql(self) -> str:
+        """
+        An "upsert" statement: rows with a new primary key are inserted, and
+        rows with an existing primary key update the existing row
+        """
+        return (
+            'INSERT INTO "%s" (%s) VALUES (%s)\n'
+            'ON CONFLICT ("%s") DO UPDATE SET %s'
+        ) % (
+            self.name,
+            ', '.join(
+                '"%s"' % column_name
+                for column_name in self.column_names
+            ),
+            ', '.join('?' for _ in self.column_names),
+            self.primary_key,
+            ', '.join(
+                '"%s" = excluded."%s"' % (column_name, column_name)
+                for column_name in self.column_names
+                if column_name != self.primary_key
+            )
+        )
+
+    def get_row(self, values: Sequence[str]) -> Tuple[object, ...]:
+        """
+        Select and convert this table's values from a CDS501 row
+        """
+        return tuple(
+            None if values[index] == '' else _CONVERTERS[column_type](
+                values[index]
+            )
+            for index, column_type in zip(self.indices, self.column_types)
+        )
+
+
+def _get_table(
+    name: str,
+    primary_key: str,
+    indices: Tuple[int, ...],
+    dataclass_: type
+) -> _Table:
+    dataclass_fields: Tuple[Field, ...] = fields(dataclass_)
+    return _Table(
+        name=name,
+        primary_key=primary_key,
+        indices=indices,
+        column_names=tuple(
+            get_column_name(field_.name)
+            for field_ in dataclass_fields
+        ),
+        column_types=tuple(
+            cds501.get_field_type(field_)
+            for field_ in dataclass_fields
+        )
+    )
+
+
+# Tables, keyed by the CDS501 record type (`rec_typ_cd`) of their rows
+TABLES: Dict[str, _Table] = {
+    '1': _get_table('CRASH', 'CRASH_ID', cds501.CRASH_INDICES, cds501.Crash),
+    '2': _get_table('VHCL', 'VHCL_ID', cds501.VHCL_INDICES, cds501.Vhcl),
+    '3': _get_table(
+        'PARTIC',
+        'PARTIC_ID',
+        cds501.PARTIC_INDICES,
+        cds501.Partic
+    )
+}
+
+
+def create_tables(connection: sqlite3.Connection) -> None:
+    """
+    Create the "CRASH", "VHCL" and "PARTIC" tables, if they do not already
+    exist
+    """
+    for table in TABLES.values():
+        connection.execute(table.create_sql)
+
+
+def create_indexes(connection: sqlite3.Connection) -> None:
+    """
+    Create secondary indexes on the "CRASH", "VHCL" and "PARTIC" tables, if
+    they do not already exist
+    """
+    for index_name, (table_name, column_names) in INDEXES.items():
+        connection.execute(
+            'CREATE INDEX IF NOT EXISTS "%s" ON "%s" (%s)' % (
+                index_name,
+                table_name,
+                ', '.join('"%s"' % column_name for column_name in column_names)
+            )
+        )
+
+
+def drop_indexes(connection: sqlite3.Connection) -> None:
+    """
+    Drop the secondary indexes created by `create_indexes`
+    """
+    for index_name in INDEXES.keys():
+        connection.execute('DROP INDEX IF EXISTS "%s"' % index_name)
+
+
+def load(
+    data: Union[cds501.Source, Iterable[cds501.CDS501]],
+    path: str,
+    batch_size: int = 10000,
+    cache_size: int = 262144
+) -> Dict[str, int]:
+    """
+    Load a CDS501 extract into the "CRASH", "VHCL" and "PARTIC" tables of a
+    SQLite database, creating the tables if they do not exist. Rows are
+    streamed in batches within a single transaction, and rows having the
+    primary key of an existing row update that row. Returns the number of
+    rows loaded into each table.
+
+    Parameters:
+
+    - data (http.client.HTTPResponse|str|typing.IO|[CDS501]): A CDS501
+      extract (or the path to a saved "CDS501.txt" file), or an iterable of
+      `CDS501` instances, such as is returned by `odot_cds.cds501.read()`.
+
+    - path (str): The path to the SQLite database. This may be a copy of a
+      CDS510 "Decode" database which has been converted to SQLite.
+
+    - batch_size (int): The number of rows to insert with each call to
+      `executemany`.
+
+    - cache_size (int): The size of SQLite's page cache, in KiB, while
+      loading.
+    """
+    connection: sqlite3.Connection = sqlite3.connect(
+        path,
+        isolation_level=None
+    )
+    row_counts: Dict[str, int] = {
+        table.name: 0
+        for table in TABLES.values()
+    }
+    try:
+        connection.execute('PRAGMA journal_mode = WAL')
+        connection.execute('PRAGMA synchronous = OFF')
+        connection.execute('PRAGMA temp_store = MEMORY')
+        connection.execute('PRAGMA cache_size = -%s' % str(int(cache_size)))
+        connection.execute('BEGIN')
+        create_tables(connection)
+        # Maintaining secondary indexes during a bulk load is much slower than
+        # re-building them afterwards
+        drop_indexes(connection)
+        batches: Dict[str, List[Tuple[object, ...]]] = {
+            record_type: []
+            for record_type in TABLES.keys()
+        }
+        for values in cds501.read_values(data):
+            record_type: str = values[1]
+            table: Optional[_Table] = TABLES.get(record_type)
+            if table is None:
+                continue
+            batch: List[Tuple[object, ...]] = batches[record_type]
+            batch.append(table.get_row(values))
+            if len(batch) >= batch_size:
+                connection.executemany(table.upsert_sql, batch)
+                row_counts[table.name] += len(batch)
+                batch.clear()
+        for record_type, batch in batches.items():
+            if batch:
+                table = TABLES[record_type]
+                connection.executemany(table.upsert_sql, batch)
+                row_counts[table.name] += len(batch)
+        create_indexes(connection)
+        connection.execute('COMMIT')
+        connection.execute('PRAGMA synchronous = NORMAL')
+        connection.execute('PRAGMA optimize')
+    except Exception:
+        if connection.in_transaction:
+            connection.execute('ROLLBACK')
+        raise
+    finally:
+        connection.close()
+    return row_counts
+
+
+def delete(path: str, crash_ids: Iterable[Union[str, int]]) -> int:
+    """
+    Delete crashes, and their vehicles and participants, from the "CRASH",
+    "VHCL" and "PARTIC" tables of a SQLite database. Returns the number of
+    crash rows deleted.
+
+    Parameters:
+
+    - path (str): The path to the SQLite database.
+
+    - crash_ids ([str|int]): The IDs of the crashes to delete.
+    """
+    parameters: List[Tuple[int]] = [
+        (int(crash_id),) for crash_id in crash_ids
+    ]
+    connection: sqlite3.Connection = sqlite3.connect(path)
+    try:
+        with connection:
+            create_tables(connection)
+            for table in reversed(tuple(TABLES.values())):
+                cursor: sqlite3.Cursor = connection.executemany(
+                    'DELETE FROM "%s" WHERE CRASH_ID = ?' % table.name,
+                    parameters
+                )
+        return cursor.rowcount
+    finally:
+        connection.close()
+
+
+# A table recording the jurisdictions and date ranges for which complete
+# extracts have been loaded (see `add_coverage`)
+COVERAGE_TABLE: str = 'CDS501_COVERAGE'
+
+# An inclusive range of dates
+DateRange = Tuple[date, date]
+
+
+def _create_coverage_table(connection: sqlite3.Connection) -> None:
+    connection.execute(
+        'CREATE TABLE IF NOT EXISTS "%s" (\n'
+        '    "CNTY_ID" TEXT,\n'
+        '    "CITY_SECT_ID" INTEGER,\n'
+        '    "BEGIN_DT" TEXT,\n'
+        '    "END_DT" TEXT\n'
+        ')' % COVERAGE_TABLE
+    )
+
+
+def add_coverage(
+    path: str,
+    begin_date: date,
+    end_date: date,
+    county: Optional[str] = None,
+    city: Optional[Union[str, int]] = None
+) -> None:
+    """
+    Record that every crash in a county (or, if `city` is provided, a city)
+    from `begin_date` through `end_date` has been loaded, such as after
+    loading an "All Roads" CDS501 extract for that jurisdiction and date
+    range (see `odot_cds.local.LocalClient`).
+
+    Parameters:
+
+    - path (str): The path to the SQLite database.
+
+    - begin_date (datetime.date): The first day covered.
+
+    - end_date (datetime.date): The last day covered.
+
+    - county (str): A county ID (`cnty_id`), such as "03".
+
+    - city (str|int): A city section ID (`city_sect_id`).
+    """
+    connection: sqlite3.Connection = sqlite3.connect(path)
+    try:
+        with connection:
+            _create_coverage_table(connection)
+            connection.execute(
+                'INSERT INTO "%s" (CNTY_ID, CITY_SECT_ID, BEGIN_DT, END_DT) '
+                'VALUES (?, ?, ?, ?)' % COVERAGE_TABLE,
+                (
+                    county,
+                    None if city is None else int(city),
+                    begin_date.isoformat(),
+                    end_date.isoformat()
+                )
+            )
+    finally:
+        connection.close()
+
+
+def get_coverage(
+    connection: sqlite3.Connection,
+    county: Optional[str] = None,
+    city: Optional[Union[str, int]] = None
+) -> List[DateRange]:
+    """
+    Get the date ranges for which every crash in a county (or, if `city` is
+    provided, a city, regardless of county) has been loaded, as sorted,
+    non-overlapping `(begin_date, end_date)` tuples.
+    """
+    _create_coverage_table(connection)
+    return merge_ranges(
+        (date.fromisoformat(begin_date), date.fromisoformat(end_date))
+        for begin_date, end_date in connection.execute(
+            'SELECT BEGIN_DT, END_DT FROM "%s" WHERE %s' % (
+                COVERAGE_TABLE,
+                (
+                    'CNTY_ID = ? AND CITY_SECT_ID IS NULL'
+                    if city is None else
+                    'CITY_SECT_ID = ?'
+                )
+            ),
+            (county if city is None else int(city),)
+        )
+    )
+
+
+def merge_ranges(ranges: Iterable[DateRange]) -> List[DateRange]:
+    """
+    Merge overlapping or adjacent date ranges, returning sorted,
+    non-overlapping `(begin_date, end_date)` tuples
+    """
+    merged: List[DateRange] = []
+    for begin_date, end_date in sorted(ranges):
+        if merged and begin_date <= merged[-1][1] + timedelta(days=1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end_date))
+        else:
+            merged.append((begin_date, end_date))
+    return merged
@@ -12,21 +12,29 @@ setup(
     packages=['odot_cds'],
     install_requires=[
         "lxml>=4.4.2",
-        "pandas>=0.25.3",
+        "pandas>=1.0.0",
+        "numpy>=1.17.4",
         "iso8601>=0.1.12"
     ],
     extras_require={
+        "parquet": [
+            "pyarrow>=1.0.0"
+        ],
         "dev": [
             "setuptools-setup-versions>=0.0.28",
             "lxml>=4.4.2",
-            "pandas>=0.25.3",
-            "iso8601>=0.1.12"
+            "pandas>=1.0.0",
+            "numpy>=1.17.4",
+            "iso8601>=0.1.12",
+            "pyarrow>=1.0.0"
         ],
         "test": [
             "setuptools-setup-versions>=0.0.28",
             "lxml>=4.4.2",
-            "pandas>=0.25.3",
-            "iso8601>=0.1.12"
+            "pandas>=1.0.0",
+            "numpy>=1.17.4",
+            "iso8601>=0.1.12",
+            "pyarrow>=1.0.0"
         ]
     }
 )
\ No newline at end of file
@@ -0,0 +1,68 @@
+"""
+This module tests the functionality of `odot_cds.archive`.
+"""
+import os
+from tempfile import TemporaryDirectory
+from typing import List
+
+from odot_cds import archive, cds501
+from test_cds501 import BAKER_2018, CDS501_PATHS
+
+
+def test_archive() -> None:
+    """
+    Verify that archives hold the same rows as the extracts written to them,
+    in blocks which end on crash boundaries and can be read independently
+    """
+    assert (
+        archive._CRASH_YR_NO_INDEX ==
+        cds501.CDS501_FIELD_INDICES['crash_yr_no']
+    )
+    assert archive._CNTY_ID_INDEX == cds501.CDS501_FIELD_INDICES['cnty_id']
+    lines: List[str] = []
+    for path in CDS501_PATHS:
+        with open(path, newline='') as file:
+            lines.extend(file)
+    with TemporaryDirectory() as directory:
+        path: str = os.path.join(directory, 'CDS501.cds501z')
+        blocks: List[archive.Block] = archive.write(
+            CDS501_PATHS,
+            path,
+            block_rows=1000
+        )
+        assert archive.is_archive(path)
+        assert not archive.is_archive(BAKER_2018)
+        assert archive.read_index(path) == blocks
+        assert os.path.getsize(path) < sum(
+            os.path.getsize(path_) for path_ in CDS501_PATHS
+        ) / 4
+        assert list(archive.read_lines(path)) == lines
+        assert sum(block.row_count for block in blocks) == len(lines)
+        # Blocks end on crash boundaries
+        crash_ids: List[str] = []
+        for index in range(len(blocks)):
+            block_lines: List[str] = list(archive.read_lines(path, [index]))
+            assert block_lines[0].split(',')[1] == '1'
+            crash_ids.append(block_lines[-1].split(',')[0])
+            assert blocks[index].first_crash_id <= int(crash_ids[-1]) <= (
+                blocks[index].last_crash_id
+            )
+        assert len(crash_ids) == len(set(crash_ids))
+        # Archives are read by `odot_cds.cds501`, in whole or in part
+        assert sum(1 for _ in cds501.read(path)) == len(lines)
+        middle: int = len(blocks) // 2
+        assert sum(
+            len(cds501.get_store(
+                archive.BlockReader(path, block_range)
+            ).crash)
+            for block_range in (range(middle), range(middle, len(blocks)))
+        ) == sum(block.crash_count for block in blocks)
+        # Blocks are selected by year and county
+        baker_blocks: List[archive.Block] = archive.select(
+            blocks,
+            years=[2018],
+            counties=['01']
+        )
+        assert baker_blocks
+        assert len(baker_blocks) < len(blocks)
+        assert not archive.select(blocks, years=[2000])
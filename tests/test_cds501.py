@@ -0,0 +1,456 @@
+"""
+This module tests the functionality of `odot_cds.cds501` (and the modules
+built upon it) using the CDS501 extracts saved under "sources/cds501".
+"""
+import csv
+import os
+import shutil
+from decimal import Decimal
+from glob import glob
+from tempfile import TemporaryDirectory
+from typing import Dict, List, Optional, Tuple
+
+import numpy
+import pandas
+import pytest
+
+from odot_cds import cds501, columnar
+
+SOURCES: str = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'sources'
+)
+CDS501_PATHS: Tuple[str, ...] = tuple(sorted(glob(
+    os.path.join(SOURCES, 'cds501', '*', '*', 'CDS501.txt')
+)))
+BAKER_2018: str = os.path.join(
+    SOURCES, 'cds501', '2018', 'baker', 'CDS501.txt'
+)
+CDS510_DB: str = os.path.join(SOURCES, 'cds510.db')
+CDS501_FIELDS_CSV: str = os.path.join(SOURCES, 'cds501-fields.csv')
+
+
+def test_read() -> None:
+    """
+    Verify that rows of every record type are parsed, and can be converted to
+    `Crash`, `Vhcl` and `Partic` instances
+    """
+    rows: Tuple[cds501.CDS501, ...] = tuple(cds501.read(BAKER_2018))
+    assert rows[0].crash_id == '1779899'
+    assert rows[0].rec_typ_cd == '1'
+    assert rows[1].vhcl_id == '3354658'
+    crashes, vehicles, participants = cds501.split(rows)
+    assert crashes[0].ser_no == '00006'
+    assert crashes[0].lat_sec_no == '39.7300000'
+    assert vehicles[0].vhcl_typ_cd == '01'
+    assert participants[0].partic_id == '3821709'
+    assert participants[0].strikg_partic_flg == '0'
+    assert len(crashes) + len(vehicles) + len(participants) == len(rows)
+
+
+def test_store() -> None:
+    """
+    Verify that a columnar store holds the same data as the data frames built
+    from dataclass instances
+    """
+    store: columnar.Store = cds501.get_data_frames(BAKER_2018, store=True)
+    crash, vhcl, partic = store
+    crash_data_frame, vhcl_data_frame, partic_data_frame = (
+        cds501.get_data_frames(BAKER_2018)
+    )
+    assert len(crash) == len(crash_data_frame)
+    assert len(vhcl) == len(vhcl_data_frame)
+    assert len(partic) == len(partic_data_frame)
+    # Columns drawing from the same decode table share a dictionary
+    assert (
+        crash['crash_cause_1_cd'].dictionary is
+        partic['partic_cause_1_cd'].dictionary
+    )
+    assert crash['tot_vhcl_cnt'].values.dtype == numpy.int8
+    frames: List[pandas.DataFrame] = list(store.get_data_frames())
+    assert isinstance(frames[0]['wthr_cond_cd'].dtype, pandas.CategoricalDtype)
+    assert list(frames[0]['wthr_cond_cd'].astype(object).fillna('')) == list(
+        crash_data_frame['wthr_cond_cd'].fillna('')
+    )
+    assert frames[0]['crash_id'].tolist() == [
+        int(value) for value in crash_data_frame['crash_id']
+    ]
+
+
+def test_store_offsets() -> None:
+    """
+    Verify that the offsets of a store locate the vehicles and participants
+    of each crash, and the occupants of each vehicle
+    """
+    crash, vhcl, partic = cds501.get_data_frames(BAKER_2018)
+    store: columnar.Store = cds501.get_store(BAKER_2018)
+    crash_ids: numpy.ndarray = crash['crash_id'].to_numpy()
+    assert (
+        crash_ids[
+            store.crash_vhcl_offsets.get_parent_indices(len(vhcl))
+        ] == vhcl['crash_id'].to_numpy()
+    ).all()
+    partic_crash_indices: numpy.ndarray = (
+        store.crash_partic_offsets.get_parent_indices(len(partic))
+    )
+    assert (
+        crash_ids[partic_crash_indices] == partic['crash_id'].to_numpy()
+    ).all()
+    # Non-motorists belong to no vehicle
+    partic_vhcl_indices: numpy.ndarray = (
+        store.vhcl_partic_offsets.get_parent_indices(len(partic))
+    )
+    occupants: numpy.ndarray = partic_vhcl_indices >= 0
+    assert (occupants == (partic['vhcl_id'] != '0').to_numpy()).all()
+    assert (
+        vhcl['vhcl_id'].to_numpy()[partic_vhcl_indices[occupants]] ==
+        partic['vhcl_id'].to_numpy()[occupants]
+    ).all()
+    # Reductions agree with grouping by key
+    ages: numpy.ndarray = numpy.nan_to_num(
+        columnar.get_floats(store.partic['age_val'])
+    )
+    assert numpy.array_equal(
+        store.crash_partic_offsets.reduce(numpy.maximum, ages),
+        pandas.Series(ages).groupby(
+            partic['crash_id'].to_numpy()
+        ).max().reindex(crash_ids, fill_value=0).to_numpy()
+    )
+    assert numpy.array_equal(
+        store.crash_vhcl_offsets.counts,
+        crash['tot_vhcl_cnt'].astype(int).to_numpy()
+    )
+    # Rows which are not grouped by crash have no offsets
+    rows: List[cds501.CDS501] = list(cds501.read(BAKER_2018))
+    ungrouped_store: columnar.Store = cds501.get_store(rows[1:] + rows[:1])
+    assert ungrouped_store.crash_vhcl_offsets is None
+    assert ungrouped_store.crash_partic_offsets is None
+
+
+def test_store_cache() -> None:
+    """
+    Verify that a cached store is loaded, memory-mapped, with the same
+    tables, and that the cache is replaced when the extract changes
+    """
+    with TemporaryDirectory() as directory:
+        path: str = os.path.join(directory, 'CDS501.txt')
+        cache: str = os.path.join(directory, 'cache')
+        shutil.copy(BAKER_2018, path)
+        parsed: columnar.Store = cds501.get_store(path, cache=cache)
+        cached: columnar.Store = cds501.get_store(path, cache=cache)
+        assert isinstance(cached.crash['crash_id'].values, numpy.memmap)
+        for parsed_table, cached_table in zip(
+            parsed.get_data_frames(),
+            cached.get_data_frames()
+        ):
+            assert parsed_table.equals(cached_table)
+        assert numpy.array_equal(
+            parsed.vhcl_partic_offsets.ends,
+            cached.vhcl_partic_offsets.ends
+        )
+        crash, vhcl, partic = cds501.get_data_frames(path, cache=cache)
+        assert len(partic) == len(parsed.partic)
+        # Changing the extract invalidates the cache
+        with open(path) as file:
+            lines: List[str] = file.readlines()
+        with open(path, 'w') as file:
+            file.writelines(lines[:-1])
+        assert len(cds501.get_store(path, cache=cache).partic) == (
+            len(parsed.partic) - 1
+        )
+        with pytest.raises(ValueError):
+            cds501.get_store(cds501.read(path), cache=cache)
+
+
+def test_store_dictionaries() -> None:
+    """
+    Verify that stores seeded from the CDS510 decode database use consistent
+    codes
+    """
+    dictionaries = columnar.load_dictionaries(
+        CDS510_DB,
+        cds501.DECODE_TABLES
+    )
+    severities: List[str] = list(dictionaries['CRASH_SVRTY'].values)
+    store: columnar.Store = cds501.get_store(
+        CDS501_PATHS[-1],
+        dictionaries=dictionaries
+    )
+    assert dictionaries['CRASH_SVRTY'].values == severities
+    column: columnar.CodeColumn = store.crash['crash_svrty_cd']
+    assert set(
+        severities[code] for code in numpy.unique(column.codes)
+    ) <= set(severities)
+
+
+def test_compact_data_frames() -> None:
+    """
+    Verify that compact data frames hold the same values as those built from
+    dataclass instances, in the planned data types, and in less memory
+    """
+    path: str = os.path.join(
+        SOURCES, 'cds501', '2018', 'clackamas', 'CDS501.txt'
+    )
+    # The least reduction in memory of each table (crash, vhcl and partic),
+    # relative to data frames of Python strings (as built by pandas < 3),
+    # and relative to the default data frames (which, as of pandas 3, hold
+    # Arrow-backed strings)
+    for (
+        data_frame,
+        compact_data_frame,
+        object_reduction,
+        reduction
+    ) in zip(
+        cds501.get_data_frames(path),
+        cds501.get_data_frames(path, compact=True),
+        (12, 25, 25),
+        (2.25, 4.5, 5)
+    ):
+        assert set(data_frame.columns) <= set(compact_data_frame.columns)
+        for name, dtype in cds501.INTEGER_DTYPES.items():
+            if name in compact_data_frame:
+                assert compact_data_frame[name].dtype == dtype
+                assert compact_data_frame[name].astype(object).fillna(
+                    ''
+                ).astype(str).tolist() == [
+                    str(int(value)) if value else ''
+                    for value in data_frame[name].fillna('')
+                ]
+        memory_usage: int = compact_data_frame.memory_usage(deep=True).sum()
+        assert memory_usage * object_reduction < data_frame.astype(
+            object
+        ).memory_usage(deep=True).sum()
+        assert memory_usage * reduction < (
+            data_frame.memory_usage(deep=True).sum()
+        )
+    crash: pandas.DataFrame = cds501.get_data_frames(path, compact=True)[0]
+    assert crash['nhs_flg'].dtype == 'boolean'
+    assert crash['mp_no'].dtype == numpy.float64
+    assert isinstance(crash['crash_svrty_cd'].dtype, pandas.CategoricalDtype)
+
+
+def test_fixed_point() -> None:
+    """
+    Verify that decimal fields are held exactly as scaled integers, which
+    convert, compare and sort as their decimal values do
+    """
+    crash: pandas.DataFrame = cds501.get_data_frames(BAKER_2018)[0]
+    store: columnar.Store = cds501.get_store(BAKER_2018)
+    for name, scale in cds501.DECIMAL_SCALES.items():
+        column: columnar.FixedPointColumn = store.crash[name]
+        assert column.scale == scale
+        assert column.values.dtype == numpy.int64
+        decimals: List[Optional[Decimal]] = [
+            Decimal(value) if value else None
+            for value in crash[name].fillna('')
+        ]
+        assert column.to_decimals().tolist() == decimals
+        assert numpy.array_equal(
+            column.to_floats(),
+            numpy.array([
+                numpy.nan if value is None else float(value)
+                for value in decimals
+            ]),
+            equal_nan=True
+        )
+        present: List[Decimal] = [
+            value for value in decimals if value is not None
+        ]
+        median: Decimal = sorted(present)[len(present) // 2]
+        for operator in ('=', '!=', '<', '<=', '>', '>='):
+            for value in (median, median + Decimal('0.00000001')):
+                assert column.compare(operator, value).tolist() == [
+                    decimal is not None and cds501._OPERATORS[operator](
+                        decimal,
+                        value
+                    )
+                    for decimal in decimals
+                ]
+        assert [
+            decimals[index] for index in column.argsort()
+        ] == sorted(present) + [None] * (len(decimals) - len(present))
+    with TemporaryDirectory() as directory:
+        store.write(directory)
+        assert columnar.Store.read(
+            directory
+        ).crash['mp_no'].to_decimals().tolist() == (
+            store.crash['mp_no'].to_decimals().tolist()
+        )
+    column = columnar.encode(['1.5', '', '-0.25'], Decimal, scale=2)
+    assert columnar.get_strings(column).tolist() == ['1.50', '', '-0.25']
+    assert columnar.concatenate([store, store]).crash['mp_no'].scale == 2
+    with pytest.raises(ValueError):
+        columnar.encode(['1.005'], Decimal, scale=2)
+    # Values of more than 15 digits (beyond exact float64 precision) are
+    # parsed exactly, up to the 18 digits of a scaled int64
+    boundary_values: List[str] = [
+        '90071992547409.93',
+        '-90071992547409.93',
+        '+1234567890123456.78',
+        '.5',
+        '999999999999999.99',
+        ''
+    ]
+    scaled, mask = columnar.parse_fixed_point(boundary_values, 2)
+    assert scaled.tolist() == [
+        9007199254740993,
+        -9007199254740993,
+        123456789012345678,
+        50,
+        99999999999999999,
+        0
+    ]
+    assert mask.tolist() == [False] * 5 + [True]
+    for invalid_values in (['12345678901234567.89'], ['1-2.5'], ['--1.5']):
+        with pytest.raises(ValueError):
+            columnar.parse_fixed_point(invalid_values, 2)
+
+
+def test_decode_tables() -> None:
+    """
+    Verify that `DECODE_TABLES` agrees with the "Decode Table" column of
+    "sources/cds501-fields.csv" (in which the participant-level compass
+    direction and action fields share names with their vehicle-level
+    counterparts)
+    """
+    with open(CDS501_FIELDS_CSV, newline='') as file:
+        rows: List[Dict[str, str]] = list(csv.DictReader(file))
+    assert len(rows) == cds501.CDS501_COLUMN_COUNT
+    for field_, row in zip(cds501.CDS501_FIELDS, rows):
+        assert row['Decode Table'] == cds501.DECODE_TABLES.get(
+            field_.name,
+            ''
+        )
+
+
+def test_iter_data_frames() -> None:
+    """
+    Verify that chunks are bounded in size, keep each crash's rows together,
+    and together hold the same rows as `get_data_frames`
+    """
+    path: str = CDS501_PATHS[0]
+    chunks: List[Tuple[pandas.DataFrame, ...]] = list(
+        cds501.iter_data_frames(path, chunk_rows=100)
+    )
+    assert len(chunks) > 1
+    for crash, vhcl, partic in chunks:
+        assert len(crash) + len(vhcl) + len(partic) <= 100
+        crash_ids = set(crash['crash_id'])
+        assert set(vhcl['crash_id']) <= crash_ids
+        assert set(partic['crash_id']) <= crash_ids
+    for index, data_frame in enumerate(cds501.get_data_frames(path)):
+        # Columns which are entirely null within a chunk may be inferred as a
+        # different data type, so values are compared as objects
+        assert pandas.concat(
+            [chunk[index] for chunk in chunks],
+            ignore_index=True
+        ).astype(object).fillna('').equals(
+            data_frame.astype(object).fillna('')
+        )
+    stores: List[columnar.Store] = list(
+        cds501.iter_data_frames(path, chunk_rows=100, store=True)
+    )
+    assert len(stores) == len(chunks)
+    # Chunks share dictionaries
+    assert stores[0].dictionaries is stores[-1].dictionaries
+    assert sum(len(store.partic) for store in stores) == sum(
+        len(chunk[2]) for chunk in chunks
+    )
+
+
+def test_iter_crashes() -> None:
+    """
+    Verify that crash groups hold the same vehicles and participants as
+    `split`, each participant with its vehicle
+    """
+    path: str = CDS501_PATHS[0]
+    crash_groups: List[cds501.CrashGroup] = list(cds501.iter_crashes(path))
+    crashes, vehicles, participants = cds501.split(cds501.read(path))
+    assert [crash_group.crash for crash_group in crash_groups] == crashes
+    assert [
+        vhcl_group.vhcl
+        for crash_group in crash_groups
+        for vhcl_group in crash_group.vhcls
+    ] == vehicles
+    assert sorted(
+        partic.partic_id
+        for crash_group in crash_groups
+        for partic in crash_group.iter_partics()
+    ) == sorted(partic.partic_id for partic in participants)
+    for crash_group in crash_groups:
+        for vhcl_group in crash_group.vhcls:
+            assert vhcl_group.vhcl.crash_id == crash_group.crash.crash_id
+            for partic in vhcl_group.partics:
+                assert partic.vhcl_id == vhcl_group.vhcl.vhcl_id
+        for partic in crash_group.partics:
+            assert partic.crash_id == crash_group.crash.crash_id
+            assert partic.vhcl_id == '0'
+
+
+def test_filters() -> None:
+    """
+    Verify that filters select crashes along with their vehicle and
+    participant rows, and that only selected columns are read
+    """
+    path: str = CDS501_PATHS[2]
+    crash, vhcl, partic = cds501.get_data_frames(path)
+    fatal_crash_ids = set(crash['crash_id'][crash['crash_svrty_cd'] == '2'])
+    filters = [('crash_svrty_cd', '=', '2')]
+    columns = ['crash_svrty_cd', 'mp_no', 'inj_svrty_cd']
+    fatal_crash, fatal_vhcl, fatal_partic = cds501.get_data_frames(
+        path,
+        filters=filters,
+        columns=columns
+    )
+    assert set(fatal_crash['crash_id']) == fatal_crash_ids
+    assert len(fatal_vhcl) == vhcl['crash_id'].isin(fatal_crash_ids).sum()
+    assert len(fatal_partic) == partic['crash_id'].isin(
+        fatal_crash_ids
+    ).sum()
+    assert list(fatal_crash.columns) == [
+        'crash_id', 'mp_no', 'crash_svrty_cd'
+    ]
+    assert 'inj_svrty_cd' in fatal_partic.columns
+    assert 'vhcl_typ_cd' not in fatal_vhcl.columns
+    store: columnar.Store = cds501.get_store(
+        path,
+        filters=filters,
+        columns=columns
+    )
+    assert len(store.partic) == len(fatal_partic)
+    assert 'wthr_cond_cd' not in store.crash
+    # Numeric comparisons, and membership
+    assert all(
+        row.mp_no is not None and float(row.mp_no) > 100
+        for row in cds501.read(
+            path,
+            [('mp_no', '>', 100), ('cnty_id', 'in', ('03', '04'))]
+        )
+        if row.rec_typ_cd == '1'
+    )
+    # Numeric codes are compared as numbers, whether or not they are padded
+    months = crash['crash_mo_no'].astype(int)
+    for filters, expected in (
+        ([('crash_mo_no', '<=', 6)], months <= 6),
+        ([('crash_mo_no', '<=', '06')], months <= 6),
+        (
+            [('crash_mo_no', '>', 3), ('crash_mo_no', '<', 10)],
+            (months > 3) & (months < 10)
+        ),
+        ([('crash_mo_no', 'in', (1, '02', '3'))], months <= 3)
+    ):
+        assert len(
+            cds501.get_data_frames(path, filters=filters)[0]
+        ) == expected.sum()
+    county_id: str = crash['cnty_id'].iloc[0]
+    assert county_id.startswith('0')
+    assert len(cds501.get_data_frames(
+        path,
+        filters=[('cnty_id', '=', int(county_id))]
+    )[0]) == len(cds501.get_data_frames(
+        path,
+        filters=[('cnty_id', '=', county_id)]
+    )[0]) == len(crash)
+    # Filters apply only to crash-level fields
+    with pytest.raises(ValueError):
+        cds501.get_predicate([('sex_cd', '=', '1')])
@@ -0,0 +1,85 @@
+"""
+This module tests the functionality of `odot_cds.changes`.
+"""
+import csv
+import os
+import sqlite3
+from datetime import date
+from tempfile import TemporaryDirectory
+from typing import List
+
+from odot_cds import cds501, changes, warehouse
+
+from test_cds501 import BAKER_2018
+
+
+def test_differ() -> None:
+    """
+    Verify that re-reading an extract yields no changes, and that revised,
+    removed and re-formatted crashes are detected (or ignored) accordingly
+    """
+    groups: List[List[List[str]]] = list(cds501.iter_crash_groups(BAKER_2018))
+    lat_sec_no_index: int = cds501.CDS501_FIELD_INDICES['lat_sec_no']
+    sex_cd_index: int = cds501.CDS501_FIELD_INDICES['sex_cd']
+    with TemporaryDirectory() as directory:
+        fingerprints_path: str = os.path.join(directory, 'fingerprints.db')
+        warehouse_path: str = os.path.join(directory, 'warehouse.db')
+        warehouse.load(BAKER_2018, warehouse_path)
+        with changes.Differ(fingerprints_path) as differ:
+            change_set: changes.ChangeSet = differ.diff(BAKER_2018)
+            assert len(change_set.inserted) == len(groups)
+            assert not (change_set.updated or change_set.deleted)
+            differ.commit(change_set)
+        with changes.Differ(fingerprints_path) as differ:
+            assert len(differ) == len(groups)
+            change_set = differ.diff(BAKER_2018)
+            assert not change_set
+            assert change_set.unchanged_count == len(groups)
+            # Revise the last participant of one crash, re-format a value of
+            # another, and remove a third
+            revised: List[str] = groups[0][-1]
+            revised[sex_cd_index] = (
+                '1' if revised[sex_cd_index] == '9' else '9'
+            )
+            groups[1][0][lat_sec_no_index] += '000'
+            deleted: List[List[str]] = groups.pop(2)
+            path: str = os.path.join(directory, 'CDS501.txt')
+            with open(path, 'w', newline='') as file:
+                writer = csv.writer(file)
+                for group in groups:
+                    writer.writerows(group)
+            change_set = differ.diff(
+                path,
+                begin_date=date(2018, 1, 1),
+                end_date=date(2018, 12, 31),
+                counties=['01']
+            )
+            assert change_set.inserted == []
+            assert change_set.updated == [groups[0][0][0]]
+            assert change_set.deleted == [deleted[0][0]]
+            assert change_set.unchanged_count == len(groups) - 1
+            # Crashes outside of the window are not deleted
+            assert not differ.diff(
+                path,
+                begin_date=date(2019, 1, 1)
+            ).deleted
+            assert changes.apply(change_set, warehouse_path) == {
+                'CRASH': 1,
+                'VHCL': sum(row[1] == '2' for row in groups[0]),
+                'PARTIC': sum(row[1] == '3' for row in groups[0])
+            }
+            differ.commit(change_set)
+            assert not differ.diff(path)
+        connection: sqlite3.Connection = sqlite3.connect(warehouse_path)
+        assert connection.execute(
+            'SELECT COUNT(*) FROM CRASH WHERE CRASH_ID = ?',
+            (int(deleted[0][0]),)
+        ).fetchone()[0] == 0
+        assert connection.execute(
+            'SELECT SEX_CD FROM PARTIC WHERE PARTIC_ID = ?',
+            (int(revised[cds501.CDS501_FIELD_INDICES['partic_id']]),)
+        ).fetchone()[0] == revised[sex_cd_index]
+        assert connection.execute(
+            'SELECT COUNT(*) FROM CRASH'
+        ).fetchone()[0] == len(groups)
+        connection.close()
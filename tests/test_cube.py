@@ -0,0 +1,71 @@
+"""
+This module tests the functionality of `odot_cds.cube`.
+"""
+import os
+from datetime import date
+from tempfile import TemporaryDirectory
+
+import pandas
+
+from odot_cds import cds501, cube, ingest
+from odot_cds.client import Extract
+from test_cds501 import CDS501_PATHS
+
+
+def test_cube() -> None:
+    """
+    Verify that summary reports computed from a cube (built incrementally)
+    agree with counts of the crashes from which it was built
+    """
+    crash: pandas.DataFrame = ingest.read_files(
+        CDS501_PATHS,
+        processes=1
+    ).crash.to_data_frame()
+    summary: cube.Cube = cube.Cube.from_crashes(
+        chunk[0]
+        for path in CDS501_PATHS
+        for chunk in cds501.iter_data_frames(path, chunk_rows=1000)
+    )
+    assert summary.count() == len(crash)
+    # Building from columnar tables yields the same cube
+    assert summary.data.equals(
+        cube.Cube.from_crashes(
+            store.crash
+            for store in map(cds501.get_store, CDS501_PATHS)
+        ).data
+    )
+    road_types: pandas.Series = pandas.Series(
+        cube.get_road_types(crash),
+        index=crash.index
+    )
+    state: pandas.DataFrame = crash[
+        (crash['cnty_id'] == '03') & (road_types == 'STATE')
+    ]
+    report: pandas.DataFrame = summary.get_report(
+        Extract.CDS280,
+        county='03',
+        query_type='rdoSumQueryTypeSTATE'
+    )
+    months: pandas.Series = state['crash_mo_no'].astype(int)
+    assert report['total_crashes'].to_dict() == (
+        months.value_counts().to_dict()
+    )
+    assert report['people_killed'].to_dict() == (
+        state.groupby(months)['tot_fatal_cnt'].sum().to_dict()
+    )
+    assert report['fatal_crashes'].sum() == (
+        (state['crash_svrty_cd'] == cube.FATAL).sum()
+    )
+    assert (
+        summary.get_report(Extract.CDS200)['total_crashes'].to_dict() ==
+        crash['cnty_id'].value_counts().to_dict()
+    )
+    assert summary.count(
+        begin_date=date(2018, 3, 1),
+        end_date=date(2018, 5, 31)
+    ) == crash['crash_mo_no'].isin(['3', '4', '5']).sum()
+    # Cubes are saved and loaded as CSV
+    with TemporaryDirectory() as directory:
+        path: str = os.path.join(directory, 'cube.csv')
+        summary.write(path)
+        assert cube.Cube.read(path).data.equals(summary.data)
@@ -0,0 +1,146 @@
+"""
+This module tests the functionality of `odot_cds.decode`.
+"""
+import sqlite3
+from typing import Dict, List
+
+import pandas
+
+from odot_cds import cds501, columnar, decode
+from test_cds501 import BAKER_2018, CDS510_DB
+
+
+def _get_labels(categorical: pandas.Categorical) -> List[str]:
+    """
+    Get a list of labels, with null values represented by empty strings
+    """
+    return [
+        label if isinstance(label, str) else ''
+        for label in categorical.astype(object)
+    ]
+
+
+def test_decode() -> None:
+    """
+    Verify that decoding a column in one step is equivalent to looking up
+    each row's code in the decode table
+    """
+    decoder: decode.Decoder = decode.load(CDS510_DB)
+    assert decode.load(CDS510_DB) is decoder
+    store: columnar.Store = cds501.get_store(BAKER_2018)
+    connection: sqlite3.Connection = sqlite3.connect(CDS510_DB)
+    try:
+        weather: Dict[str, str] = {
+            code.strip(): description.strip()
+            for code, description in connection.execute(
+                'SELECT WTHR_COND_CD, WTHR_COND_LONG_DESC FROM WTHR_COND'
+            )
+        }
+    finally:
+        connection.close()
+    codes: List[str] = [
+        row.wthr_cond_cd or ''
+        for row in cds501.read(BAKER_2018)
+        if row.rec_typ_cd == '1'
+    ]
+    decoded: pandas.Categorical = decoder.decode(
+        store.crash['wthr_cond_cd'],
+        'wthr_cond_cd',
+        'long'
+    )
+    assert _get_labels(decoded) == [weather.get(code, '') for code in codes]
+    # Integer columns, unknown codes and null codes
+    assert list(
+        decoder.decode(store.crash['city_sect_id'], 'city_sect_id')[:1]
+    ) == ['Outside City Limits']
+    assert _get_labels(
+        decoder.decode(['2', '9', '', None], 'crash_svrty_cd', 'long')
+    ) == ['Fatal', '', '', '']
+    # Data frames, with decoded columns sharing categories
+    crash: pandas.DataFrame = decoder.decode_data_frame(
+        store.crash,
+        suffix='_short_desc'
+    )
+    partic: pandas.DataFrame = decoder.decode_data_frame(
+        store.partic.to_data_frame()
+    )
+    assert crash['crash_cause_1_cd_short_desc'].dtype is (
+        partic['partic_cause_1_cd'].dtype
+    )
+    assert list(crash.columns).index('wthr_cond_cd_short_desc') == (
+        list(crash.columns).index('wthr_cond_cd') + 1
+    )
+
+
+def test_decode_cds510() -> None:
+    """
+    Verify that decoded labels match the short descriptions held in the
+    "CRASH" table of the CDS510 database
+    """
+    decoder: decode.Decoder = decode.load(CDS510_DB)
+    connection: sqlite3.Connection = sqlite3.connect(CDS510_DB)
+    try:
+        crash: pandas.DataFrame = pandas.read_sql_query(
+            'SELECT CRASH_SVRTY_CD, CRASH_SVRTY_SHORT_DESC, WTHR_COND_CD, '
+            'WTHR_COND_SHORT_DESC, CNTY_ID, CNTY_NM FROM CRASH',
+            connection
+        )
+    finally:
+        connection.close()
+    for column_name, label_column_name in (
+        ('crash_svrty_cd', 'CRASH_SVRTY_SHORT_DESC'),
+        ('wthr_cond_cd', 'WTHR_COND_SHORT_DESC'),
+        ('cnty_id', 'CNTY_NM')
+    ):
+        assert list(
+            decoder.decode(crash[column_name.upper()], column_name)
+        ) == [label.strip() for label in crash[label_column_name]]
+
+
+def test_decode_history() -> None:
+    """
+    Verify that codes from decode tables which change over time are decoded
+    using the row in use during each code's year
+    """
+    decoder: decode.Decoder = decode.load(CDS510_DB)
+    # Urban area 1 changed FIPS codes in 2015, and urban area 3 was
+    # terminated after 2003
+    assert _get_labels(
+        decoder.decode(
+            [1, 1, 1, 3, 3, None],
+            'urb_area_cd',
+            years=[1984, 2014, 2015, 2003, 2004, 2015],
+            table_name='URB_AREA_FIPS_HIST'
+        )
+    ) == ['', '01000', '00955', '03050', '', '']
+    # Without years, the current row is used
+    assert _get_labels(
+        decoder.decode([1], 'urb_area_cd', table_name='URB_AREA_FIPS_HIST')
+    ) == ['00955']
+    # Tables having only termination dates: each row is in use from the year
+    # after the preceding row for the same code was terminated
+    table: decode.HistoryTable = decode.HistoryTable.from_rows(
+        'HWY_HIST',
+        ('HWY_NO', 'HWY_MED_NM', 'HWY_TERMNT_DT'),
+        [
+            ('900', 'NEW', None),
+            ('900', 'OLD', '2005-12-31 00:00:00'),
+            ('901', 'GONE', '2001-12-31 00:00:00')
+        ]
+    )
+    decoder = decode.Decoder(dict(decoder.tables, HWY_HIST=table))
+    assert _get_labels(
+        decoder.decode(
+            pandas.Series(['900', '900', '901', '901']),
+            'hwy_no',
+            years=pandas.Series(['2005', '2006', '2001', '2002'])
+        )
+    ) == ['OLD', 'NEW', 'GONE', '']
+    # Data frames are decoded using their `crash_yr_no` column
+    crash: pandas.DataFrame = decoder.decode_data_frame(
+        pandas.DataFrame({
+            'crash_yr_no': ['1999', '2019'],
+            'hwy_no': ['900', '900']
+        })
+    )
+    assert _get_labels(crash['hwy_no'].array) == ['OLD', 'NEW']
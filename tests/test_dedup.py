@@ -0,0 +1,64 @@
+"""
+This module tests the functionality of `odot_cds.dedup`.
+"""
+import os
+from tempfile import TemporaryDirectory
+from typing import List, Tuple
+
+import pandas
+
+from odot_cds import cds501, dedup
+from test_cds501 import BAKER_2018, CDS501_PATHS
+
+
+def test_bloom_filter() -> None:
+    """
+    Verify that a Bloom filter contains every value added, and few others
+    """
+    bloom_filter: dedup.BloomFilter = dedup.BloomFilter(1000, 0.01)
+    for value in range(1000):
+        bloom_filter.add(str(value))
+    assert all(str(value) in bloom_filter for value in range(1000))
+    assert sum(
+        str(value) in bloom_filter for value in range(1000, 11000)
+    ) < 300
+
+
+def test_deduplicator() -> None:
+    """
+    Verify that overlapping extracts are combined without duplicates, across
+    sessions
+    """
+    with TemporaryDirectory() as directory:
+        path: str = os.path.join(directory, 'seen.db')
+        # A Bloom filter with a high error rate exercises the exact check
+        with dedup.Deduplicator(
+            path,
+            capacity=100,
+            error_rate=0.5,
+            batch_size=100
+        ) as deduplicator:
+            data_frames: Tuple[
+                pandas.DataFrame,
+                pandas.DataFrame,
+                pandas.DataFrame
+            ] = cds501.get_data_frames(
+                list(deduplicator.read(BAKER_2018)) +
+                list(deduplicator.read(BAKER_2018))
+            )
+            assert deduplicator.kept == deduplicator.dropped
+        expected: Tuple[
+            pandas.DataFrame,
+            pandas.DataFrame,
+            pandas.DataFrame
+        ] = cds501.get_data_frames(BAKER_2018)
+        for data_frame, expected_data_frame in zip(data_frames, expected):
+            assert data_frame.equals(expected_data_frame)
+        with dedup.Deduplicator(path) as deduplicator:
+            assert not list(deduplicator.read_values(BAKER_2018))
+            rows: List[List[str]] = list(
+                deduplicator.read_values(CDS501_PATHS[1])
+            )
+            assert len(rows) == sum(
+                1 for _ in cds501.read_values(CDS501_PATHS[1])
+            )
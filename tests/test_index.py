@@ -0,0 +1,49 @@
+"""
+This module tests the functionality of `odot_cds.index`.
+"""
+import os
+import shutil
+from tempfile import TemporaryDirectory
+from typing import List
+
+import numpy
+
+from odot_cds import cds501, index
+from test_cds501 import CDS501_PATHS
+
+
+def test_reader() -> None:
+    """
+    Verify that crashes read by seeking match those read by a full parse
+    """
+    with TemporaryDirectory() as directory:
+        path: str = os.path.join(directory, 'CDS501.txt')
+        shutil.copy(CDS501_PATHS[0], path)
+        crash_groups: List[cds501.CrashGroup] = list(
+            cds501.iter_crashes(path)
+        )
+        with index.Reader(path) as reader:
+            assert os.path.exists(index.get_index_path(path))
+            assert len(reader) == len(crash_groups)
+            for crash_group in crash_groups[::50]:
+                assert crash_group.crash.crash_id in reader
+                assert reader.get(crash_group.crash.crash_id) == crash_group
+            assert reader.get('1') is None
+            assert '1' not in reader
+            assert reader.get_values(
+                crash_groups[0].crash.crash_id
+            ) == list(cds501.iter_crash_groups(path))[0]
+            # Crashes are read in the order of the extract
+            crash_ids: List[str] = [
+                crash_group.crash.crash_id
+                for crash_group in crash_groups[::7]
+            ]
+            assert list(
+                reader.get_many(reversed(crash_ids + ['1']))
+            ) == crash_groups[::7]
+        # An index older than the extract is rebuilt
+        records: numpy.ndarray = numpy.load(index.get_index_path(path))
+        os.utime(index.get_index_path(path), (0, 0))
+        with index.Reader(path) as reader:
+            assert numpy.array_equal(reader.records, records)
+        assert os.path.getmtime(index.get_index_path(path)) > 0
@@ -0,0 +1,61 @@
+"""
+This module tests the functionality of `odot_cds.ingest`.
+"""
+import os
+from typing import List
+
+import numpy
+
+from odot_cds import cds501, columnar, ingest
+from test_cds501 import CDS501_PATHS, CDS510_DB, SOURCES
+
+
+def test_read_files() -> None:
+    """
+    Verify that files parsed in parallel are merged in the order of their
+    paths, with codes translated into shared dictionaries
+    """
+    paths: List[str] = list(reversed(CDS501_PATHS[:3]))
+    store: columnar.Store = ingest.read_files(paths, processes=2)
+    stores: List[columnar.Store] = [cds501.get_store(path) for path in paths]
+    for table_name in ('crash', 'vhcl', 'partic'):
+        table: columnar.Table = getattr(store, table_name)
+        assert len(table) == sum(
+            len(getattr(path_store, table_name))
+            for path_store in stores
+        )
+        assert numpy.array_equal(
+            table['crash_id'].values,
+            numpy.concatenate([
+                getattr(path_store, table_name)['crash_id'].values
+                for path_store in stores
+            ])
+        )
+    assert list(store.crash['cnty_id'].to_pandas()) == [
+        value
+        for path_store in stores
+        for value in path_store.crash['cnty_id'].to_pandas()
+    ]
+    assert (
+        store.crash['crash_cause_1_cd'].dictionary is
+        store.partic['partic_cause_1_cd'].dictionary
+    )
+    # A glob pattern, parsed in the current process, into seeded dictionaries
+    dictionaries = columnar.load_dictionaries(
+        CDS510_DB,
+        cds501.DECODE_TABLES
+    )
+    severities: List[str] = list(dictionaries['CRASH_SVRTY'].values)
+    store = ingest.read_files(
+        os.path.join(SOURCES, 'cds501', '2018', 'c*', 'CDS501.txt'),
+        processes=1,
+        dictionaries=dictionaries
+    )
+    assert store.dictionaries['CRASH_SVRTY'].values[:len(severities)] == (
+        severities
+    )
+    assert len(store.crash) == sum(
+        len(cds501.get_store(path).crash)
+        for path in CDS501_PATHS
+        if os.path.basename(os.path.dirname(path)).startswith('c')
+    )
@@ -0,0 +1,170 @@
+"""
+This module tests the functionality of `odot_cds.local`.
+"""
+import os
+import sqlite3
+from datetime import date
+from io import StringIO
+from shutil import copyfile
+from tempfile import TemporaryDirectory
+from typing import Any, Dict, List, Set
+
+import pandas
+
+from odot_cds import cds501, local, warehouse
+from odot_cds.client import RoadType
+
+from test_cds501 import BAKER_2018, CDS510_DB
+
+
+class _Client:
+    """
+    Records requests, in place of `odot_cds.client.Client`
+    """
+
+    def __init__(self) -> None:
+        self.requests: List[Dict[str, Any]] = []
+
+    def extract(self, **arguments: Any) -> StringIO:
+        self.requests.append(arguments)
+        return StringIO('')
+
+
+def _get_ids(data_frame: pandas.DataFrame, column: str) -> Set[str]:
+    return set(data_frame[column].tolist())
+
+
+def _get_partic_ids(crash_group: cds501.CrashGroup) -> List[List[str]]:
+    return [
+        [partic.partic_id for partic in vhcl_group.partics]
+        for vhcl_group in crash_group.vhcls
+    ] + [[partic.partic_id for partic in crash_group.partics]]
+
+
+def test_local_client() -> None:
+    """
+    Verify that covered days are answered from the warehouse, with the rows
+    of the extract loaded, and that only the remaining days are requested
+    """
+    crash, vhcl, partic = cds501.get_data_frames(BAKER_2018)
+    with TemporaryDirectory() as directory:
+        path: str = os.path.join(directory, 'warehouse.db')
+        copyfile(CDS510_DB, path)
+        warehouse.load(BAKER_2018, path)
+        warehouse.add_coverage(
+            path,
+            date(2018, 1, 1),
+            date(2018, 12, 31),
+            county='01'
+        )
+        client: _Client = _Client()
+        local_client: local.LocalClient = local.LocalClient(
+            path,
+            client=client
+        )
+        response: local.LocalResponse = local_client.extract(
+            begin_date=date(2018, 1, 1),
+            end_date=date(2018, 12, 31),
+            jurisdiction='rdoSumJurisdictionCNTY',
+            county='Baker'
+        )
+        local_crash, local_vhcl, local_partic = cds501.get_data_frames(
+            response
+        )
+        assert not client.requests
+        assert response.gaps == []
+        assert _get_ids(local_crash, 'crash_id') == _get_ids(
+            crash,
+            'crash_id'
+        )
+        assert _get_ids(local_vhcl, 'vhcl_id') == _get_ids(vhcl, 'vhcl_id')
+        assert _get_ids(local_partic, 'partic_id') == _get_ids(
+            partic,
+            'partic_id'
+        )
+        # Each vehicle is followed by its participants
+        partic_ids: Dict[str, List[List[str]]] = {
+            crash_group.crash.crash_id: _get_partic_ids(crash_group)
+            for crash_group in cds501.iter_crashes(BAKER_2018)
+        }
+        for crash_group in cds501.iter_crashes(local_client.extract(
+            begin_date=date(2018, 1, 1),
+            end_date=date(2018, 12, 31),
+            county='01'
+        )):
+            assert sorted(_get_partic_ids(crash_group)) == sorted(
+                partic_ids.pop(crash_group.crash.crash_id)
+            )
+        assert not partic_ids
+        # Days which are not covered are requested, and then stored
+        for _ in range(2):
+            response = local_client.extract(
+                begin_date=date(2017, 7, 1),
+                end_date=date(2018, 6, 30),
+                county='Baker'
+            )
+            assert len(cds501.get_data_frames(response)[0]) == sum(
+                crash['crash_mo_no'].astype(int) <= 6
+            )
+        assert len(client.requests) == 1
+        assert client.requests[0]['begin_date'] == date(2017, 7, 1)
+        assert client.requests[0]['end_date'] == date(2017, 12, 31)
+        assert response.covered == [(date(2017, 7, 1), date(2018, 6, 30))]
+        # Extracts which cannot be answered locally are requested
+        local_client.extract(road_type=RoadType.LOCAL, county='Baker')
+        assert len(client.requests) == 2
+
+
+def test_highway_mile_points() -> None:
+    """
+    Verify that a highway extract bounded only by its beginning, or only by
+    its end, mile point includes the crashes beyond that bound
+    """
+    crash: pandas.DataFrame = cds501.get_data_frames(BAKER_2018)[0]
+    crash = crash[crash['hwy_no'] == '006']
+    mile_points: pandas.Series = crash['mp_no'].astype(float)
+    middle: float = float(mile_points.median())
+    with TemporaryDirectory() as directory:
+        path: str = os.path.join(directory, 'warehouse.db')
+        copyfile(CDS510_DB, path)
+        warehouse.load(BAKER_2018, path)
+        # Highways may cross any county, so every county must be covered
+        connection: sqlite3.Connection = sqlite3.connect(path)
+        county_ids: List[str] = [
+            county_id
+            for county_id, in connection.execute(
+                'SELECT CNTY_ID FROM CNTY WHERE CNTY_TERMNT_DT IS NULL'
+            )
+        ]
+        connection.close()
+        for county_id in county_ids:
+            warehouse.add_coverage(
+                path,
+                date(2018, 1, 1),
+                date(2018, 12, 31),
+                county=county_id
+            )
+        client: _Client = _Client()
+        local_client: local.LocalClient = local.LocalClient(
+            path,
+            client=client
+        )
+        for begin_mile_point, end_mile_point, expected in (
+            (middle, 0.0, mile_points >= middle),
+            (0.0, middle, mile_points <= middle),
+            (0.0, 0.0, mile_points == mile_points),
+            (1.0, middle, (mile_points >= 1) & (mile_points <= middle))
+        ):
+            response: local.LocalResponse = local_client.extract(
+                begin_date=date(2018, 1, 1),
+                end_date=date(2018, 12, 31),
+                road_type=RoadType.HIGHWAY,
+                highway='006',
+                begin_mile_point=begin_mile_point,
+                end_mile_point=end_mile_point
+            )
+            assert _get_ids(
+                cds501.get_data_frames(response)[0],
+                'crash_id'
+            ) == set(crash['crash_id'][expected])
+        assert not client.requests
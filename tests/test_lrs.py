@@ -0,0 +1,78 @@
+"""
+This module tests the functionality of `odot_cds.lrs`.
+"""
+from typing import List
+
+import numpy
+import pandas
+
+from odot_cds import columnar, ingest, lrs
+from test_cds501 import CDS501_PATHS
+
+
+def test_mile_point_index() -> None:
+    """
+    Verify that mile point index queries agree with a full scan
+    """
+    crash: columnar.Table = ingest.read_files(
+        CDS501_PATHS,
+        processes=1
+    ).crash
+    data_frame: pandas.DataFrame = crash.to_data_frame()
+    mile_points: numpy.ndarray = columnar.get_floats(crash['mp_no'])
+    highways: numpy.ndarray = columnar.get_strings(crash['hwy_no'])
+    roadways: numpy.ndarray = columnar.get_strings(crash['rdwy_no'])
+    index: lrs.MilePointIndex = lrs.MilePointIndex.from_table(crash)
+    assert len(index) == numpy.count_nonzero(~numpy.isnan(mile_points))
+    assert index.routes == sorted(index.routes)
+    # The index is the same whether built from a table or a data frame
+    assert index.routes == lrs.MilePointIndex.from_table(data_frame).routes
+    on_highway: numpy.ndarray = (
+        (highways == '001') & (mile_points >= 280) & (mile_points <= 285.5)
+    )
+    assert on_highway.any()
+    assert numpy.array_equal(
+        numpy.sort(index.query_range(('001',), 280, 285.5)),
+        numpy.flatnonzero(on_highway)
+    )
+    assert numpy.array_equal(
+        numpy.sort(index.query_range('001', 280, 285.5)),
+        numpy.flatnonzero(on_highway)
+    )
+    assert numpy.array_equal(
+        numpy.sort(index.query_range(('001', '', '1'), 280, 285.5)),
+        numpy.flatnonzero(on_highway & (roadways == '1'))
+    )
+    assert not len(index.query_range(('999',), 0, 1000))
+    position: int = int(numpy.flatnonzero(highways == '001')[0])
+    assert position in index.query_point(
+        ('001',),
+        float(mile_points[position]),
+        0.001
+    )
+    # Segments are counted and queried at once
+    starts: numpy.ndarray = numpy.arange(280, 290, 0.5)
+    ends: numpy.ndarray = starts + 0.5
+    segments: List[numpy.ndarray] = index.query_segments('001', starts, ends)
+    counts: numpy.ndarray = index.count_segments('001', starts, ends)
+    for start, end, segment, count in zip(starts, ends, segments, counts):
+        expected: numpy.ndarray = numpy.flatnonzero(
+            (highways == '001') &
+            (mile_points >= start) &
+            (mile_points <= end)
+        )
+        assert numpy.array_equal(numpy.sort(segment), expected)
+        assert count == len(expected)
+    # Routes keyed by LRS value
+    lrs_index: lrs.MilePointIndex = lrs.MilePointIndex.from_table(
+        crash,
+        lrs.LRS_COLUMNS
+    )
+    lrs_values: numpy.ndarray = columnar.get_strings(crash['lrs_val'])
+    lrs_value: str = str(lrs_values[position])
+    assert numpy.array_equal(
+        numpy.sort(lrs_index.query_range(lrs_value, 0, 1000)),
+        numpy.flatnonzero(
+            (lrs_values == lrs_value) & ~numpy.isnan(mile_points)
+        )
+    )
@@ -0,0 +1,210 @@
+"""
+This module tests the functionality of `odot_cds.parquet`.
+"""
+import os
+from tempfile import TemporaryDirectory
+from typing import Dict, List, Tuple
+
+import pandas
+import pytest
+
+from odot_cds import cds501
+
+pytest.importorskip('pyarrow')
+
+from odot_cds import parquet  # noqa: E402
+
+from test_cds501 import CDS501_PATHS  # noqa: E402
+
+
+def test_write_dataset() -> None:
+    """
+    Verify that extracts are appended to the correct partitions, and can be
+    read back using partition filters
+    """
+    with TemporaryDirectory() as path:
+        written_files: List[parquet.WrittenFile] = []
+        for cds501_path in CDS501_PATHS[:2]:
+            written_files += parquet.write_dataset(cds501_path, path)
+        crash_files: List[parquet.WrittenFile] = [
+            written_file
+            for written_file in written_files
+            if written_file.table_name == 'crash'
+        ]
+        assert len(crash_files) == 2
+        assert all(
+            os.path.exists(written_file.path)
+            for written_file in written_files
+        )
+        county_id: str = dict(crash_files[0].partition)['cnty_id']
+        crash: pandas.DataFrame = parquet.read_dataset(
+            path,
+            'crash',
+            columns=['crash_id', 'cnty_id', 'crash_svrty_cd'],
+            filters=[('cnty_id', '=', county_id)]
+        )
+        assert len(crash) == crash_files[0].row_count
+        assert set(crash['cnty_id']) == {county_id}
+        partic: pandas.DataFrame = parquet.read_dataset(
+            path,
+            'partic',
+            filters=[('cnty_id', '=', county_id)]
+        )
+        store = cds501.get_store(CDS501_PATHS[0])
+        assert len(partic) == len(store.partic)
+        # Appending the same extract again adds files rather than rewriting
+        parquet.write_dataset(store, path)
+        assert len(parquet.read_dataset(
+            path,
+            'crash',
+            filters=[('cnty_id', '=', county_id)]
+        )) == 2 * len(store.crash)
+
+
+def test_manifest() -> None:
+    """
+    Verify that the manifest is updated as extracts are appended, and that
+    files which cannot match filters are skipped
+    """
+    with TemporaryDirectory() as path:
+        for cds501_path in CDS501_PATHS:
+            parquet.write_dataset(cds501_path, path)
+            assert len(parquet.get_files(path, 'crash')) == (
+                CDS501_PATHS.index(cds501_path) + 1
+            )
+        written_files: List[parquet.WrittenFile] = parquet.read_manifest(
+            path
+        )
+        assert sum(
+            written_file.row_count
+            for written_file in written_files
+            if written_file.table_name == 'partic'
+        ) == len(parquet.read_dataset(path, 'partic'))
+        crash_all: pandas.DataFrame = parquet.read_dataset(path, 'crash')
+        fatal_crash: pandas.DataFrame = crash_all[
+            crash_all['crash_svrty_cd'] == '2'
+        ]
+        county_id: str = fatal_crash['cnty_id'].iloc[0]
+        filters: List[Tuple[str, str, object]] = [
+            ('crash_svrty_cd', '=', '2'),
+            ('cnty_id', '=', county_id),
+            ('city_sect_id', '>=', 0)
+        ]
+        assert len(parquet.get_files(path, 'crash', filters)) == 1
+        assert len(parquet.read_dataset(path, 'crash', filters=filters)) == (
+            (fatal_crash['cnty_id'] == county_id).sum()
+        )
+        # Files are pruned by their zone maps, not only their partitions
+        statistics: Dict[str, parquet.ColumnStatistics] = dict(
+            written_files[0].statistics
+        )
+        assert not parquet.get_files(
+            path,
+            'crash',
+            [('hwy_no', '=', 'none'), ('cnty_id', '=', county_id)]
+        )
+        assert written_files[0] in parquet.get_files(
+            path,
+            'crash',
+            [('lat_dd', '<=', statistics['lat_dd'].minimum)]
+        )
+        assert not parquet.get_files(
+            path,
+            'crash',
+            [('lat_dd', '<', min(
+                dict(written_file.statistics)['lat_dd'].minimum
+                for written_file in written_files
+                if written_file.table_name == 'crash'
+            ))]
+        )
+        # Filters on computed columns select files, and then rows
+        bounds: List[Tuple[str, str, object]] = [
+            ('lat_dd', '>=', 44.6),
+            ('lat_dd', '<=', 45.6),
+            ('longtd_dd', '>=', -123),
+            ('longtd_dd', '<=', -122)
+        ]
+        coordinates: pandas.DataFrame = parquet.read_dataset(
+            path,
+            'crash',
+            columns=['crash_id', 'lat_dd', 'longtd_dd']
+        )
+        within: pandas.DataFrame = coordinates[
+            coordinates['lat_dd'].between(44.6, 45.6) &
+            coordinates['longtd_dd'].between(-123, -122)
+        ]
+        assert 0 < len(within) < len(coordinates)
+        crash: pandas.DataFrame = parquet.read_dataset(
+            path,
+            'crash',
+            filters=bounds
+        )
+        assert set(crash['crash_id']) == set(within['crash_id'])
+        assert 'lat_dd' not in crash
+        crash = parquet.read_dataset(
+            path,
+            'crash',
+            columns=['crash_id', 'lat_dd'],
+            filters=[bounds, [('crash_svrty_cd', '=', '2')]]
+        )
+        assert list(crash.columns) == ['crash_id', 'lat_dd']
+        assert set(crash['crash_id']) == set(within['crash_id']) | set(
+            fatal_crash['crash_id']
+        )
+        # Numeric zone maps are compared without truncating filter values,
+        # and values which cannot be compared do not rule out files
+        assert len(parquet.read_dataset(
+            path,
+            'crash',
+            filters=[('city_sect_id', '<', 0.5)]
+        )) == (crash_all['city_sect_id'] == 0).sum() > 0
+        assert len(parquet.get_files(
+            path,
+            'crash',
+            [('city_sect_id', '=', 'x')]
+        )) == len(parquet.get_files(path, 'crash'))
+        # Filters on columns which the table does not have are errors
+        for table_name, filters in (
+            ('crash', [('crash_svrity_cd', '=', '2')]),
+            ('vhcl', [('crash_svrty_cd', '=', '2')]),
+            ('vhcl', [('lat_dd', '<=', 45)])
+        ):
+            with pytest.raises(ValueError):
+                parquet.read_dataset(path, table_name, filters=filters)
+
+
+def test_manifest_upgrade() -> None:
+    """
+    Verify that files written before a dataset had a manifest are listed,
+    with the same zone maps, when the manifest is created
+    """
+    with TemporaryDirectory() as path:
+        parquet.write_dataset(CDS501_PATHS[0], path)
+        written_files: List[parquet.WrittenFile] = parquet.read_manifest(
+            path
+        )
+        os.remove(os.path.join(path, parquet.MANIFEST))
+        crash: pandas.DataFrame = parquet.read_dataset(
+            path,
+            'crash',
+            columns=['crash_id', 'lat_dd']
+        )
+        assert len(parquet.read_dataset(path, 'crash', filters=[
+            ('lat_dd', '<=', 44.8)
+        ])) == (crash['lat_dd'] <= 44.8).sum()
+        parquet.write_dataset(CDS501_PATHS[1], path)
+        assert len(parquet.get_files(path, 'crash')) == 2
+        assert len(parquet.read_dataset(path, 'crash')) == sum(
+            len(cds501.get_store(cds501_path).crash)
+            for cds501_path in CDS501_PATHS[:2]
+        )
+        scanned_files: List[parquet.WrittenFile] = parquet.read_manifest(
+            path
+        )[:len(written_files)]
+        for written_file, scanned_file in zip(written_files, scanned_files):
+            assert scanned_file.path == written_file.path
+            assert scanned_file.partition == written_file.partition
+            assert scanned_file.row_count == written_file.row_count
+            assert dict(scanned_file.statistics) == dict(
+                written_file.statistics
+            )
@@ -0,0 +1,64 @@
+"""
+This module tests the functionality of `odot_cds.schedule`.
+"""
+from datetime import date, timedelta
+from typing import List, Tuple
+
+import pandas
+
+from odot_cds import cube, ingest, schedule
+from test_cds501 import CDS501_PATHS
+
+
+def test_plan() -> None:
+    """
+    Verify that request windows are contiguous, and are sized according to
+    estimated record counts
+    """
+    summary: cube.Cube = cube.Cube()
+    summary.add(ingest.read_files(CDS501_PATHS, processes=1).crash)
+    monthly_rows: pandas.Series = schedule.get_monthly_rows(
+        summary,
+        county='03'
+    )
+    assert len(monthly_rows) == 12
+    windows: List[Tuple[date, date, float]] = schedule.get_windows(
+        monthly_rows,
+        date(2018, 1, 15),
+        date(2019, 6, 30),
+        target_rows=700
+    )
+    assert windows[0][0] == date(2018, 1, 15)
+    assert windows[-1][1] == date(2019, 6, 30)
+    for (_, end_date, _), (begin_date, _, _) in zip(windows, windows[1:]):
+        assert begin_date == end_date + timedelta(days=1)
+    assert all(rows <= 700 for _, _, rows in windows)
+    # Months are divided to stay within the target
+    assert len(windows) > 18
+    assert round(sum(
+        rows for _, end_date, rows in windows
+        if end_date.year == 2018
+    )) == round(
+        monthly_rows.sum() - monthly_rows[(2018, 1)] * 14 / 31
+    )
+    requests: List[schedule.Request] = schedule.plan(
+        summary,
+        ('01', '03', '09'),
+        date(2018, 1, 1),
+        date(2018, 12, 31),
+        target_rows=5000
+    )
+    counties: List[str] = [request.county for request in requests]
+    # Sparse counties are requested in one window, and counties without
+    # crashes in the cube are not requested
+    assert counties.count('01') == 1
+    assert counties.count('03') == 3
+    assert '09' not in counties
+    assert requests[0].jurisdiction == 'rdoSumJurisdictionCNTY'
+    # Months outside the cube are requested
+    assert schedule.plan(
+        summary,
+        ('09',),
+        date(2019, 1, 1),
+        date(2019, 12, 31)
+    )
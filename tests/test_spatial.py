@@ -0,0 +1,130 @@
+"""
+This module tests the functionality of `odot_cds.spatial`.
+"""
+import math
+import sqlite3
+from typing import List
+
+import numpy
+import pandas
+
+from odot_cds import cds501, columnar, ingest, spatial
+from test_cds501 import CDS501_PATHS, CDS510_DB
+
+
+def test_get_decimal_degrees() -> None:
+    """
+    Verify that decimal degrees match the `LAT_DD` and `LONGTD_DD` columns
+    of the CDS510 "CRASH" table
+    """
+    connection: sqlite3.Connection = sqlite3.connect(CDS510_DB)
+    try:
+        crash: pandas.DataFrame = pandas.read_sql_query(
+            'SELECT * FROM CRASH',
+            connection
+        )
+    finally:
+        connection.close()
+    for prefix in ('LAT', 'LONGTD'):
+        assert numpy.allclose(
+            spatial.get_decimal_degrees(
+                crash[prefix + '_DEG_NO'],
+                crash[prefix + '_MINUTE_NO'],
+                crash[prefix + '_SEC_NO']
+            ),
+            crash[prefix + '_DD'].astype(float),
+            rtol=0,
+            atol=1e-9
+        )
+    store: columnar.Store = cds501.get_store(CDS501_PATHS[0])
+    assert store.crash['lat_dd'].values[0] == 44 + 53 / 60 + 39.73 / 3600
+
+
+def test_grid_index() -> None:
+    """
+    Verify that grid index queries agree with a full scan
+    """
+    crash: columnar.Table = ingest.read_files(
+        CDS501_PATHS,
+        processes=1
+    ).crash
+    latitudes: numpy.ndarray = crash['lat_dd'].values
+    longitudes: numpy.ndarray = crash['longtd_dd'].values
+    index: spatial.GridIndex = spatial.GridIndex.from_table(crash)
+    assert len(index) == numpy.count_nonzero(~numpy.isnan(latitudes))
+    assert numpy.array_equal(
+        index.query_bbox(45.3, -122.7, 45.5, -122.5),
+        numpy.flatnonzero(
+            (latitudes >= 45.3) & (latitudes <= 45.5) &
+            (longitudes >= -122.7) & (longitudes <= -122.5)
+        )
+    )
+    distances: numpy.ndarray = spatial.get_distances(
+        45.4,
+        -122.6,
+        latitudes,
+        longitudes
+    )
+    assert numpy.array_equal(
+        index.query_radius(45.4, -122.6, 2000),
+        numpy.flatnonzero(distances <= 2000)
+    )
+    # Nearest neighbors, including from a point far outside the grid
+    for latitude, longitude in ((44.0, -121.0), (30.0, -100.0)):
+        distances = spatial.get_distances(
+            latitude,
+            longitude,
+            latitudes,
+            longitudes
+        )
+        positions, nearest_distances = index.query_nearest(
+            latitude,
+            longitude,
+            5
+        )
+        assert numpy.array_equal(
+            nearest_distances,
+            numpy.sort(distances)[:5]
+        )
+        assert numpy.array_equal(distances[positions], nearest_distances)
+    positions, nearest_distances = index.query_nearest(
+        44.0,
+        -121.0,
+        5,
+        maximum_radius=10000
+    )
+    assert len(positions) and (nearest_distances <= 10000).all()
+
+
+def test_radius_boundary() -> None:
+    """
+    Verify that points just within a radius, due north and due east, are
+    found (and that points just beyond it are not)
+    """
+    latitude: float = 45.4
+    longitude: float = -122.6
+    latitudes: List[float] = []
+    longitudes: List[float] = []
+    for distance in (999.5, 1000.5):
+        angle: float = distance / spatial.EARTH_RADIUS
+        latitudes += [latitude + math.degrees(angle), latitude]
+        longitudes += [longitude, longitude + math.degrees(2 * math.asin(
+            math.sin(angle / 2) / math.cos(math.radians(latitude))
+        ))]
+    # The grid starts at the query point, and a cell boundary lies between
+    # the point 999.5 meters north of it and 998.9 meters north of it (the
+    # edge of a search box sized with 111320 meters per degree)
+    index: spatial.GridIndex = spatial.GridIndex.from_arrays(
+        numpy.array(latitudes),
+        numpy.array(longitudes),
+        cell_size=math.degrees(999.2 / spatial.EARTH_RADIUS)
+    )
+    assert index.query_radius(latitude, longitude, 1000).tolist() == [0, 1]
+    positions, distances = index.query_nearest(
+        latitude,
+        longitude,
+        4,
+        maximum_radius=1000
+    )
+    assert sorted(positions.tolist()) == [0, 1]
+    assert numpy.allclose(distances, 999.5)
@@ -0,0 +1,98 @@
+"""
+This module tests the functionality of `odot_cds.spis`.
+"""
+import os
+import zipfile
+from typing import Dict
+
+import numpy
+import pandas
+import pytest
+
+from odot_cds import columnar, ingest, spis
+from test_cds501 import CDS501_PATHS, SOURCES
+
+SPIS_DIRECTORY: str = os.path.join(
+    SOURCES,
+    'tdb',
+    'trandata',
+    'GIS_data',
+    'Safety'
+)
+
+
+def test_read() -> None:
+    """
+    Verify that published SPIS layers are read with their coordinates
+    """
+    published: pandas.DataFrame = spis.read(
+        os.path.join(SPIS_DIRECTORY, 'spis_2014_16.zip')
+    )
+    assert len(published) == 19735
+    assert published['hwynumb'].iloc[0] == '064'
+    assert published['mp'].iloc[0] == 20.96
+    assert published['spis_score'].iloc[0] == 63.68
+    assert published['lrs_key'].iloc[0] == '006400100S00'
+    assert not published['x'].isna().any()
+    # Records are located identically with and without the ".shx" index
+    with zipfile.ZipFile(
+        os.path.join(SPIS_DIRECTORY, 'spis_2010_12.zip')
+    ) as zip_file:
+        shp: bytes = zip_file.read('spis_2010_12.shp')
+        shx: bytes = zip_file.read('spis_2010_12.shx')
+    for indexed, scanned in zip(
+        spis.read_points(shp, shx),
+        spis.read_points(shp)
+    ):
+        assert numpy.array_equal(indexed, scanned)
+    with pytest.raises(ValueError):
+        spis.read(os.path.join(SPIS_DIRECTORY, 'spis_2012_14.zip'))
+
+
+def test_get_scores() -> None:
+    """
+    Verify that segment counts agree with a full scan of crashes
+    """
+    crash: columnar.Table = ingest.read_files(
+        CDS501_PATHS,
+        processes=1
+    ).crash
+    scores: pandas.DataFrame = spis.get_scores(crash)
+    assert len(scores)
+    assert scores['spis_score'].max() <= 75
+    assert (
+        (scores['crash_cnt'] >= spis.MINIMUM_CRASHES) |
+        (scores['fatal_cnt'] > 0)
+    ).all()
+    lrs_values: numpy.ndarray = columnar.get_strings(crash['lrs_val'])
+    mile_points: numpy.ndarray = numpy.round(
+        columnar.get_floats(crash['mp_no']),
+        2
+    )
+    fatal: numpy.ndarray = columnar.get_floats(crash['tot_fatal_cnt']) > 0
+    for row in scores.sample(50, random_state=0).itertuples():
+        in_segment: numpy.ndarray = (
+            (lrs_values == row.lrs_val) &
+            (mile_points >= row.start) &
+            (mile_points < row.end - 1e-6)
+        )
+        assert row.crash_cnt == in_segment.sum()
+        assert row.fatal_cnt == (in_segment & fatal).sum()
+    # Crash rates are computed from traffic volumes
+    volumes: Dict[str, float] = {}
+
+    def get_daily_volumes(route, starts) -> numpy.ndarray:
+        volumes[route[0]] = 10000.0
+        return numpy.full(len(starts), 10000.0)
+
+    rated: pandas.DataFrame = spis.get_scores(
+        crash,
+        daily_volumes=get_daily_volumes
+    )
+    assert set(volumes) == set(scores['lrs_val'])
+    assert numpy.allclose(
+        rated['crash_rate'],
+        rated['crash_cnt'] * 1e6 / (10000.0 * 365 * 3 * 0.1)
+    )
+    assert numpy.isclose(rated['rate_indicator'].max(), spis.RATE_POINTS)
+    assert not len(spis.get_scores(crash, years=(2000, 2001, 2002)))
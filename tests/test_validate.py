@@ -0,0 +1,40 @@
+"""
+This module tests the functionality of `odot_cds.validate`.
+"""
+from io import StringIO
+from typing import List
+
+from odot_cds import validate
+from test_cds501 import BAKER_2018, CDS501_PATHS
+
+
+def test_validate() -> None:
+    """
+    Verify that saved extracts are valid, and that orphans, duplicates and
+    count mismatches are found in damaged extracts
+    """
+    for path in CDS501_PATHS:
+        assert validate.validate(path).valid
+    with open(BAKER_2018) as file:
+        lines: List[str] = file.read().splitlines(True)
+    # The first crash is followed by its vehicle and 3 participants
+    assert lines[0].split(',')[1] == '1'
+    assert [line.split(',')[1] for line in lines[1:5]] == ['2', '3', '3', '3']
+    report: validate.Report = validate.validate(StringIO(''.join(
+        lines[1:] + lines[-1:]
+    )))
+    assert not report.valid
+    assert report.orphan_vhcl_ids == [lines[1].split(',')[2].strip()]
+    assert report.orphan_partic_ids == [
+        line.split(',')[3].strip() for line in lines[2:5]
+    ]
+    assert len(report.duplicate_crash_ids) + len(
+        report.duplicate_vhcl_ids
+    ) + len(report.duplicate_partic_ids) == 1
+    # A crash missing its vehicle (and so its participants' vehicle)
+    report = validate.validate(StringIO(''.join(lines[:1] + lines[2:])))
+    assert report.vhcl_count_mismatches == [
+        (lines[0].split(',')[0].strip(), 1, 0)
+    ]
+    assert len(report.orphan_partic_ids) == 3
+    assert report.get_summary()['orphan_partic_ids'] == 3
@@ -0,0 +1,50 @@
+"""
+This module tests the functionality of `odot_cds.warehouse`.
+"""
+import os
+import sqlite3
+from shutil import copyfile
+from tempfile import TemporaryDirectory
+from typing import Dict
+
+from odot_cds import cds501, warehouse
+
+from test_cds501 import BAKER_2018, CDS510_DB
+
+
+def test_load() -> None:
+    """
+    Verify that an extract can be loaded into a copy of the CDS510 decode
+    database, re-loaded without creating duplicates, and joined to the decode
+    tables
+    """
+    store = cds501.get_store(BAKER_2018)
+    with TemporaryDirectory() as directory:
+        path: str = os.path.join(directory, 'warehouse.db')
+        copyfile(CDS510_DB, path)
+        connection: sqlite3.Connection = sqlite3.connect(path)
+        existing_crash_count: int = connection.execute(
+            'SELECT COUNT(*) FROM CRASH'
+        ).fetchone()[0]
+        for _ in range(2):
+            row_counts: Dict[str, int] = warehouse.load(
+                BAKER_2018,
+                path,
+                batch_size=50
+            )
+            assert row_counts == {
+                'CRASH': len(store.crash),
+                'VHCL': len(store.vhcl),
+                'PARTIC': len(store.partic)
+            }
+        assert connection.execute(
+            'SELECT COUNT(*) FROM CRASH'
+        ).fetchone()[0] == existing_crash_count + len(store.crash)
+        assert connection.execute(
+            'SELECT COUNT(*) FROM PARTIC JOIN INJ_SVRTY USING (INJ_SVRTY_CD) '
+            'WHERE CRASH_ID = 1779899'
+        ).fetchone()[0] == 3
+        assert connection.execute(
+            'SELECT LAT_SEC_NO, NHS_FLG FROM CRASH WHERE CRASH_ID = 1779899'
+        ).fetchone() == (39.73, 1)
+        connection.close()